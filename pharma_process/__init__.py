@@ -0,0 +1,9 @@
+"""
+制药工艺流程对比。
+
+- process_store: 工艺目录加载与共享存储（事实表、检索/温度/相似度索引、步骤比对）
+- analytics: 不依赖 Streamlit 的分析函数，页面、HTTP 接口与批处理共用
+- charts / flowchart: Plotly 图表
+- ui: Streamlit 页面片段，页面脚本为仓库根目录的 app.py
+- api_server / export_reports / benchmark: 命令行入口，以 python -m pharma_process.<模块> 运行
+"""
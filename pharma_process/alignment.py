@@ -0,0 +1,167 @@
+"""工艺步骤序列比对 - 按步骤名称与关键参数做 Needleman–Wunsch 全局比对"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 打分：同名步骤得 MATCH_SCORE；不同名步骤按关键参数 Jaccard 相似度在
+# [MISMATCH_SCORE, SUBSTITUTION_MAX] 之间线性取值；空位罚分为 GAP_SCORE
+MATCH_SCORE = 2.0
+SUBSTITUTION_MAX = 1.0
+MISMATCH_SCORE = -1.0
+GAP_SCORE = -1.0
+
+# 回溯方向
+_DIAGONAL, _UP, _LEFT = 0, 1, 2
+
+
+class StepEncoding:
+    """
+    预先编码的步骤记号：步骤名称编码 + 步骤 × 规范参数 ID 的 0/1 稀疏矩阵。
+
+    由事实表构建一次，所有比对复用；步骤以步骤事实表中的行号表示。
+    """
+
+    def __init__(self, facts):
+        self.facts = facts
+        self.name_codes = facts.steps["步骤名称"].cat.codes.to_numpy()
+        params = facts.parameters
+        self.param_matrix = sparse.csr_matrix(
+            (np.ones(len(params), dtype=np.float32),
+             (params["步骤行号"].to_numpy(), params["参数ID"].to_numpy())),
+            shape=(len(facts.steps), len(facts.parameter_canonicalizer)),
+        )
+        self.param_matrix.sum_duplicates()
+        self.param_matrix.data[:] = 1.0
+        self.param_counts = np.asarray(self.param_matrix.sum(axis=1)).ravel()
+
+    def step_rows(self, key):
+        part = self.facts.step_slices[key]
+        return np.arange(part.start, part.stop)
+
+    def score_matrix(self, left_rows, right_rows):
+        """两组步骤之间的替换得分矩阵，一次稀疏矩阵乘法得到全部参数交集"""
+        intersection = (self.param_matrix[left_rows] @ self.param_matrix[right_rows].T).toarray()
+        union = self.param_counts[left_rows][:, None] + self.param_counts[right_rows][None, :] - intersection
+        with np.errstate(divide="ignore", invalid="ignore"):
+            jaccard = np.where(union > 0, intersection / union, 0.0)
+        scores = MISMATCH_SCORE + (SUBSTITUTION_MAX - MISMATCH_SCORE) * jaccard
+        same_name = self.name_codes[left_rows][:, None] == self.name_codes[right_rows][None, :]
+        return np.where(same_name, MATCH_SCORE, scores), same_name
+
+
+def needleman_wunsch(scores, gap=GAP_SCORE):
+    """
+    全局比对。
+
+    scores 为 n × m 替换得分矩阵，返回 (总得分, 比对路径)，路径元素为
+    (i, j)，i 或 j 为 None 表示空位。
+    """
+    n, m = scores.shape
+    table = np.zeros((n + 1, m + 1))
+    trace = np.zeros((n + 1, m + 1), dtype=np.int8)
+    table[1:, 0] = gap * np.arange(1, n + 1)
+    table[0, 1:] = gap * np.arange(1, m + 1)
+    trace[1:, 0] = _UP
+    trace[0, 1:] = _LEFT
+
+    for i in range(1, n + 1):
+        row_scores = scores[i - 1]
+        prev = table[i - 1]
+        current = table[i]
+        for j in range(1, m + 1):
+            diagonal = prev[j - 1] + row_scores[j - 1]
+            up = prev[j] + gap
+            left = current[j - 1] + gap
+            if diagonal >= up and diagonal >= left:
+                current[j], trace[i, j] = diagonal, _DIAGONAL
+            elif up >= left:
+                current[j], trace[i, j] = up, _UP
+            else:
+                current[j], trace[i, j] = left, _LEFT
+
+    path = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        direction = trace[i, j]
+        if direction == _DIAGONAL:
+            path.append((i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif direction == _UP:
+            path.append((i - 1, None))
+            i -= 1
+        else:
+            path.append((None, j - 1))
+            j -= 1
+    return float(table[n, m]), path[::-1]
+
+
+class StepAligner:
+    """基于 StepEncoding 的产品工艺步骤比对"""
+
+    def __init__(self, facts):
+        self.encoding = StepEncoding(facts)
+
+    def _align_rows(self, left_rows, right_rows, scores, same_name):
+        steps = self.encoding.facts.steps
+        names = steps["步骤名称"]
+        total, path = needleman_wunsch(scores)
+        records = []
+        for i, j in path:
+            left = names.iat[left_rows[i]] if i is not None else ""
+            right = names.iat[right_rows[j]] if j is not None else ""
+            if i is None:
+                operation, score = "插入", GAP_SCORE
+            elif j is None:
+                operation, score = "删除", GAP_SCORE
+            else:
+                operation = "相同" if same_name[i, j] else "替换"
+                score = scores[i, j]
+            records.append({
+                "操作": operation,
+                "参考步骤序号": i + 1 if i is not None else None,
+                "参考步骤": left,
+                "对比步骤序号": j + 1 if j is not None else None,
+                "对比步骤": right,
+                "得分": round(float(score), 2),
+            })
+        return total, pd.DataFrame(records)
+
+    def align(self, reference, other):
+        """比对两个产品，返回 (总得分, 逐步比对表)"""
+        left_rows = self.encoding.step_rows(reference)
+        right_rows = self.encoding.step_rows(other)
+        scores, same_name = self.encoding.score_matrix(left_rows, right_rows)
+        return self._align_rows(left_rows, right_rows, scores, same_name)
+
+    def align_many(self, reference, others):
+        """
+        参考产品与多个产品批量比对，返回每个产品的比对汇总。
+
+        所有对比步骤的替换得分由一次稀疏矩阵乘法算出，再按产品切分做动态规划。
+        """
+        left_rows = self.encoding.step_rows(reference)
+        other_rows = [self.encoding.step_rows(key) for key in others]
+        if not others:
+            return pd.DataFrame(columns=["分类", "产品", "比对得分", "相同", "替换", "插入", "删除", "一致率"])
+
+        all_rows = np.concatenate(other_rows)
+        scores, same_name = self.encoding.score_matrix(left_rows, all_rows)
+        bounds = np.cumsum([0] + [len(rows) for rows in other_rows])
+
+        summary = []
+        for k, key in enumerate(others):
+            part = slice(bounds[k], bounds[k + 1])
+            total, table = self._align_rows(left_rows, other_rows[k], scores[:, part], same_name[:, part])
+            counts = table["操作"].value_counts()
+            summary.append({
+                "分类": key[0],
+                "产品": key[1],
+                "比对得分": round(total, 2),
+                "相同": int(counts.get("相同", 0)),
+                "替换": int(counts.get("替换", 0)),
+                "插入": int(counts.get("插入", 0)),
+                "删除": int(counts.get("删除", 0)),
+                "一致率": counts.get("相同", 0) / len(table) if len(table) else 0.0,
+            })
+        return pd.DataFrame(summary).sort_values("比对得分", ascending=False, ignore_index=True)
@@ -0,0 +1,250 @@
+"""
+工艺分析接口 - 不依赖 Streamlit 的纯 Python 分析函数。
+
+页面、HTTP 接口（api_server）与批处理任务都调用这里的函数；结果按
+(存储谱系, 目录版本, 参数) 缓存在进程内，单个产品的分析按 (存储谱系, 产品内容哈希, 参数) 缓存，
+目录增量更新后内容未变的产品沿用已有结果；重新完整加载或切换来源后名称规范化器重建，旧结果不再使用。同一进程中的页面与接口共享同一份计算结果。
+返回的 DataFrame 是缓存中的共享对象，调用方不要原地修改。
+"""
+
+from functools import lru_cache, wraps
+from typing import Optional, TypedDict
+
+import pandas as pd
+
+from .process_store import get_store
+
+ANALYTICS_CACHE_SIZE = 1024
+
+ProductKey = tuple[str, str]
+
+SIMILARITY_METRICS = ("cosine", "jaccard")
+
+ProductStatistics = TypedDict("ProductStatistics", {
+    "分类": str,
+    "产品": str,
+    "步骤数": int,
+    "关键参数总数": int,
+    "设备种类数": int,
+    "总工艺时间(h)": float,
+    "关键路径工期(h)": float,
+})
+
+ProcessSchedule = TypedDict("ProcessSchedule", {
+    "排程": pd.DataFrame,
+    "关键路径工期(h)": float,
+    "关键路径": list[str],
+})
+
+
+def _catalog_cached(func):
+    """按当前存储的 (谱系, 目录版本) 缓存结果：目录重新加载后版本变化，旧结果自然失效"""
+    cached = lru_cache(maxsize=ANALYTICS_CACHE_SIZE)(lambda cache_key, *args, **kwargs: func(*args, **kwargs))
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return cached(get_store().cache_key, *args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def _product_cached(func):
+    """
+    按 (存储谱系, 产品内容哈希) 缓存单个产品的结果：目录增量更新只使变化产品的结果失效。
+    结果还依赖规范名称等整个谱系共享的状态，完整重建的存储不沿用旧结果。
+    """
+    cached = lru_cache(maxsize=ANALYTICS_CACHE_SIZE)(
+        lambda cache_key, category, product, *args, **kwargs: func(category, product, *args, **kwargs)
+    )
+
+    @wraps(func)
+    def wrapper(category, product, *args, **kwargs):
+        return cached(get_store().product_cache_key(category, product), category, product, *args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def _require_product(category: str, product: str) -> None:
+    if (category, product) not in get_store().product_index:
+        raise KeyError(f"产品不存在: {category} / {product}")
+
+
+def _require_metric(metric: str) -> None:
+    if metric not in SIMILARITY_METRICS:
+        raise ValueError(f"未知的相似度度量: {metric}")
+
+
+def catalog_version() -> str:
+    return get_store().version
+
+
+def store_lineage() -> int:
+    """当前存储的谱系编号，目录完整重新加载或切换来源后变化"""
+    return get_store().lineage
+
+
+def product_version(category: str, product: str) -> Optional[str]:
+    """产品内容哈希，产品不存在时为 None"""
+    return get_store().product_hash(category, product)
+
+
+def list_categories() -> list[str]:
+    return list(get_store().get_main_categories())
+
+
+@_catalog_cached
+def list_products(category: Optional[str] = None) -> pd.DataFrame:
+    """产品汇总表（每个产品一行），可按分类过滤"""
+    products = get_store().facts.products
+    if category is None:
+        return products
+    if category not in get_store().products_by_category:
+        raise KeyError(f"分类不存在: {category}")
+    return products[products["分类"] == category].reset_index(drop=True)
+
+
+@_product_cached
+def product_statistics(category: str, product: str) -> ProductStatistics:
+    """产品的步骤数、参数数、设备种类数与工期"""
+    _require_product(category, product)
+    row = get_store().facts.product_summaries([(category, product)]).iloc[0]
+    return {
+        "分类": category,
+        "产品": product,
+        "步骤数": int(row["步骤数"]),
+        "关键参数总数": int(row["关键参数总数"]),
+        "设备种类数": int(row["设备种类数"]),
+        "总工艺时间(h)": float(row["总工艺时间(h)"]),
+        "关键路径工期(h)": float(row["关键路径工期(h)"]),
+    }
+
+
+@_product_cached
+def step_durations(category: str, product: str) -> pd.DataFrame:
+    """逐步骤的归一化时长（小时）与工艺温度"""
+    _require_product(category, product)
+    steps = get_store().facts.product_steps(category, product)
+    return steps[["步骤序号", "步骤名称", "工艺时间", "时长下限(h)", "时长上限(h)", "时长(h)",
+                  "工艺温度", "温度下限(℃)", "温度上限(℃)"]].reset_index(drop=True)
+
+
+@_product_cached
+def parameter_breakdown(category: str, product: str) -> pd.DataFrame:
+    """关键参数明细：参数名称、所属步骤、参数类型、重要程度"""
+    _require_product(category, product)
+    param_facts = get_store().facts.product_parameters(category, product)
+    return pd.DataFrame({
+        "参数名称": param_facts["参数名称"].astype(str).to_numpy(),
+        "所属步骤": param_facts["步骤名称"].astype(str).to_numpy(),
+        "参数类型": param_facts["参数类型"].astype(str).to_numpy(),
+        "重要程度": param_facts["重要程度"].to_numpy()
+    })
+
+
+@_product_cached
+def parameter_type_counts(category: str, product: str) -> pd.Series:
+    """各参数类型的关键参数个数（降序）"""
+    return parameter_breakdown(category, product)["参数类型"].value_counts()
+
+
+@_product_cached
+def equipment_breakdown(category: str, product: str) -> pd.DataFrame:
+    """设备清单：每台设备的类型、使用次数与使用步骤"""
+    _require_product(category, product)
+    return get_store().equipment_incidence.product_breakdown((category, product))
+
+
+@_product_cached
+def equipment_type_counts(category: str, product: str) -> pd.Series:
+    """各设备类型的设备使用次数（降序）"""
+    _require_product(category, product)
+    equip_facts = get_store().facts.product_equipment(category, product)
+    return equip_facts["设备类型"].astype(str).value_counts()
+
+
+@_product_cached
+def process_schedule(category: str, product: str) -> ProcessSchedule:
+    """按步骤依赖计算的排程表、关键路径工期与关键路径步骤名称"""
+    _require_product(category, product)
+    steps = get_store().get_product_info(category, product).get("工艺步骤", [])
+    graph = get_store().facts.product_graph(category, product, steps)
+    return {
+        "排程": graph.schedule(),
+        "关键路径工期(h)": graph.makespan,
+        "关键路径": [steps[i]["name"] for i in graph.critical_path()],
+    }
+
+
+@_catalog_cached
+def category_aggregates() -> pd.DataFrame:
+    """各分类的产品数、步骤数与参数数统计、设备种类数、平均工艺时间与温度极值（加载目录时已汇总）"""
+    return get_store().facts.categories.round(1)
+
+
+@_catalog_cached
+def category_equipment_demand() -> pd.DataFrame:
+    """各分类按设备类型的设备使用次数，行为分类、列为设备类型"""
+    return get_store().facts.category_equipment
+
+
+@_catalog_cached
+def equipment_usage() -> pd.DataFrame:
+    """每种设备的类型、使用产品数、使用分类数与使用次数，按产品数降序"""
+    return get_store().equipment_incidence.equipment_usage()
+
+
+@_catalog_cached
+def products_using_equipment(name: str) -> pd.DataFrame:
+    """使用某设备的产品及其使用次数与使用步骤"""
+    return get_store().equipment_incidence.products_using(name)
+
+
+@_catalog_cached
+def equipment_overlap(first: ProductKey, second: ProductKey) -> pd.DataFrame:
+    """两个产品的设备重叠：共用、仅第一个产品使用、仅第二个产品使用"""
+    _require_product(*first)
+    _require_product(*second)
+    return get_store().equipment_incidence.overlap(first, second)
+
+
+@_catalog_cached
+def category_equipment_co_usage() -> tuple[pd.DataFrame, pd.DataFrame]:
+    """分类两两之间的共用设备种类数与 Jaccard 系数"""
+    return get_store().equipment_incidence.category_co_usage()
+
+
+@_catalog_cached
+def similarity_matrix(keys: tuple[ProductKey, ...], metric: str = "cosine") -> pd.DataFrame:
+    """一组产品两两之间的工艺相似度，未知产品被忽略"""
+    _require_metric(metric)
+    similarity = get_store().similarity
+    return similarity.similarity_matrix([key for key in keys if key in similarity.positions], metric)
+
+
+@_catalog_cached
+def similar_products(category: str, product: str, top_n: int = 10, metric: str = "cosine") -> pd.DataFrame:
+    """全目录中与指定产品最相似的 top_n 个产品"""
+    _require_product(category, product)
+    _require_metric(metric)
+    return get_store().similarity.most_similar((category, product), top_n, metric)
+
+
+@_catalog_cached
+def step_alignment(reference: ProductKey, other: ProductKey) -> tuple[float, pd.DataFrame]:
+    """两个产品工艺步骤的逐步比对：(总得分, 比对表)"""
+    _require_product(*reference)
+    _require_product(*other)
+    return get_store().aligner.align(reference, other)
+
+
+@_catalog_cached
+def alignment_summary(reference: ProductKey, others: tuple[ProductKey, ...]) -> pd.DataFrame:
+    """参考产品与一组产品的批量比对汇总"""
+    _require_product(*reference)
+    for key in others:
+        _require_product(*key)
+    return get_store().aligner.align_many(reference, list(others))
@@ -0,0 +1,238 @@
+"""
+工艺分析 HTTP/JSON 接口 - 基于标准库 http.server，对外提供 analytics 中的分析函数。
+
+响应体按 (存储谱系, 内容版本, 路径, 查询参数) 缓存，ETag 取内容版本：单个产品的接口为产品内容哈希，
+其余接口为目录版本。内容不变时客户端携带 If-None-Match 重新验证只返回 304，目录更新后
+未变化产品的 ETag 保持不变。ETag 在路由成功后才比较，未知路径或产品不会得到 304。
+
+    python -m pharma_process.api_server --port 8765
+
+接口：
+    GET /api/version
+    GET /api/categories
+    GET /api/categories/stats
+    GET /api/categories/equipment
+    GET /api/equipment
+    GET /api/equipment/<设备名称>/products
+    GET /api/products[?category=分类]
+    GET /api/products/<分类>/<产品>
+    GET /api/products/<分类>/<产品>/durations
+    GET /api/products/<分类>/<产品>/parameters
+    GET /api/products/<分类>/<产品>/equipment
+    GET /api/products/<分类>/<产品>/schedule
+    GET /api/products/<分类>/<产品>/similar[?top_n=10&metric=cosine]
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from . import analytics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+RESPONSE_CACHE_SIZE = 512
+
+# 设置该环境变量后，Streamlit 页面进程会在后台线程中同时启动本接口，
+# 页面与接口共用 analytics 的进程内缓存
+API_PORT_ENV_VAR = "PHARMA_PROCESS_API_PORT"
+
+
+def _jsonable(value):
+    """把 DataFrame、numpy 标量等转换为可 JSON 序列化的对象，NaN/±inf 转为 null"""
+    if isinstance(value, pd.DataFrame):
+        return [{column: _jsonable(v) for column, v in row.items()} for row in value.to_dict(orient="records")]
+    if isinstance(value, pd.Series):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _product_route(category, product, view, query):
+    if view is None:
+        return analytics.product_statistics(category, product)
+    if view == "durations":
+        return analytics.step_durations(category, product)
+    if view == "parameters":
+        return analytics.parameter_breakdown(category, product)
+    if view == "equipment":
+        return analytics.equipment_breakdown(category, product)
+    if view == "schedule":
+        return analytics.process_schedule(category, product)
+    if view == "similar":
+        try:
+            top_n = int(query.get("top_n", "10"))
+        except ValueError:
+            raise ValueError(f"top_n 必须为整数: {query['top_n']}") from None
+        if top_n < 1:
+            raise ValueError(f"top_n 必须为正整数: {top_n}")
+        return analytics.similar_products(category, product, top_n, query.get("metric", "cosine"))
+    raise LookupError(view)
+
+
+def route(parts, query):
+    """按路径分段分发到 analytics 函数；未知路径抛出 LookupError"""
+    if parts == ["api", "version"]:
+        return {"version": analytics.catalog_version()}
+    if parts == ["api", "categories"]:
+        return analytics.list_categories()
+    if parts == ["api", "categories", "stats"]:
+        return analytics.category_aggregates()
+    if parts == ["api", "categories", "equipment"]:
+        return analytics.category_equipment_demand().reset_index()
+    if parts == ["api", "equipment"]:
+        return analytics.equipment_usage()
+    if len(parts) == 4 and parts[:2] == ["api", "equipment"] and parts[3] == "products":
+        return analytics.products_using_equipment(parts[2])
+    if parts == ["api", "products"]:
+        return analytics.list_products(query.get("category"))
+    if len(parts) in (4, 5) and parts[:2] == ["api", "products"]:
+        return _product_route(parts[2], parts[3], parts[4] if len(parts) == 5 else None, query)
+    raise LookupError("/".join(parts))
+
+
+def resource_version(parts):
+    """
+    响应所依赖内容的版本，用作缓存键与 ETag：单个产品的接口（相似产品除外）取产品内容哈希，
+    目录更新后内容未变的产品响应仍然有效；其余接口取目录版本。
+    """
+    if len(parts) in (4, 5) and parts[:2] == ["api", "products"] and parts[4:] != ["similar"]:
+        version = analytics.product_version(parts[2], parts[3])
+        if version is not None:
+            return version
+    return analytics.catalog_version()
+
+
+class _ResponseCache:
+    """序列化后响应体的 LRU 缓存，键中含内容版本"""
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        body = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = body
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return body
+
+
+response_cache = _ResponseCache()
+
+
+class AnalyticsRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PharmaProcessAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        version = resource_version(parts)
+        etag = f'"{version}"'
+
+        def compute():
+            payload = _jsonable(route(parts, query))
+            return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        try:
+            key = (analytics.store_lineage(), version, tuple(parts), tuple(sorted(query.items())))
+            body = response_cache.get(key, compute)
+        except KeyError as e:
+            self._send_error(HTTPStatus.NOT_FOUND, e.args[0] if e.args else str(e))
+        except LookupError:
+            self._send_error(HTTPStatus.NOT_FOUND, f"未知接口: {url.path}")
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        else:
+            if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+                self._send(HTTPStatus.NOT_MODIFIED, etag=etag)
+            else:
+                self._send(HTTPStatus.OK, body, etag=etag)
+
+    def _send_error(self, status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self._send(status, body)
+
+    def _send(self, status, body=b"", etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    return ThreadingHTTPServer((host, port), AnalyticsRequestHandler)
+
+
+@lru_cache(maxsize=None)
+def start_background_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """在守护线程中启动接口（每个进程只启动一次），返回服务器对象"""
+    server = make_server(host, port)
+    threading.Thread(target=server.serve_forever, name="analytics-api", daemon=True).start()
+    return server
+
+
+def start_from_env():
+    """若设置了 PHARMA_PROCESS_API_PORT，则在当前进程后台启动接口"""
+    port = os.environ.get(API_PORT_ENV_VAR)
+    if port:
+        return start_background_server(DEFAULT_HOST, int(port))
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="制药工艺分析 HTTP/JSON 接口")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port)
+    print(f"工艺分析接口已启动: http://{args.host}:{args.port}/api/version")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+性能基准 - 以合成工艺目录测量目录加载与内存占用、各视图计算、共享设备排产、分类器与名称规范化吞吐及图表序列化大小。
+
+    python -m pharma_process.benchmark                          # 10², 10⁴, 10⁶ 个步骤
+    python -m pharma_process.benchmark --sizes 100 10000 --output bench.json
+    python -m pharma_process.benchmark --sizes 1000 --apptest   # 另以 Streamlit AppTest 跑完整页面
+
+合成目录按现有工艺目录的结构生成：随机选取真实产品作模板，参数与设备名称
+按目录规模加后缀扩充词表。结果以 JSON 输出，每条记录为
+{"steps", "group", "name", "value", "unit"}，便于跟踪性能回归。
+"""
+
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from . import process_store
+from .canonical_names import build_canonicalizers
+from .compact_catalog import CompactCatalog, memory_footprint
+from .classifiers import KeywordClassifier, load_rules
+from .process_store import CATALOG_ENV_VAR, DEFAULT_CATALOG_PATH, get_store, load_catalog
+
+DEFAULT_SIZES = (10 ** 2, 10 ** 4, 10 ** 6)
+
+# 超过该步骤数时默认不跑 AppTest 全页面计时
+APPTEST_MAX_STEPS = 10 ** 4
+
+# 排产基准：产品数、总批次数与局部搜索迭代次数
+SCHEDULING_PRODUCTS = 3
+SCHEDULING_BATCHES = 300
+SCHEDULING_ITERATIONS = 500
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+
+def synthetic_catalog(num_steps, seed=0, base_path=DEFAULT_CATALOG_PATH):
+    """
+    生成恰好 num_steps 个步骤、结构与工艺目录一致的合成目录。
+
+    参数与设备名称以约 √num_steps 的比例加后缀变体，使词表随规模增长，
+    而不是所有产品共享同一组名称。
+    """
+    rng = random.Random(seed)
+    base = load_catalog(base_path)
+    templates = [(category, product, info) for category, products in base.items() for product, info in products.items()]
+    variants = max(1, int(math.sqrt(num_steps) / 10))
+
+    def vary(names):
+        return [f"{name}-{rng.randrange(variants)}" if variants > 1 and rng.random() < 0.5 else name for name in names]
+
+    catalog = {category: {} for category in base}
+    remaining = num_steps
+    i = 0
+    while remaining > 0:
+        category, product, info = rng.choice(templates)
+        steps = copy.deepcopy(info.get("工艺步骤", []))[:remaining]
+        for step in steps:
+            step["关键参数"] = vary(step.get("关键参数", []))
+            step["设备"] = vary(step.get("设备", []))
+        if len(steps) < len(info.get("工艺步骤", [])):
+            # 截断的产品去掉依赖声明，避免引用被截掉的步骤
+            for step in steps:
+                step.pop("依赖", None)
+        catalog[category][f"{product}-{i}"] = {**info, "工艺步骤": steps}
+        remaining -= len(steps)
+        i += 1
+    return {category: products for category, products in catalog.items() if products}
+
+
+class Recorder:
+    def __init__(self, num_steps):
+        self.num_steps = num_steps
+        self.results = []
+
+    def add(self, group, name, value, unit):
+        self.results.append({"steps": self.num_steps, "group": group, "name": name, "value": value, "unit": unit})
+
+    def time(self, group, name, func, repeat=1, setup=None):
+        """调用 func repeat 次，记录耗时中位数（秒），返回最后一次的结果"""
+        timings = []
+        result = None
+        for _ in range(repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        self.add(group, name, statistics.median(timings), "s")
+        return result
+
+
+def _clear_analytics_caches():
+    from . import analytics
+
+    for value in vars(analytics).values():
+        if callable(getattr(value, "cache_clear", None)):
+            value.cache_clear()
+
+
+def bench_load(recorder, path):
+    """
+    目录解析、共享存储加载与各索引的分项构建耗时。温度索引、设备关联矩阵与步骤比对编码
+    由存储在首次使用时构建，不计入 get_store，分项单独计时。
+
+    分项逐个重建后立即丢弃，大规模目录下同时驻留的只有共享存储和一个分项。
+    """
+    from .alignment import StepAligner
+    from .equipment_incidence import EquipmentIncidence
+    from .fact_tables import FactTables
+    from .search_index import SearchIndex
+    from .similarity import SimilarityIndex
+    from .temperatures import TemperatureIndex
+
+    processes = recorder.time("load", "parse_catalog", lambda: load_catalog(path))
+
+    os.environ[CATALOG_ENV_VAR] = str(path)
+    store = recorder.time("load", "get_store", get_store)
+    recorder.add("load", "products", len(store.product_index), "count")
+
+    facts = store.facts
+    recorder.time("load", "build_store.compact_catalog", lambda: CompactCatalog(processes))
+    recorder.time("load", "build_store.fact_tables", lambda: FactTables(processes))
+    recorder.time("load", "build_store.temperature_index", lambda: TemperatureIndex(facts.steps))
+    recorder.time("load", "build_store.equipment_incidence", lambda: EquipmentIncidence(facts))
+    recorder.time("load", "build_store.search_index", lambda: SearchIndex(processes, facts))
+    recorder.time("load", "build_store.similarity_index", lambda: SimilarityIndex(facts))
+    recorder.time("load", "build_store.step_aligner", lambda: StepAligner(facts))
+
+    # 同一目录两种存放方式的内存占用，以及按需还原单个产品与完整目录的耗时
+    for name, size in memory_footprint(processes, store.catalog).items():
+        recorder.add("内存", f"{name}.bytes", size, "bytes")
+    key = next(iter(store.product_index), None)
+    if key is not None:
+        recorder.time("内存", "get_product_info", lambda: store.get_product_info(*key), repeat=5)
+    recorder.time("内存", "to_dict", store.catalog.to_dict)
+    return store
+
+
+def bench_reload(recorder, store):
+    """
+    修改一个产品后的增量重建耗时（不含文件解析）。
+
+    with_hashes 相当于从版本库检出，产品哈希已知；compare_products 相当于重新读取目录文件，
+    需先逐个比较产品内容找出变化的产品。
+    """
+    from .catalog_versions import product_hash
+
+    key = next((key for key, info in store.product_index.items() if info.get("工艺步骤")), None)
+    if key is None:
+        return
+    info = copy.deepcopy(store.product_index[key])
+    info["工艺步骤"][0]["name"] += "（修订）"
+    processes = {category: dict(products) for category, products in store.processes.items()}
+    processes[key[0]][key[1]] = info
+    product_hashes = {**store.product_hashes, key: product_hash(info)}
+
+    recorder.time("reload", "one_product_edit.with_hashes", lambda: store.updated(processes, product_hashes), repeat=3)
+    recorder.time("reload", "one_product_edit.compare_products", lambda: store.updated(processes), repeat=3)
+
+
+def bench_scheduling(recorder, store, batches=SCHEDULING_BATCHES, iterations=SCHEDULING_ITERATIONS):
+    """共享设备排产：取与第一个产品共用设备的产品共 SCHEDULING_PRODUCTS 个，均分 batches 个批次"""
+    from .scheduling import CampaignScheduler
+    from .simulation import recipes_for
+
+    def equipment(info):
+        return {name for step in info.get("工艺步骤", []) for name in step.get("设备", [])}
+
+    first = next((key for key, info in store.product_index.items() if equipment(info)), None)
+    if first is None:
+        return
+    shared = equipment(store.product_index[first])
+    keys = [first] + [
+        key for key, info in store.product_index.items() if key != first and equipment(info) & shared
+    ][:SCHEDULING_PRODUCTS - 1]
+    demand = {key: batches // len(keys) for key in keys}
+    recipes = recipes_for(keys, store)
+
+    scheduler = CampaignScheduler(recipes, demand)
+    order = scheduler.greedy_orders()["成组"]
+    recorder.time("scheduling", f"decode.{len(order)}_batches", lambda: scheduler._decode(order), repeat=3)
+    result = recorder.time(
+        "scheduling", f"solve.{iterations}_iterations",
+        lambda: CampaignScheduler(recipes, demand).solve(iterations=iterations, time_limit=float("inf"))
+    )
+    recorder.add("scheduling", "makespan", result.makespan, "h")
+
+
+def bench_views(recorder, store, repeat):
+    """各视图模式的计算耗时（冷缓存）与图表序列化大小"""
+    from . import analytics
+    from .charts import build_equipment_type_figure, build_parameter_type_figure, build_product_flowchart
+
+    rng = random.Random(1)
+    keys = list(store.product_index)
+    product = rng.choice(keys)
+    comparison = tuple(rng.sample(keys, min(3, len(keys))))
+    cold = _clear_analytics_caches
+
+    # 单一产品详情：四个视图
+    recorder.time("单一产品详情", "工艺步骤详情", lambda: (
+        analytics.product_statistics(*product), analytics.step_durations(*product)
+    ), repeat, cold)
+    parameter_figure = recorder.time("单一产品详情", "关键参数分析", lambda: (
+        analytics.parameter_breakdown(*product),
+        build_parameter_type_figure(analytics.parameter_type_counts(*product)),
+    ), repeat, cold)[1]
+    equipment_figure = recorder.time("单一产品详情", "设备需求", lambda: (
+        analytics.equipment_breakdown(*product),
+        build_equipment_type_figure(analytics.equipment_type_counts(*product)),
+    ), repeat, cold)[1]
+    flowchart_figure = recorder.time("单一产品详情", "工艺流程图", lambda: (
+        build_product_flowchart(*product), analytics.process_schedule(*product)
+    ), repeat, cold)[0]
+    recorder.time("单一产品详情", "工艺步骤详情(缓存命中)", lambda: analytics.step_durations(*product), repeat)
+
+    # 多产品对比
+    recorder.time("多产品对比", "产品汇总", lambda: store.facts.product_summaries(list(comparison)), repeat)
+    recorder.time("多产品对比", "相似度矩阵", lambda: analytics.similarity_matrix(comparison), repeat, cold)
+    recorder.time("多产品对比", "最相似产品", lambda: analytics.similar_products(*comparison[0]), repeat, cold)
+    if len(comparison) > 1:
+        recorder.time("多产品对比", "步骤比对", lambda: analytics.step_alignment(comparison[0], comparison[1]), repeat, cold)
+        recorder.time("多产品对比", "批量步骤比对", lambda: analytics.alignment_summary(comparison[0], comparison[1:]),
+                      repeat, cold)
+
+    # 分类概览与检索
+    recorder.time("分类概览", "工艺步骤数对比", analytics.category_aggregates, repeat, cold)
+    recorder.time("分类概览", "温度区间查询", lambda: store.temperature_index.overlapping(2, 8), repeat)
+    recorder.time("全文检索", "关键词检索", lambda: store.search_index.search("灭菌 温度"), repeat)
+
+    for name, figure in (("关键参数类型分布", parameter_figure), ("设备类型分布", equipment_figure),
+                         ("工艺流程图", flowchart_figure)):
+        recorder.time("图表序列化", name, figure.to_json, repeat)
+        recorder.add("图表序列化", f"{name}.bytes", len(figure.to_json().encode("utf-8")), "bytes")
+
+
+def bench_classifiers(recorder, store):
+    """分类器吞吐：对目录中全部不同参数/设备名称做未缓存的分类"""
+    rules = load_rules()
+    for table, column, source in (("参数类型", "参数名称", store.facts.parameters),
+                                  ("重要程度", "参数名称", store.facts.parameters),
+                                  ("设备类型", "设备名称", store.facts.equipment)):
+        names = [str(name) for name in source[column].cat.categories]
+        classifier = KeywordClassifier(rules[table]["rules"], rules[table]["default"])
+        start = time.perf_counter()
+        for name in names:
+            classifier._classify(name)
+        elapsed = time.perf_counter() - start
+        recorder.add("分类器", f"{table}.names", len(names), "count")
+        recorder.add("分类器", f"{table}.throughput", len(names) / elapsed if elapsed else float("inf"), "names/s")
+
+        series = source[column]
+        classifier = KeywordClassifier(rules[table]["rules"], rules[table]["default"])
+        recorder.time("分类器", f"{table}.classify_series", lambda: classifier.classify_series(series))
+
+
+def bench_canonicalization(recorder, store):
+    """名称规范化吞吐：以新建的规范化器解析目录中全部不同设备/参数名称（同义词、规范键与模糊匹配）"""
+    canonicalizers = build_canonicalizers()
+    for table, column, source in (("设备", "设备名称", store.facts.equipment),
+                                  ("参数", "参数名称", store.facts.parameters)):
+        names = [str(name) for name in source[column].cat.categories]
+        canonicalizer = canonicalizers[table]
+        start = time.perf_counter()
+        for name in names:
+            canonicalizer(name)
+        elapsed = time.perf_counter() - start
+        recorder.add("名称规范化", f"{table}.names", len(names), "count")
+        recorder.add("名称规范化", f"{table}.canonical", len(canonicalizer), "count")
+        recorder.add("名称规范化", f"{table}.throughput", len(names) / elapsed if elapsed else float("inf"), "names/s")
+
+
+def bench_apptest(recorder, path):
+    """以 Streamlit AppTest 跑完整页面：首屏与切换各查看模式的耗时"""
+    from streamlit.testing.v1 import AppTest
+
+    os.environ[CATALOG_ENV_VAR] = str(path)
+    at = AppTest.from_file(str(APP_PATH), default_timeout=600)
+    recorder.time("AppTest", "首次运行", at.run)
+    for mode in ("多产品对比", "分类概览", "全文检索", "单一产品详情"):
+        recorder.time("AppTest", mode, lambda: at.sidebar.radio[0].set_value(mode).run())
+    if at.exception:
+        recorder.add("AppTest", "exceptions", len(at.exception), "count")
+
+
+def run_size(num_steps, repeat, apptest, seed):
+    recorder = Recorder(num_steps)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"catalog_{num_steps}.json"
+        catalog = synthetic_catalog(num_steps, seed)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f, ensure_ascii=False)
+        recorder.add("load", "catalog_file", path.stat().st_size, "bytes")
+
+        store = bench_load(recorder, path)
+        bench_reload(recorder, store)
+        bench_scheduling(recorder, store)
+        bench_views(recorder, store, repeat)
+        bench_classifiers(recorder, store)
+        bench_canonicalization(recorder, store)
+        if apptest:
+            bench_apptest(recorder, path)
+    # 释放该规模的共享存储，避免多个规模的目录同时驻留内存
+    process_store.clear_stores()
+    _clear_analytics_caches()
+    return recorder.results
+
+
+def environment():
+    import numpy
+    import pandas
+    import plotly
+    import streamlit
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": {module.__name__: module.__version__ for module in (numpy, pandas, plotly, streamlit)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="制药工艺应用性能基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="合成目录的步骤数")
+    parser.add_argument("--repeat", type=int, default=5, help="视图计时的重复次数（取中位数）")
+    parser.add_argument("--apptest", action="store_true", help=f"对所有规模运行 AppTest（默认仅 ≤{APPTEST_MAX_STEPS} 步骤）")
+    parser.add_argument("--no-apptest", action="store_true", help="不运行 AppTest")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="结果 JSON 文件（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+
+    results = []
+    for num_steps in args.sizes:
+        apptest = not args.no_apptest and (args.apptest or num_steps <= APPTEST_MAX_STEPS)
+        print(f"基准: {num_steps} 个步骤 ...", file=sys.stderr)
+        results.extend(run_size(num_steps, args.repeat, apptest, args.seed))
+
+    report = json.dumps({"environment": environment(), "results": results}, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+名称规范化 - 将近似重复的设备、参数名称映射为规范 ID。
+
+    python -m pharma_process.canonical_names                 # 列出设备名称的合并结果
+    python -m pharma_process.canonical_names --table 参数 --catalog catalog.json
+
+解析顺序：同义词表 → 规范键（NFKC、小写、去空白与通用后缀）精确匹配 → 二元组模糊匹配。
+模糊匹配以规范键的二元组倒排表分块，只探查最稀有的若干个二元组（前缀过滤）取候选，
+再以 Dice 系数校验，词表达到数万个名称时单个名称的解析仍只涉及少量候选。
+
+规范化器由每次完整加载的事实表各自新建，整列名称按出现次数（相同时按名称）的固定顺序解析，
+同一目录得到的规范名称与此前加载过什么目录无关。
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import threading
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SYNONYMS_PATH = Path(__file__).resolve().parent / "data" / "name_synonyms.json"
+
+# 二元组 Dice 系数不低于该值才视为同一名称
+FUZZY_THRESHOLD = 0.8
+# 去掉通用后缀后至少保留的字符数，避免 "筛机" 之类的短名称退化为单字
+MIN_KEY_LENGTH = 2
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d+")
+
+
+class NameCanonicalizer:
+    """
+    原始名称 → 规范 ID 的映射，ID 从 0 起按解析顺序分配，只追加不复用。
+
+    规范名称取同义词表中的标准名称，或该规范键第一次解析时的原始写法；由 canonical_ids()
+    整列解析时即出现次数最多的写法。目录增量更新沿用上一版本事实表的实例，已有名称的 ID
+    与规范名称保持不变，只登记新出现的名称。模糊匹配要求两个名称中的数字完全一致，
+    "灌装机-3" 与 "灌装机-4" 这类编号不同的设备不会合并。
+    """
+
+    def __init__(self, synonyms, suffixes=(), threshold=FUZZY_THRESHOLD):
+        self.suffixes = sorted(suffixes, key=len, reverse=True)
+        self.threshold = threshold
+        self.names = []
+        self._ids = {}
+        self._keys = {}
+        self._grams = {}
+        # (二元组, 二元组数, 数字串) → 规范键：按长度与数字分块，长度过滤与数字比较在取候选时完成
+        self._postings = {}
+        self._frequency = {}
+        self._lock = threading.Lock()
+        for canonical, aliases in synonyms.items():
+            canonical_id = self._register(self.normalize(canonical), canonical)
+            for alias in aliases:
+                key = self.normalize(alias)
+                if key not in self._keys:
+                    self._keys[key] = canonical_id
+                    self._index(key)
+
+    def __len__(self):
+        return len(self.names)
+
+    def normalize(self, name):
+        """规范键：NFKC 折叠全/半角、转小写、去空白，再去掉一个通用后缀"""
+        key = _WHITESPACE.sub("", unicodedata.normalize("NFKC", str(name))).lower()
+        for suffix in self.suffixes:
+            if key.endswith(suffix) and len(key) - len(suffix) >= MIN_KEY_LENGTH:
+                return key[:-len(suffix)]
+        return key
+
+    @staticmethod
+    def _bigrams(key):
+        padded = f"^{key}$"
+        return frozenset(padded[i:i + 2] for i in range(len(padded) - 1))
+
+    def _index(self, key):
+        grams = self._grams[key] = self._bigrams(key)
+        block = (len(grams), tuple(_DIGITS.findall(key)))
+        for gram in grams:
+            self._frequency[gram] = self._frequency.get(gram, 0) + 1
+            self._postings.setdefault((gram, *block), []).append(key)
+
+    def _register(self, key, name):
+        canonical_id = self._keys.get(key)
+        if canonical_id is None:
+            canonical_id = self._keys[key] = len(self.names)
+            self.names.append(str(name))
+            self._index(key)
+        return canonical_id
+
+    def _fuzzy(self, key):
+        """Dice 系数最高且不低于阈值的已登记规范键，没有时返回 None"""
+        grams = self._bigrams(key)
+        size = len(grams)
+        t = self.threshold
+        # 满足阈值的候选至少共享 overlap 个二元组，任取 size - overlap + 1 个二元组必命中其一
+        overlap = math.ceil(t * size / (2 - t) - 1e-9)
+        probes = sorted(grams, key=lambda gram: self._frequency.get(gram, 0))[:size - overlap + 1]
+        digits = tuple(_DIGITS.findall(key))
+        candidates = set()
+        for other_size in range(overlap, int(size * (2 - t) / t + 1e-9) + 1):
+            for gram in probes:
+                candidates.update(self._postings.get((gram, other_size, digits), ()))
+        best, best_score = None, t
+        for candidate in candidates:
+            other = self._grams[candidate]
+            score = 2 * len(grams & other) / (size + len(other))
+            # 得分相同时取先登记（出现次数更多）的规范键，结果不依赖集合的遍历顺序
+            if score > best_score or (score == best_score and (best is None or self._keys[candidate] < self._keys[best])):
+                best, best_score = candidate, score
+        return best
+
+    def _resolve(self, name):
+        key = self.normalize(name)
+        canonical_id = self._keys.get(key)
+        if canonical_id is not None:
+            return canonical_id
+        match = self._fuzzy(key)
+        if match is None:
+            return self._register(key, name)
+        # 变体只记入规范键表而不进入倒排表，避免 A≈B、B≈C 逐步漂移到与 A 不相似的 C
+        canonical_id = self._keys[key] = self._keys[match]
+        return canonical_id
+
+    def __call__(self, name):
+        """原始名称 → 规范 ID，未见过的名称登记为新 ID"""
+        result = self._ids.get(name)
+        if result is None:
+            with self._lock:
+                result = self._ids.get(name)
+                if result is None:
+                    result = self._ids[name] = self._resolve(name)
+        return result
+
+    def find(self, name):
+        """只查询不登记：已知或可匹配到已知名称时返回规范 ID，否则返回 None"""
+        result = self._ids.get(name)
+        if result is None:
+            key = self.normalize(name)
+            result = self._keys.get(key)
+            if result is None:
+                match = self._fuzzy(key)
+                result = None if match is None else self._keys[match]
+        return result
+
+    def canonical(self, name):
+        """原始名称的规范名称；只查询不登记，匹配不到已知名称时原样返回"""
+        canonical_id = self.find(name)
+        return name if canonical_id is None else self.names[canonical_id]
+
+    def canonical_ids(self, values):
+        """
+        整列名称 → 规范 ID（int32 数组），每个不同名称只解析一次。
+
+        按出现次数从多到少、次数相同时按名称排序解析，新出现的规范键以最常见的写法作为
+        规范名称；新建的规范化器解析同一列名称总得到同样的结果。
+        """
+        values = values.array if isinstance(values.dtype, pd.CategoricalDtype) else pd.Categorical(values)
+        codes = np.asarray(values.codes)
+        counts = np.bincount(codes[codes >= 0], minlength=len(values.categories))
+        names = [str(name) for name in values.categories]
+        lookup = np.empty(len(names), dtype=np.int32)
+        for code in sorted(range(len(names)), key=lambda code: (-counts[code], names[code])):
+            lookup[code] = self(values.categories[code])
+        return np.where(codes >= 0, lookup[codes], -1).astype(np.int32)
+
+    def categorical(self, ids):
+        """规范 ID 数组 → 规范名称的分类数组，类别按名称排序，只含出现过的名称"""
+        ids = np.asarray(ids)
+        used = np.unique(ids[ids >= 0])
+        names = np.asarray(self.names, dtype=object)[used]
+        order = np.argsort(names, kind="stable")
+        ranks = np.empty(len(used), dtype=np.int64)
+        ranks[order] = np.arange(len(used))
+        codes = np.where(ids >= 0, ranks[np.searchsorted(used, ids)] if len(used) else -1, -1)
+        return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(pd.Index(names[order], dtype=object)),
+                                         validate=False)
+
+
+def variant_groups(frame, id_column, name_column, canonical_column):
+    """
+    事实表中被合并的名称：每个规范名称一行，附原始写法、写法数与使用次数。
+
+    只列出有两种及以上写法的规范名称，按写法数与使用次数降序。
+    """
+    groups = frame.groupby(id_column, sort=False)
+    report = pd.DataFrame({
+        "规范名称": groups[canonical_column].first().astype(str),
+        "原始写法": groups[name_column].agg(lambda names: "、".join(sorted(map(str, names.unique())))),
+        "写法数": groups[name_column].nunique(),
+        "使用次数": groups.size(),
+    })
+    report = report[report["写法数"] > 1]
+    return report.sort_values(["写法数", "使用次数"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def load_synonyms(path=DEFAULT_SYNONYMS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+SYNONYM_TABLES = load_synonyms()
+
+
+def build_canonicalizers(tables=SYNONYM_TABLES):
+    """各名称类别（设备、参数）新建的规范化器"""
+    return {
+        table: NameCanonicalizer(spec.get("synonyms", {}), spec.get("suffixes", ())) for table, spec in tables.items()
+    }
+
+# 命令行 --table 对应的事实表与列
+REPORT_COLUMNS = {
+    "设备": ("equipment", "设备ID", "设备名称", "标准设备名称"),
+    "参数": ("parameters", "参数ID", "参数名称", "标准参数名称"),
+}
+
+
+def main(argv=None):
+    from .process_store import CATALOG_ENV_VAR, get_store
+
+    parser = argparse.ArgumentParser(description="列出工艺目录中被合并为同一规范名称的设备或参数名称")
+    parser.add_argument("--table", choices=list(REPORT_COLUMNS), default="设备", help="名称类别（默认 设备）")
+    parser.add_argument("--catalog", type=Path, help="工艺目录文件（JSON/CSV），默认取环境变量或内置目录")
+    args = parser.parse_args(argv)
+
+    if args.catalog is not None:
+        os.environ[CATALOG_ENV_VAR] = str(args.catalog)
+    facts = get_store().facts
+    table, id_column, name_column, canonical_column = REPORT_COLUMNS[args.table]
+    frame = getattr(facts, table)
+    report = variant_groups(frame, id_column, name_column, canonical_column)
+    print(f"{args.table}名称 {frame[name_column].nunique()} 种，规范化后 {frame[id_column].nunique()} 种，"
+          f"{len(report)} 个规范名称合并了多种写法")
+    if not report.empty:
+        print(report.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
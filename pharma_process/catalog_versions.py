@@ -0,0 +1,332 @@
+"""
+工艺目录版本库 - 多站点的版本化工艺目录，以产品为单位按内容哈希存储。
+
+    python -m pharma_process.catalog_versions commit --site 上海 catalog.json -m "调整冻干曲线"
+    python -m pharma_process.catalog_versions log --site 上海
+    python -m pharma_process.catalog_versions diff 上海@3 上海@4
+    python -m pharma_process.catalog_versions diff 上海 北京        # 两个站点的最新版本
+
+版本库目录结构：
+    objects/<哈希前两位>/<产品哈希>.json   产品内容，同一内容只存一份
+    sites/<站点>/<版本号>.json             版本清单：[分类, 产品, 产品哈希] 列表与提交说明
+    sites/<站点>/HEAD                      站点最新版本号
+
+各站点、各版本中内容相同的产品共享同一对象；比较两个版本只需比较清单中的哈希，
+检出新版本时只读取哈希变化的产品。
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from .alignment import StepAligner
+from .fact_tables import FactTables
+
+REPOSITORY_ENV_VAR = "PHARMA_PROCESS_CATALOG_REPO"
+SITE_ENV_VAR = "PHARMA_PROCESS_SITE"
+DEFAULT_REPOSITORY_PATH = Path("catalogs")
+
+# 已读取的产品对象（内容不可变）按哈希缓存，供各版本检出共享
+OBJECT_CACHE_SIZE = 100_000
+
+CHANGE_LABELS = {"added": "新增", "removed": "删除", "changed": "修改"}
+
+# 站点名称作为 sites/ 下的目录名，只允许字母、数字、汉字、下划线与连字符
+SITE_NAME_PATTERN = re.compile(r"[\w\-]+")
+
+
+def product_hash(info):
+    """产品内容哈希：键排序后的规范 JSON 的 SHA-256 前 16 位"""
+    payload = json.dumps(info, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def catalog_hash(product_hashes):
+    """由 {(分类, 产品): 产品哈希} 得到目录版本哈希，与产品顺序无关"""
+    digest = hashlib.sha256()
+    for (category, product), value in sorted(product_hashes.items()):
+        digest.update(f"{category}\x1f{product}\x1f{value}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def hash_products(processes):
+    return {
+        (category, product): product_hash(info)
+        for category, products in processes.items() for product, info in products.items()
+    }
+
+
+class CatalogDiff:
+    """两个目录版本之间按产品哈希比较的差异，各列表元素为 (分类, 产品)"""
+
+    def __init__(self, old_hashes, new_hashes):
+        self.added = [key for key in new_hashes if key not in old_hashes]
+        self.removed = [key for key in old_hashes if key not in new_hashes]
+        self.changed = [key for key, value in new_hashes.items() if key in old_hashes and old_hashes[key] != value]
+        self.unchanged = len(new_hashes) - len(self.added) - len(self.changed)
+
+    @property
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self):
+        """变化产品明细：分类、产品、变化类型"""
+        rows = [
+            {"分类": key[0], "产品": key[1], "变化": CHANGE_LABELS[kind]}
+            for kind in ("changed", "added", "removed") for key in getattr(self, kind)
+        ]
+        return pd.DataFrame(rows, columns=["分类", "产品", "变化"])
+
+    def __repr__(self):
+        return (f"CatalogDiff(新增={len(self.added)}, 删除={len(self.removed)}, "
+                f"修改={len(self.changed)}, 未变={self.unchanged})")
+
+
+def _write_atomic(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class CatalogRepository:
+    """本地目录上的多站点工艺目录版本库"""
+
+    def __init__(self, root=DEFAULT_REPOSITORY_PATH):
+        self.root = Path(root)
+        self._load_object = lru_cache(maxsize=OBJECT_CACHE_SIZE)(self._read_object)
+        self._load_manifest = lru_cache(maxsize=None)(self._read_manifest)
+
+    def _object_path(self, value):
+        return self.root / "objects" / value[:2] / f"{value}.json"
+
+    def _site_path(self, site):
+        """站点目录；名称不合法（含路径分隔符、"..", 空白等）时抛出 ValueError，不会落到版本库之外"""
+        if not isinstance(site, str) or not SITE_NAME_PATTERN.fullmatch(site):
+            raise ValueError(f"站点名称只能包含字母、数字、汉字、下划线与连字符: {site!r}")
+        return self.root / "sites" / site
+
+    def _read_object(self, value):
+        with open(self._object_path(value), encoding="utf-8") as f:
+            return json.load(f)
+
+    def _read_manifest(self, site, version):
+        with open(self._site_path(site) / f"{version}.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["products"] = {(category, product): value for category, product, value in manifest["products"]}
+        return manifest
+
+    def sites(self):
+        sites_dir = self.root / "sites"
+        if not sites_dir.is_dir():
+            return []
+        return sorted(
+            path.name for path in sites_dir.iterdir()
+            if SITE_NAME_PATTERN.fullmatch(path.name) and (path / "HEAD").is_file()
+        )
+
+    def head(self, site):
+        """站点最新版本号，站点不存在时为 None"""
+        try:
+            return int((self._site_path(site) / "HEAD").read_text(encoding="utf-8").strip())
+        except FileNotFoundError:
+            return None
+
+    def head_signature(self, site):
+        """站点 HEAD 文件的 (修改时间, 大小)，提交新版本后变化"""
+        stat = (self._site_path(site) / "HEAD").stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _resolve(self, site, version):
+        version = self.head(site) if version is None else int(version)
+        if version is None:
+            raise KeyError(f"站点不存在或没有版本: {site}")
+        return version
+
+    def manifest(self, site, version=None):
+        """版本清单：{"version", "parent", "created", "message", "catalog_version", "products": {(分类, 产品): 哈希}}"""
+        version = self._resolve(site, version)
+        try:
+            return self._load_manifest(site, version)
+        except FileNotFoundError:
+            raise KeyError(f"版本不存在: {site}@{version}") from None
+
+    def versions(self, site):
+        """站点的版本列表（由新到旧），不含产品清单"""
+        head = self.head(site)
+        if head is None:
+            return []
+        entries = []
+        for version in range(head, 0, -1):
+            manifest = self.manifest(site, version)
+            entries.append({**{key: value for key, value in manifest.items() if key != "products"},
+                            "products": len(manifest["products"])})
+        return entries
+
+    def product(self, value):
+        """按哈希读取产品内容；同一哈希返回同一对象，调用方不要修改"""
+        return self._load_object(value)
+
+    def checkout(self, site, version=None):
+        """检出站点的某个版本（默认最新）：返回 (工艺目录, {(分类, 产品): 哈希})"""
+        hashes = self.manifest(site, version)["products"]
+        processes = {}
+        for (category, product), value in hashes.items():
+            processes.setdefault(category, {})[product] = self.product(value)
+        return processes, hashes
+
+    def commit(self, site, processes, message=""):
+        """
+        提交工艺目录为站点的新版本，只写入版本库中尚不存在的产品对象。
+
+        内容与最新版本相同时不产生新版本，返回最新版本号。
+        """
+        hashes = hash_products(processes)
+        head = self.head(site)
+        if head is not None and self.manifest(site, head)["products"] == hashes:
+            return head
+
+        for (category, product), value in hashes.items():
+            path = self._object_path(value)
+            if not path.exists():
+                _write_atomic(path, json.dumps(processes[category][product], ensure_ascii=False))
+
+        version = (head or 0) + 1
+        manifest = {
+            "site": site,
+            "version": version,
+            "parent": head,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "message": message,
+            "catalog_version": catalog_hash(hashes),
+            "products": [[category, product, value] for (category, product), value in hashes.items()],
+        }
+        _write_atomic(self._site_path(site) / f"{version}.json", json.dumps(manifest, ensure_ascii=False, indent=1))
+        _write_atomic(self._site_path(site) / "HEAD", f"{version}\n")
+        return version
+
+    def diff(self, old, new):
+        """old、new 为 (站点, 版本号或 None)，返回 CatalogDiff"""
+        return CatalogDiff(self.manifest(*old)["products"], self.manifest(*new)["products"])
+
+
+def repository_path():
+    return Path(os.environ.get(REPOSITORY_ENV_VAR, DEFAULT_REPOSITORY_PATH))
+
+
+@lru_cache(maxsize=None)
+def _open_repository(path):
+    return CatalogRepository(path)
+
+
+def get_repository():
+    """进程级共享的版本库实例，产品对象与版本清单的读取缓存在各调用方之间共享"""
+    return _open_repository(repository_path())
+
+
+def _step_attributes(step):
+    return {key: value for key, value in step.items() if key != "name"}
+
+
+def compare_product_versions(old_info, new_info):
+    """
+    同一产品两个版本的工艺比较。
+
+    返回 (比对得分, 步骤比对表, 属性变化表)：步骤比对沿用 StepAligner 的全局比对，
+    属性变化列出产品描述、关键特征与对应步骤的时间、温度、参数、设备等字段的新旧取值。
+    """
+    product = "产品"
+    facts = FactTables({"旧版本": {product: old_info}, "新版本": {product: new_info}})
+    score, alignment = StepAligner(facts).align(("旧版本", product), ("新版本", product))
+
+    old_steps = old_info.get("工艺步骤", [])
+    new_steps = new_info.get("工艺步骤", [])
+    changes = []
+    for field in ("description", "关键特征"):
+        if old_info.get(field) != new_info.get(field):
+            changes.append({"步骤": "（产品）", "属性": field, "旧值": old_info.get(field), "新值": new_info.get(field)})
+    for row in alignment.itertuples(index=False):
+        if row.操作 not in ("相同", "替换"):
+            continue
+        old_step = old_steps[int(row.参考步骤序号) - 1]
+        new_step = new_steps[int(row.对比步骤序号) - 1]
+        old_attributes = _step_attributes(old_step)
+        new_attributes = _step_attributes(new_step)
+        label = row.参考步骤 if row.操作 == "相同" else f"{row.参考步骤} → {row.对比步骤}"
+        for field in dict.fromkeys([*old_attributes, *new_attributes]):
+            if old_attributes.get(field) != new_attributes.get(field):
+                changes.append({"步骤": label, "属性": field,
+                                "旧值": old_attributes.get(field), "新值": new_attributes.get(field)})
+
+    changes = pd.DataFrame(changes, columns=["步骤", "属性", "旧值", "新值"])
+    # 取值可能是列表或数字，统一转为文本便于展示
+    for column in ("旧值", "新值"):
+        changes[column] = changes[column].map(
+            lambda value: "" if value is None else "、".join(map(str, value)) if isinstance(value, list) else str(value)
+        )
+    return score, alignment, changes
+
+
+def _parse_ref(text):
+    site, _, version = text.partition("@")
+    return site, int(version) if version else None
+
+
+def main(argv=None):
+    from .process_store import load_catalog
+
+    parser = argparse.ArgumentParser(description="多站点工艺目录版本库")
+    parser.add_argument("--repo", default=None, help=f"版本库目录（默认取 {REPOSITORY_ENV_VAR} 或 {DEFAULT_REPOSITORY_PATH}）")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commit = commands.add_parser("commit", help="提交工艺目录文件为站点的新版本")
+    commit.add_argument("catalog", help="工艺目录文件（JSON/YAML/CSV）")
+    commit.add_argument("--site", required=True)
+    commit.add_argument("-m", "--message", default="")
+
+    log = commands.add_parser("log", help="列出站点的版本")
+    log.add_argument("--site", required=True)
+
+    diff = commands.add_parser("diff", help="比较两个版本，版本写作 站点@版本号，省略版本号为最新版本")
+    diff.add_argument("old")
+    diff.add_argument("new")
+
+    args = parser.parse_args(argv)
+    repository = CatalogRepository(args.repo) if args.repo else get_repository()
+    if args.command != "diff" and not SITE_NAME_PATTERN.fullmatch(args.site):
+        parser.error(f"站点名称只能包含字母、数字、汉字、下划线与连字符: {args.site!r}")
+
+    if args.command == "commit":
+        head = repository.head(args.site)
+        version = repository.commit(args.site, load_catalog(args.catalog), args.message)
+        if version == head:
+            print(f"{args.site}: 内容与版本 {version} 相同，未产生新版本")
+        else:
+            print(f"{args.site}: 已提交版本 {version}")
+    elif args.command == "log":
+        for entry in repository.versions(args.site):
+            print(f"{entry['version']:>4}  {entry['created']}  {entry['catalog_version']}  "
+                  f"{entry['products']} 个产品  {entry['message']}")
+    else:
+        try:
+            result = repository.diff(_parse_ref(args.old), _parse_ref(args.new))
+        except (KeyError, ValueError) as exc:
+            parser.error(exc.args[0])
+        print(result)
+        summary = result.summary()
+        if not summary.empty:
+            summary.to_csv(sys.stdout, sep="\t", index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""产品分析图表 - 参数类型饼图、设备类型柱状图与流程图，页面与报表导出共用"""
+
+import plotly.express as px
+
+from .flowchart import build_flowchart_figure, build_process_graph_figure
+from .instrumentation import traced
+from .process_graph import has_dependencies
+from .process_store import get_store
+
+# 使用暗色主题友好的颜色
+PARAMETER_COLORS = ['#636efa', '#ef553b', '#00cc96', '#ab63fa', '#ffa15a']
+
+
+@traced("build_parameter_type_figure")
+def build_parameter_type_figure(param_counts):
+    """关键参数类型分布饼图，param_counts 为 参数类型 → 个数"""
+    fig1 = px.pie(
+        values=param_counts.values,
+        names=param_counts.index,
+        title="关键参数类型分布",
+        color_discrete_sequence=PARAMETER_COLORS
+    )
+
+    # 更新饼图样式为暗色主题
+    fig1.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        title_font_color='white',
+        legend_font_color='white'
+    )
+
+    fig1.update_traces(
+        textfont_color='white',
+        marker=dict(line=dict(color='#2d3746', width=2))
+    )
+    return fig1
+
+
+@traced("build_equipment_type_figure")
+def build_equipment_type_figure(equip_type_counts):
+    """设备类型分布柱状图，equip_type_counts 为 设备类型 → 使用次数"""
+    fig2 = px.bar(
+        x=equip_type_counts.index,
+        y=equip_type_counts.values,
+        title="设备类型分布",
+        labels={"x": "设备类型", "y": "使用次数"},
+        color=equip_type_counts.index,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+
+    # 更新柱状图样式为暗色主题
+    fig2.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        title_font_color='white',
+        xaxis=dict(gridcolor='#2d3746'),
+        yaxis=dict(gridcolor='#2d3746')
+    )
+    return fig2
+
+
+@traced("build_product_flowchart")
+def build_product_flowchart(main_category, product):
+    """产品工艺流程图：声明了步骤依赖的产品按分层 DAG 绘制，否则绘制线性流程"""
+    # 同一次构建只取一次存储，避免重新加载时步骤与依赖检查来自不同版本
+    store = get_store()
+    steps = store.get_product_info(main_category, product).get("工艺步骤", [])
+    if has_dependencies(steps) and (main_category, product) not in store.facts.graph_errors:
+        graph = store.facts.product_graph(main_category, product, steps)
+        return build_process_graph_figure(graph, steps, f"{product} 工艺流程图")
+    return build_flowchart_figure(steps, f"{product} 工艺流程图")
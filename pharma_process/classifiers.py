@@ -0,0 +1,83 @@
+"""参数与设备分类 - 由规则表编译的多关键词匹配器，按不同名称缓存结果"""
+
+import json
+import re
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent / "data" / "classification_rules.json"
+
+
+class KeywordClassifier:
+    """
+    按优先级排列的关键词规则分类器。
+
+    所有规则的关键词编译为一个正则，在每个位置用前瞻匹配，单次扫描即可得到
+    命中的最高优先级规则；结果与逐条规则依次 any(word in name) 判断一致。
+    """
+
+    def __init__(self, rules, default):
+        self.labels = [rule["label"] for rule in rules]
+        self.default = default
+        groups = []
+        for i, rule in enumerate(rules):
+            keywords = sorted(rule["keywords"], key=len, reverse=True)
+            groups.append(f"(?P<r{i}>{'|'.join(map(re.escape, keywords))})")
+        self.pattern = re.compile(f"(?=(?:{'|'.join(groups)}))", re.IGNORECASE) if groups else None
+        self._cache = {}
+
+    def _classify(self, name):
+        if self.pattern is None:
+            return self.default
+        best = None
+        for match in self.pattern.finditer(name):
+            rule = int(match.lastgroup[1:])
+            if best is None or rule < best:
+                best = rule
+                if best == 0:
+                    break
+        return self.default if best is None else self.labels[best]
+
+    def __call__(self, name):
+        result = self._cache.get(name)
+        if result is None:
+            result = self._cache[name] = self._classify(name)
+        return result
+
+    def classify_series(self, names):
+        """对整列名称分类，每个不同名称只匹配一次"""
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            lookup = pd.Series([self(name) for name in names.cat.categories])
+            return pd.Series(lookup.reindex(names.cat.codes).to_numpy(), index=names.index)
+        unique = names.unique()
+        return names.map(dict(zip(unique, map(self, unique))))
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_classifiers(rules):
+    return {
+        table: KeywordClassifier(spec["rules"], spec["default"]) for table, spec in rules.items()
+    }
+
+
+CLASSIFIERS = build_classifiers(load_rules())
+parameter_type_classifier = CLASSIFIERS["参数类型"]
+importance_classifier = CLASSIFIERS["重要程度"]
+equipment_type_classifier = CLASSIFIERS["设备类型"]
+
+
+def classify_parameter(param_name):
+    return parameter_type_classifier(param_name)
+
+
+def assess_importance(param_name):
+    return importance_classifier(param_name)
+
+
+def classify_equipment(equip_name):
+    return equipment_type_classifier(equip_name)
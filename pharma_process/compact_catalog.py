@@ -0,0 +1,436 @@
+"""
+紧凑工艺目录 - 以驻留取值表与整数编码的列式数组保存工艺目录，按需还原为嵌套字典。
+
+    python -m pharma_process.compact_catalog                    # 当前工艺目录的内存占用对比
+    python -m pharma_process.compact_catalog --steps 100000     # 10⁵ 个步骤的合成目录
+
+JSON 解析得到的嵌套字典里，同一参数、设备名称每出现一次就是一个独立的字符串对象，
+每个步骤还各带一个字典和两三个列表。紧凑目录把全部取值驻留到目录自己的取值表，
+步骤名称、关键参数、设备以 int32 编号存放在 CSR 形式的数组中；步骤与产品的键及其顺序
+记为"布局"，不同布局只有少数几种，同样只保存一份。
+
+增量更新得到的目录与上一版本共用取值表，只追加新取值；表中不再被引用的取值超过一半时
+重建取值表并重映射编号，反复更新或切换版本时驻留表的大小不会无限增长。
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+# 步骤布局中各键的存放位置：名称列、参数 CSR、设备 CSR、其余取值
+_NAME, _PARAMETERS, _EQUIPMENT, _ATTRIBUTE = range(4)
+STEP_COLUMNS = {"name": _NAME, "关键参数": _PARAMETERS, "设备": _EQUIPMENT}
+# 产品布局中 工艺步骤 以外的键都按取值存放
+_STEPS = 4
+STEPS_KEY = "工艺步骤"
+
+# 增量更新后取值表中未被引用的取值超过该比例时重建取值表
+POOL_GARBAGE_RATIO = 0.5
+
+# 每层的行数组，以及 (indptr, 子数组) 形式的 CSR 关系；step_indptr 的子层是步骤本身
+_ROW_ARRAYS = ("product_category", "product_name", "product_layout", "step_layout", "step_name")
+_CSR_ARRAYS = (("product_field_indptr", "product_fields"), ("step_indptr", None),
+               ("parameter_indptr", "parameters"), ("equipment_indptr", "equipment"),
+               ("attribute_indptr", "attributes"))
+
+
+class InternPool:
+    """
+    驻留表：相同的取值只保存一份，以从 0 起的整数编号引用，只追加不复用。
+
+    字符串、数值、布尔与 None 按 (类型, 取值) 驻留，1、1.0 与 True 各占一个编号；
+    列表与字典以 JSON 文本驻留，还原时重新解析，调用方拿到的总是新对象。
+    """
+
+    def __init__(self):
+        self.values = []
+        self._strings = {}
+        self._others = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.values)
+
+    def _append(self, table, key, value):
+        with self._lock:
+            result = table.get(key)
+            if result is None:
+                result = table[key] = len(self.values)
+                self.values.append(value)
+        return result
+
+    def intern(self, value):
+        if value.__class__ is str:
+            result = self._strings.get(value)
+            return self._append(self._strings, value, value) if result is None else result
+        if isinstance(value, (list, dict)):
+            value = ("json", json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+        key = (value.__class__, value)
+        result = self._others.get(key)
+        return self._append(self._others, key, value) if result is None else result
+
+    def intern_names(self, names):
+        """字符串列表 → 编号列表，已驻留的名称只做一次字典查找；含非字符串元素时返回 None"""
+        try:
+            ids = list(map(self._strings.get, names))
+        except TypeError:
+            return None
+        if None in ids:
+            if not all(name.__class__ is str for name in names):
+                return None
+            ids = list(map(self.intern, names))
+        return ids
+
+    def compacted(self, ids):
+        """只保留 ids（升序、去重）所指取值的新驻留表，以及 旧编号 → 新编号 的映射（未保留的为 -1）"""
+        pool = InternPool()
+        pool.values = [self.values[i] for i in ids.tolist()]
+        for i, value in enumerate(pool.values):
+            if value.__class__ is str:
+                pool._strings[value] = i
+            else:
+                pool._others[(value.__class__, value)] = i
+        mapping = np.full(len(self.values), -1, dtype=np.int32)
+        mapping[ids] = np.arange(len(ids), dtype=np.int32)
+        return pool, mapping
+
+    def nbytes(self, ids=None):
+        """ids 所指取值（默认全部）的对象大小之和"""
+        values = self.values if ids is None else map(self.values.__getitem__, ids)
+        return sum(sys.getsizeof(value) + (sys.getsizeof(value[1]) if value.__class__ is tuple else 0)
+                   for value in values)
+
+
+def _thaw(value):
+    return json.loads(value[1]) if value.__class__ is tuple else value
+
+
+def _ranges(indptr, rows):
+    """rows 各行在 CSR 子数组中的区间 → (子数组下标, 新 indptr)，不逐行拼接 arange"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    new_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_indptr[1:])
+    index = np.arange(new_indptr[-1], dtype=np.int64) - np.repeat(new_indptr[:-1] - starts, lengths)
+    return index, new_indptr
+
+
+class CompactCatalog(Mapping):
+    """
+    列式存放的工艺目录，以 (分类, 产品) 为键的只读映射，取值时还原为与原目录相同的产品字典。
+
+    - 产品：分类、产品名称、布局编号，其余字段（description、关键特征 等）为取值编号的 CSR
+    - 步骤：布局编号与名称编号；关键参数、设备、其余字段各为一组 CSR（indptr 为 int64，编号为 int32）
+
+    还原的字典键顺序与原目录一致，product_hash 与按键查找时间字段的逻辑都不受影响。
+    取值与布局分别驻留在 values、layouts 两个驻留表中，未给出时新建。
+    """
+
+    def __init__(self, processes, values=None, layouts=None):
+        self.categories = tuple(processes)
+        self.values = InternPool() if values is None else values
+        self.layouts = InternPool() if layouts is None else layouts
+        columns = {name: [] for name in _ROW_ARRAYS}
+        children = {name: [] for _, name in _CSR_ARRAYS if name is not None}
+        lengths = {indptr: [] for indptr, _ in _CSR_ARRAYS}
+        intern, intern_names, layout_id = self.values.intern, self.values.intern_names, self.layouts.intern
+        step_layouts, step_names = columns["step_layout"], columns["step_name"]
+        parameters, equipment, attributes = children["parameters"], children["equipment"], children["attributes"]
+        parameter_counts, equipment_counts, attribute_counts = (
+            lengths["parameter_indptr"], lengths["equipment_indptr"], lengths["attribute_indptr"]
+        )
+
+        for category, products in processes.items():
+            category_id = intern(category)
+            for product, info in products.items():
+                layout = []
+                fields = []
+                steps = info.get(STEPS_KEY) if isinstance(info.get(STEPS_KEY), list) else None
+                for key, value in info.items():
+                    if key == STEPS_KEY and steps is not None:
+                        layout.append((key, _STEPS))
+                    else:
+                        layout.append((key, _ATTRIBUTE))
+                        fields.append(intern(value))
+                columns["product_category"].append(category_id)
+                columns["product_name"].append(intern(product))
+                columns["product_layout"].append(layout_id(tuple(layout)))
+                children["product_fields"].extend(fields)
+                lengths["product_field_indptr"].append(len(fields))
+                lengths["step_indptr"].append(len(steps) if steps is not None else 0)
+
+                for step in steps or ():
+                    layout = []
+                    name = -1
+                    counts = [0, 0, 0, 0]
+                    for key, value in step.items():
+                        slot = STEP_COLUMNS.get(key, _ATTRIBUTE)
+                        ids = intern_names(value) if slot != _ATTRIBUTE and value.__class__ is list else None
+                        if slot == _NAME and value.__class__ is str:
+                            name = intern(value)
+                        elif ids is not None and slot != _NAME:
+                            (parameters if slot == _PARAMETERS else equipment).extend(ids)
+                            counts[slot] = len(ids)
+                        else:
+                            slot = _ATTRIBUTE
+                            attributes.append(intern(value))
+                            counts[_ATTRIBUTE] += 1
+                        layout.append((key, slot))
+                    step_layouts.append(layout_id(tuple(layout)))
+                    step_names.append(name)
+                    parameter_counts.append(counts[_PARAMETERS])
+                    equipment_counts.append(counts[_EQUIPMENT])
+                    attribute_counts.append(counts[_ATTRIBUTE])
+
+        for name, values in columns.items():
+            setattr(self, name, np.array(values, dtype=np.int32))
+        for name, values in children.items():
+            setattr(self, name, np.array(values, dtype=np.int32))
+        for name, values in lengths.items():
+            indptr = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(values, out=indptr[1:])
+            setattr(self, name, indptr)
+        self._index_keys()
+
+    def _index_keys(self):
+        values = self.values.values
+        self.product_keys = [(values[category], values[product])
+                             for category, product in zip(self.product_category.tolist(), self.product_name.tolist())]
+        self.positions = {key: i for i, key in enumerate(self.product_keys)}
+
+    def __len__(self):
+        return len(self.product_keys)
+
+    def __iter__(self):
+        return iter(self.product_keys)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __getitem__(self, key):
+        return self._product(self.positions[key])
+
+    @property
+    def num_steps(self):
+        return len(self.step_layout)
+
+    def _product(self, position):
+        values, layouts = self.values.values, self.layouts.values
+        start, stop = self.product_field_indptr[position:position + 2]
+        fields = iter(self.product_fields[start:stop].tolist())
+        info = {}
+        for key, slot in layouts[self.product_layout[position]]:
+            if slot == _STEPS:
+                info[key] = self._steps(*self.step_indptr[position:position + 2].tolist())
+            else:
+                info[key] = _thaw(values[next(fields)])
+        return info
+
+    def _steps(self, start, stop):
+        """步骤行 [start, stop) 还原为步骤字典列表，每个数组只按区间取一次"""
+        values, layouts = self.values.values, self.layouts.values
+        step_layouts = self.step_layout[start:stop].tolist()
+        names = self.step_name[start:stop].tolist()
+        lists = {}
+        for slot, indptr, ids in ((_PARAMETERS, self.parameter_indptr, self.parameters),
+                                  (_EQUIPMENT, self.equipment_indptr, self.equipment),
+                                  (_ATTRIBUTE, self.attribute_indptr, self.attributes)):
+            bounds = indptr[start:stop + 1]
+            lists[slot] = ((bounds - bounds[0]).tolist(), ids[bounds[0]:bounds[-1]].tolist())
+
+        steps = []
+        for i in range(stop - start):
+            step = {}
+            attribute = lists[_ATTRIBUTE][0][i]
+            for key, slot in layouts[step_layouts[i]]:
+                if slot == _NAME:
+                    step[key] = values[names[i]]
+                elif slot == _ATTRIBUTE:
+                    step[key] = _thaw(values[lists[_ATTRIBUTE][1][attribute]])
+                    attribute += 1
+                else:
+                    bounds, ids = lists[slot]
+                    step[key] = [values[value] for value in ids[bounds[i]:bounds[i + 1]]]
+            steps.append(step)
+        return steps
+
+    def products_by_category(self):
+        """{分类: (产品, ...)}，含没有产品的分类"""
+        grouped = {category: [] for category in self.categories}
+        for category, product in self.product_keys:
+            grouped[category].append(product)
+        return {category: tuple(products) for category, products in grouped.items()}
+
+    def to_dict(self):
+        """还原完整的 {分类: {产品: 产品信息}} 嵌套字典"""
+        processes = {category: {} for category in self.categories}
+        for position, (category, product) in enumerate(self.product_keys):
+            processes[category][product] = self._product(position)
+        return processes
+
+    def _take(self, rows, categories):
+        """按 rows 的顺序取产品行得到新目录，各层 CSR 按区间向量化搬运"""
+        catalog = CompactCatalog.__new__(CompactCatalog)
+        catalog.categories = categories
+        catalog.values, catalog.layouts = self.values, self.layouts
+        rows = np.asarray(rows, dtype=np.int64)
+        step_rows = None
+        for indptr_name, child in _CSR_ARRAYS:
+            if indptr_name in ("product_field_indptr", "step_indptr"):
+                index, indptr = _ranges(getattr(self, indptr_name), rows)
+            else:
+                index, indptr = _ranges(getattr(self, indptr_name), step_rows)
+            setattr(catalog, indptr_name, indptr)
+            if child is None:
+                step_rows = index
+            else:
+                setattr(catalog, child, getattr(self, child)[index])
+        for name in _ROW_ARRAYS:
+            setattr(catalog, name, getattr(self, name)[step_rows if name.startswith("step_") else rows])
+        catalog._index_keys()
+        return catalog
+
+    def _concat(self, other):
+        """拼接两个共用驻留表的目录的数组"""
+        catalog = CompactCatalog.__new__(CompactCatalog)
+        catalog.values, catalog.layouts = self.values, self.layouts
+        for name in _ROW_ARRAYS:
+            setattr(catalog, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+        for indptr_name, child in _CSR_ARRAYS:
+            left, right = getattr(self, indptr_name), getattr(other, indptr_name)
+            setattr(catalog, indptr_name, np.concatenate([left, right[1:] + left[-1]]))
+            if child is not None:
+                setattr(catalog, child, np.concatenate([getattr(self, child), getattr(other, child)]))
+        return catalog
+
+    def updated(self, processes, changed):
+        """
+        新目录 processes 的紧凑形式，只编码 changed（新增或修改）的产品。
+
+        未变化产品的数组区间原样搬运，产品顺序与 processes 一致。新目录与本目录共用驻留表，
+        新取值追加在表尾；表中多数取值已不再被新目录引用时改用重建的驻留表。
+        """
+        delta_processes = {}
+        for category, product in changed:
+            delta_processes.setdefault(category, {})[product] = processes[category][product]
+        delta = CompactCatalog(delta_processes, self.values, self.layouts)
+        combined = self._concat(delta)
+        offset = len(self.product_keys)
+        rows = [
+            offset + delta.positions[key] if key in delta.positions else self.positions[key]
+            for key in ((category, product) for category, products in processes.items() for product in products)
+        ]
+        catalog = combined._take(rows, tuple(processes))
+        catalog._compact()
+        return catalog
+
+    def _compact(self, ratio=POOL_GARBAGE_RATIO):
+        """未被引用的取值或布局超过 ratio 时，换用只含本目录所引用内容的驻留表并重映射编号"""
+        used = self.value_ids()
+        if len(self.values) - len(used) > ratio * len(self.values):
+            self.values, mapping = self.values.compacted(used)
+            for name in ("product_category", "product_name", "product_fields", "parameters", "equipment", "attributes"):
+                setattr(self, name, mapping[getattr(self, name)])
+            self.step_name = np.where(self.step_name >= 0, mapping[self.step_name], -1).astype(np.int32)
+        used = self.layout_ids()
+        if len(self.layouts) - len(used) > ratio * len(self.layouts):
+            self.layouts, mapping = self.layouts.compacted(used)
+            self.product_layout = mapping[self.product_layout]
+            self.step_layout = mapping[self.step_layout]
+
+    def nbytes(self):
+        """数组与产品键索引占用的字节数（不含驻留表）"""
+        arrays = [*_ROW_ARRAYS, *(name for pair in _CSR_ARRAYS for name in pair if name is not None)]
+        return (sum(getattr(self, name).nbytes for name in arrays)
+                + sys.getsizeof(self.product_keys) + sys.getsizeof(self.positions) + sum(map(sys.getsizeof, self.product_keys)))
+
+    def value_ids(self):
+        """本目录引用的取值编号（去重）"""
+        return np.unique(np.concatenate([
+            self.product_category, self.product_name, self.product_fields, self.step_name[self.step_name >= 0],
+            self.parameters, self.equipment, self.attributes,
+        ]))
+
+    def layout_ids(self):
+        """本目录引用的布局编号（去重）"""
+        return np.unique(np.concatenate([self.product_layout, self.step_layout]))
+
+
+def nested_nbytes(value):
+    """嵌套字典/列表及其中全部对象的大小之和，同一对象只计一次"""
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return total
+
+
+def memory_footprint(processes, catalog):
+    """
+    同一目录两种存放方式的内存占用（字节）：嵌套字典，以及紧凑目录的数组、所引用的取值与布局。
+
+    processes 应为刚解析得到的目录；由 to_dict() 还原的字典共用驻留的字符串，会低估嵌套布局。
+    """
+    footprint = {
+        "嵌套字典": nested_nbytes(processes),
+        "紧凑数组": catalog.nbytes(),
+        "驻留取值": catalog.values.nbytes(catalog.value_ids().tolist()),
+        "布局表": sum(nested_nbytes(catalog.layouts.values[layout]) for layout in catalog.layout_ids().tolist()),
+    }
+    footprint["紧凑合计"] = footprint["紧凑数组"] + footprint["驻留取值"] + footprint["布局表"]
+    return footprint
+
+
+def main(argv=None):
+    from .process_store import catalog_path, load_catalog
+
+    parser = argparse.ArgumentParser(description="比较工艺目录嵌套字典与紧凑列式存放的内存占用")
+    parser.add_argument("--catalog", type=Path, help="工艺目录文件（默认取环境变量或内置目录）")
+    parser.add_argument("--steps", type=int, help="改用该步骤数的合成目录")
+    parser.add_argument("--seed", type=int, default=0, help="合成目录的随机种子")
+    args = parser.parse_args(argv)
+
+    if args.steps:
+        from .benchmark import synthetic_catalog
+
+        processes = synthetic_catalog(args.steps, args.seed, args.catalog or catalog_path())
+    else:
+        processes = load_catalog(args.catalog or catalog_path())
+
+    started = time.perf_counter()
+    catalog = CompactCatalog(processes)
+    encoded = time.perf_counter() - started
+    started = time.perf_counter()
+    restored = catalog.to_dict()
+    decoded = time.perf_counter() - started
+    if restored != processes:
+        print("还原结果与原目录不一致", file=sys.stderr)
+        return 1
+
+    footprint = memory_footprint(processes, catalog)
+    steps = max(catalog.num_steps, 1)
+    print(f"{len(catalog)} 个产品，{catalog.num_steps} 个步骤；编码 {encoded:.2f} s，完整还原 {decoded:.2f} s")
+    for name, size in footprint.items():
+        print(f"  {name:<6}{size / 2 ** 20:>10.2f} MiB{size / steps:>10.0f} B/步骤")
+    print(f"紧凑存放为嵌套字典的 {footprint['紧凑合计'] / footprint['嵌套字典']:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
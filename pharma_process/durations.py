@@ -0,0 +1,74 @@
+"""工艺时间归一化 - 将 时间(h)/时间(天)/时间(周)/时间(年) 等字段统一换算为小时"""
+
+import re
+
+import pandas as pd
+
+# 各时间单位对应的小时数
+UNIT_HOURS = {
+    "h": 1.0,
+    "小时": 1.0,
+    "天": 24.0,
+    "d": 24.0,
+    "周": 168.0,
+    "月": 720.0,
+    "年": 8760.0,
+}
+
+UNIT_LABELS = {"h": "小时", "d": "天"}
+
+# 步骤字典中的时间字段，如 "时间(h)"、"时间(天)"、"time(h)"
+DURATION_KEY_PATTERN = re.compile(r"^(?:时间|time)\s*[(（]\s*(\S+?)\s*[)）]$", re.IGNORECASE)
+
+# 时间取值：单值或范围，可带单位覆盖字段单位，如 "2-3"、"12~24h"、"3天"
+_UNITS = "|".join(sorted(map(re.escape, UNIT_HOURS), key=len, reverse=True))
+DURATION_VALUE_PATTERN = (
+    r"^\s*(?P<low>\d+(?:\.\d+)?)\s*"
+    r"(?:[-~～—至到]\s*(?P<high>\d+(?:\.\d+)?)\s*)?"
+    rf"(?P<unit>{_UNITS})?\s*$"
+)
+
+
+def find_duration(step):
+    """返回步骤中的 (原始取值, 单位)，没有时间字段时返回 (None, None)"""
+    for key, value in step.items():
+        match = DURATION_KEY_PATTERN.match(key)
+        if match:
+            return value, match.group(1).lower()
+    return None, None
+
+
+def normalize_durations(values, units):
+    """
+    向量化地将时间取值换算为小时。
+
+    values 与 units 等长；范围取值得到上下限，"时长(h)" 取范围中点。
+    无法解析的取值对应 NaN。
+    """
+    raw = pd.Series(values, dtype="object").astype("string")
+    parts = raw.str.extract(DURATION_VALUE_PATTERN)
+
+    unit = parts["unit"].fillna(pd.Series(units, dtype="string").str.lower())
+    factor = unit.map(UNIT_HOURS).astype("float64")
+
+    low = pd.to_numeric(parts["low"], errors="coerce").astype("float64")
+    high = pd.to_numeric(parts["high"], errors="coerce").astype("float64").fillna(low)
+
+    result = pd.DataFrame({
+        "时长下限(h)": (low * factor).to_numpy(),
+        "时长上限(h)": (high * factor).to_numpy(),
+    })
+    result["时长(h)"] = (result["时长下限(h)"] + result["时长上限(h)"]) / 2
+
+    # 取值自带单位时原样显示，否则补上字段单位
+    label = unit.map(lambda u: UNIT_LABELS.get(u, u), na_action="ignore").fillna("")
+    display = raw.where(parts["unit"].notna(), raw + " " + label).str.strip()
+    result["工艺时间"] = display.to_numpy(dtype=object, na_value=None)
+    return result
+
+
+def format_hours(hours):
+    """将小时数格式化为便于阅读的文本，超过 72 小时同时给出天数"""
+    if hours >= 72:
+        return f"{hours:.1f} 小时（约 {hours / 24:.1f} 天）"
+    return f"{hours:.1f} 小时"
@@ -0,0 +1,198 @@
+"""产品-设备关联索引 - 产品 × 设备、步骤 × 设备的稀疏关联矩阵及共用设备查询"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+OVERLAP_LABELS = ("共用", "仅A", "仅B")
+
+
+def _slice_rows(slices, keys):
+    """
+    各产品在事实表中的行区间 → (行号, 所属产品下标)，按产品顺序排列。
+
+    不逐产品拼接 arange：行号 = 全局序号 - 所在区间相对起点的偏移。
+    """
+    starts = np.fromiter((slices[key].start if key in slices else 0 for key in keys), dtype=np.int64, count=len(keys))
+    stops = np.fromiter((slices[key].stop if key in slices else 0 for key in keys), dtype=np.int64, count=len(keys))
+    lengths = stops - starts
+    offsets = np.cumsum(lengths) - lengths
+    rows = np.arange(int(lengths.sum()), dtype=np.int64) - np.repeat(offsets - starts, lengths)
+    return rows, np.repeat(np.arange(len(keys)), lengths)
+
+
+class EquipmentIncidence:
+    """
+    设备使用关联矩阵，加载目录时由事实表构建一次。
+
+    - product_equipment: 产品 × 设备，取值为该产品中使用该设备的步骤次数（CSR，按产品取行）
+    - equipment_products: 同一矩阵的 CSC 形式，按设备取列
+    - step_equipment: 步骤 × 设备（行对应步骤事实表行号），同样保存 CSR 与 CSC 两份
+
+    设备列号为事实表 标准设备名称 的分类编码，近似重复的设备名称已合并为同一列；
+    单个设备或单个产品的查询只读取对应的一列或一行，耗时与该行/列的非零元数成正比。
+    """
+
+    def __init__(self, facts):
+        products = facts.products
+        self.keys = list(zip(products["分类"].astype(str), products["产品"].astype(str)))
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.category_names = pd.Index(list(dict.fromkeys(products["分类"].astype(str))), dtype=object)
+        self.product_categories = self.category_names.get_indexer(products["分类"].astype(str))
+
+        equipment = facts.equipment
+        self._canonicalizer = facts.equipment_canonicalizer
+        names = equipment["标准设备名称"].array
+        self.equipment_names = pd.Index(names.categories.astype(str), dtype=object)
+        codes = np.asarray(names.codes, dtype=np.int64)
+        self.equipment_types = np.full(len(self.equipment_names), "", dtype=object)
+        types = equipment["设备类型"].array
+        self.equipment_types[codes] = np.asarray(types.categories.astype(str), dtype=object)[types.codes]
+
+        shape = (len(self.keys), len(self.equipment_names))
+        rows, owners = _slice_rows(facts.equipment_slices, self.keys)
+        self.product_equipment = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (owners, codes[rows])), shape=shape
+        )
+        self.product_equipment.sum_duplicates()
+        self.equipment_products = self.product_equipment.tocsc()
+
+        self.step_slices = facts.step_slices
+        step_names = facts.steps["步骤名称"].array
+        self._step_name_codes = step_names.codes
+        self._step_name_categories = np.asarray(step_names.categories.astype(str), dtype=object)
+        step_rows = equipment["步骤行号"].to_numpy(dtype=np.int64)
+        self.step_equipment = sparse.csr_matrix(
+            (np.ones(len(step_rows), dtype=np.int64), (step_rows, codes)), shape=(len(facts.steps), shape[1])
+        )
+        self.step_equipment.sum_duplicates()
+        self.equipment_steps = self.step_equipment.tocsc()
+        step_positions, step_owners = _slice_rows(facts.step_slices, self.keys)
+        self.step_products = np.full(len(facts.steps), -1, dtype=np.int64)
+        self.step_products[step_positions] = step_owners
+
+    def _step_names(self, rows):
+        """步骤事实表中若干行的步骤名称，只读取这些行的分类编码"""
+        return self._step_name_categories[self._step_name_codes[rows]]
+
+    def equipment_id(self, name):
+        """设备名称（规范名称或其任一写法）→ 列号，设备不存在时抛出 KeyError"""
+        column = self.equipment_names.get_indexer([name])[0]
+        if column < 0:
+            column = self.equipment_names.get_indexer([self._canonicalizer.canonical(name)])[0]
+        if column < 0:
+            raise KeyError(f"设备不存在: {name}")
+        return column
+
+    def category_equipment(self):
+        """分类 × 设备 的 0/1 矩阵（CSR）：该分类中至少有一个产品使用该设备"""
+        indicator = sparse.csr_matrix(
+            (np.ones(len(self.keys), dtype=np.int64), (self.product_categories, np.arange(len(self.keys)))),
+            shape=(len(self.category_names), len(self.keys))
+        )
+        matrix = indicator @ (self.product_equipment > 0).astype(np.int64)
+        matrix.data[:] = 1
+        return matrix
+
+    def equipment_usage(self):
+        """每种设备一行：设备类型、使用产品数、使用分类数与使用次数，按产品数降序"""
+        category_counts = np.diff(self.category_equipment().tocsc().indptr)
+        usage = pd.DataFrame({
+            "设备名称": self.equipment_names,
+            "设备类型": self.equipment_types,
+            "产品数": np.diff(self.equipment_products.indptr),
+            "分类数": category_counts,
+            "使用次数": np.asarray(self.equipment_products.sum(axis=0)).ravel(),
+        })
+        return usage.sort_values(["产品数", "使用次数"], ascending=False, kind="stable").reset_index(drop=True)
+
+    def products_using(self, name):
+        """使用某设备的产品：分类、产品、使用次数与使用步骤，保持目录顺序"""
+        column = self.equipment_id(name)
+        start, end = self.equipment_steps.indptr[column:column + 2]
+        step_rows = self.equipment_steps.indices[start:end]
+        repeats = self.equipment_steps.data[start:end]
+        owners = self.step_products[step_rows]
+        order = np.lexsort((step_rows, owners))
+        owners = owners[order]
+        step_names = np.repeat(self._step_names(step_rows[order]), repeats[order])
+        owners = np.repeat(owners, repeats[order])
+
+        products, first = np.unique(owners, return_index=True)
+        groups = np.split(step_names, first[1:])
+        return pd.DataFrame({
+            "分类": [self.keys[product][0] for product in products],
+            "产品": [self.keys[product][1] for product in products],
+            "使用次数": np.diff(np.append(first, len(owners))),
+            "使用步骤": [", ".join(group) for group in groups],
+        }, columns=["分类", "产品", "使用次数", "使用步骤"])
+
+    def _product_row(self, key):
+        if key not in self.positions:
+            raise KeyError(f"产品不存在: {key[0]} / {key[1]}")
+        row = self.positions[key]
+        start, end = self.product_equipment.indptr[row:row + 2]
+        return self.product_equipment.indices[start:end], self.product_equipment.data[start:end]
+
+    def product_breakdown(self, key):
+        """
+        单个产品的设备清单：设备名称、设备类型、使用频率与使用步骤（按设备名称排序）。
+
+        只读取该产品步骤区间内的 步骤 × 设备 子矩阵。
+        """
+        if key not in self.positions:
+            raise KeyError(f"产品不存在: {key[0]} / {key[1]}")
+        rows = self.step_slices.get(key, slice(0, 0))
+        columns = self.step_equipment[rows].tocsc()
+        columns.sort_indices()
+        used = np.flatnonzero(np.diff(columns.indptr))
+        step_names = self._step_names(np.arange(rows.start, rows.stop))
+        usage = []
+        for column in used:
+            start, end = columns.indptr[column:column + 2]
+            usage.append(", ".join(np.repeat(step_names[columns.indices[start:end]], columns.data[start:end])))
+        return pd.DataFrame({
+            "设备名称": self.equipment_names[used],
+            "设备类型": self.equipment_types[used],
+            "使用频率": np.add.reduceat(columns.data, columns.indptr[used]) if len(used) else np.zeros(0, dtype=np.int64),
+            "使用步骤": usage,
+        }, columns=["设备名称", "设备类型", "使用频率", "使用步骤"])
+
+    def overlap(self, key_a, key_b):
+        """
+        两个产品的设备重叠：每种设备一行，归属为 共用 / 仅A / 仅B，附两个产品中的使用次数。
+
+        两行的列号均已排序，合并后用 searchsorted 定位，不展开稠密向量。
+        """
+        columns_a, counts_a = self._product_row(key_a)
+        columns_b, counts_b = self._product_row(key_b)
+        columns = np.union1d(columns_a, columns_b)
+        uses_a = np.zeros(len(columns), dtype=np.int64)
+        uses_b = np.zeros(len(columns), dtype=np.int64)
+        uses_a[np.searchsorted(columns, columns_a)] = counts_a
+        uses_b[np.searchsorted(columns, columns_b)] = counts_b
+        membership = np.where((uses_a > 0) & (uses_b > 0), 0, np.where(uses_a > 0, 1, 2))
+        # 共用在前，同一归属内按设备名称（即列号）排序
+        order = np.lexsort((columns, membership))
+        return pd.DataFrame({
+            "设备名称": self.equipment_names[columns[order]],
+            "设备类型": self.equipment_types[columns[order]],
+            "归属": np.asarray(OVERLAP_LABELS, dtype=object)[membership[order]],
+            "A使用次数": uses_a[order],
+            "B使用次数": uses_b[order],
+        })
+
+    def category_co_usage(self):
+        """
+        分类之间的设备共用：(共用设备种类数, Jaccard 系数)，均为 分类 × 分类 的 DataFrame。
+
+        由 分类 × 设备 0/1 矩阵与自身转置相乘得到。
+        """
+        matrix = self.category_equipment()
+        shared = (matrix @ matrix.T).toarray()
+        sizes = np.diag(shared)
+        union = sizes[:, None] + sizes[None, :] - shared
+        jaccard = np.divide(shared, union, out=np.zeros(shared.shape), where=union > 0)
+        labels = list(self.category_names)
+        return (pd.DataFrame(shared, index=labels, columns=labels),
+                pd.DataFrame(jaccard, index=labels, columns=labels))
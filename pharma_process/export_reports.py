@@ -0,0 +1,284 @@
+"""
+批量导出产品工艺报告 - 为全部或筛选后的产品并行生成 HTML / XLSX 报告与静态流程图。
+
+    python -m pharma_process.export_reports --output reports
+    python -m pharma_process.export_reports --output reports --format html --format xlsx --category 化学药物-固体制剂
+    python -m pharma_process.export_reports --output reports --format png --query 冻干 --workers 8
+
+报告内容：工艺步骤表、关键参数分析、设备清单、排程与工艺流程图。
+每个产品的报告相互独立，由进程池并行生成；父进程先加载工艺目录，
+fork 出的工作进程直接共享已构建的事实表，不重复解析目录。
+
+XLSX 需要 openpyxl，静态图片（png/svg/pdf）需要 kaleido，均为可选依赖。
+"""
+
+import argparse
+import html
+import importlib.util
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from . import analytics
+from .charts import build_equipment_type_figure, build_parameter_type_figure, build_product_flowchart
+from .process_store import CATALOG_ENV_VAR, catalog_path, get_store
+
+REPORT_FORMATS = ("html", "xlsx", "png", "svg", "pdf")
+IMAGE_FORMATS = ("png", "svg", "pdf")
+
+# 可选依赖：格式 → 所需模块（任一可用即可）
+FORMAT_DEPENDENCIES = {
+    "xlsx": ("openpyxl",),
+    "png": ("kaleido",),
+    "svg": ("kaleido",),
+    "pdf": ("kaleido",),
+}
+
+PLOTLY_JS_NAME = "plotly.min.js"
+
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\s]+')
+
+REPORT_STYLE = """
+body { background: #0e1117; color: #e0e0e0; font-family: "Microsoft YaHei", "PingFang SC", Arial, sans-serif; margin: 32px; }
+h1 { color: #ffffff; } h2 { color: #ffffff; border-bottom: 2px solid #667eea; padding-bottom: 6px; margin-top: 36px; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9em; }
+th, td { border: 1px solid #2d3746; padding: 6px 10px; text-align: left; }
+th { background: #1e2130; color: #ffffff; }
+.stats { display: flex; gap: 24px; flex-wrap: wrap; }
+.stat { background: #1e2130; border-radius: 8px; padding: 12px 20px; }
+.stat b { display: block; font-size: 1.4em; color: #ffffff; }
+a { color: #8fa2ff; }
+"""
+
+
+def missing_dependencies(formats):
+    """所选格式缺少的可选依赖"""
+    missing = set()
+    for fmt in formats:
+        modules = FORMAT_DEPENDENCIES.get(fmt, ())
+        if modules and not any(importlib.util.find_spec(module) for module in modules):
+            missing.update(modules)
+    return sorted(missing)
+
+
+def select_products(categories=None, products=None, query=None):
+    """按分类、产品名称与全文检索关键词筛选产品，返回 (分类, 产品) 列表"""
+    store = get_store()
+    keys = [(category, product) for category in store.get_main_categories() for product in store.get_products(category)]
+    if categories:
+        keys = [key for key in keys if key[0] in categories]
+    if products:
+        keys = [key for key in keys if key[1] in products]
+    if query:
+        matched = store.search_index.matched_products(store.search_index.search(query))
+        matched_keys = set(zip(matched["分类"].astype(str), matched["产品"].astype(str)))
+        keys = [key for key in keys if key in matched_keys]
+    return keys
+
+
+def safe_filename(text):
+    return _UNSAFE_FILENAME.sub("_", text).strip("_") or "_"
+
+
+def report_path(output_dir, key, suffix):
+    return Path(output_dir) / safe_filename(key[0]) / f"{safe_filename(key[1])}.{suffix}"
+
+
+def report_tables(main_category, product):
+    """报告中的表格：工艺步骤、关键参数、设备清单、排程"""
+    steps = analytics.step_durations(main_category, product).copy()
+    step_list = get_store().get_product_info(main_category, product).get("工艺步骤", [])
+    steps.insert(2, "关键参数", ["、".join(step.get("关键参数", [])) for step in step_list])
+    steps.insert(3, "设备", ["、".join(step.get("设备", [])) for step in step_list])
+    return {
+        "工艺步骤": steps[["步骤序号", "步骤名称", "关键参数", "设备", "工艺时间", "时长(h)", "工艺温度"]],
+        "关键参数": analytics.parameter_breakdown(main_category, product),
+        "设备清单": analytics.equipment_breakdown(main_category, product),
+        "排程": analytics.process_schedule(main_category, product)["排程"],
+    }
+
+
+def report_figures(main_category, product):
+    """报告中的图表：工艺流程图、参数类型分布、设备类型分布"""
+    figures = {"工艺流程图": build_product_flowchart(main_category, product)}
+    param_counts = analytics.parameter_type_counts(main_category, product)
+    if len(param_counts):
+        figures["关键参数类型分布"] = build_parameter_type_figure(param_counts)
+    equip_type_counts = analytics.equipment_type_counts(main_category, product)
+    if len(equip_type_counts):
+        figures["设备类型分布"] = build_equipment_type_figure(equip_type_counts)
+    return figures
+
+
+def render_html(main_category, product, tables, figures, plotly_js_src):
+    """单个产品的 HTML 报告，plotly.js 通过相对路径引用共享的脚本文件"""
+    info = get_store().get_product_info(main_category, product)
+    stats = analytics.product_statistics(main_category, product)
+    stat_items = [
+        ("工艺步骤数", stats["步骤数"]),
+        ("关键参数总数", stats["关键参数总数"]),
+        ("设备种类数", stats["设备种类数"]),
+        ("总工艺时间(h)", f"{stats['总工艺时间(h)']:g}"),
+        ("关键路径工期(h)", f"{stats['关键路径工期(h)']:g}"),
+    ]
+
+    parts = [
+        "<!DOCTYPE html>",
+        '<html lang="zh-CN"><head><meta charset="utf-8">',
+        f"<title>{html.escape(product)} 工艺报告</title>",
+        f'<script src="{plotly_js_src}"></script>',
+        f"<style>{REPORT_STYLE}</style></head><body>",
+        f"<h1>🔬 {html.escape(product)} 生产工艺报告</h1>",
+        f"<p>所属分类: {html.escape(main_category)}</p>",
+        f"<p>{html.escape(info.get('description', ''))}</p>",
+        '<div class="stats">',
+        *[f'<div class="stat">{name}<b>{value}</b></div>' for name, value in stat_items],
+        "</div>",
+    ]
+    if info.get("关键特征"):
+        parts.append("<ul>" + "".join(f"<li>{html.escape(f)}</li>" for f in info["关键特征"]) + "</ul>")
+
+    sections = [
+        ("工艺步骤", ["工艺步骤"], ["工艺流程图"]),
+        ("关键参数分析", ["关键参数"], ["关键参数类型分布"]),
+        ("设备需求", ["设备清单"], ["设备类型分布"]),
+        ("工艺排程", ["排程"], []),
+    ]
+    for title, table_names, figure_names in sections:
+        parts.append(f"<h2>{title}</h2>")
+        for name in figure_names:
+            if name in figures:
+                parts.append(figures[name].to_html(full_html=False, include_plotlyjs=False))
+        for name in table_names:
+            parts.append(tables[name].to_html(index=False, na_rep="", float_format=lambda v: f"{v:g}"))
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def write_xlsx(path, tables):
+    import pandas as pd
+
+    with pd.ExcelWriter(path) as writer:
+        for name, table in tables.items():
+            table.to_excel(writer, sheet_name=name, index=False)
+
+
+def export_product(key, output_dir, formats):
+    """导出单个产品的报告文件，返回写出的文件路径"""
+    main_category, product = key
+    tables = report_tables(main_category, product)
+    figures = report_figures(main_category, product)
+    written = []
+
+    target = report_path(output_dir, key, "html")
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    if "html" in formats:
+        target.write_text(render_html(main_category, product, tables, figures, f"../{PLOTLY_JS_NAME}"), encoding="utf-8")
+        written.append(target)
+    if "xlsx" in formats:
+        target = report_path(output_dir, key, "xlsx")
+        write_xlsx(target, tables)
+        written.append(target)
+    for fmt in IMAGE_FORMATS:
+        if fmt in formats:
+            target = report_path(output_dir, key, f"流程图.{fmt}")
+            figures["工艺流程图"].write_image(target, format=fmt, width=1400, height=500)
+            written.append(target)
+    return [str(path) for path in written]
+
+
+def write_index(output_dir, keys, formats):
+    """报告目录页：按分类列出全部产品报告"""
+    rows = []
+    for key in keys:
+        links = " ".join(
+            f'<a href="{html.escape(report_path(".", key, suffix).as_posix())}">{suffix}</a>'
+            for suffix in [fmt for fmt in ("html", "xlsx") if fmt in formats]
+            + [f"流程图.{fmt}" for fmt in IMAGE_FORMATS if fmt in formats]
+        )
+        rows.append(f"<tr><td>{html.escape(key[0])}</td><td>{html.escape(key[1])}</td><td>{links}</td></tr>")
+    page = (
+        '<!DOCTYPE html><html lang="zh-CN"><head><meta charset="utf-8"><title>制药工艺报告目录</title>'
+        f"<style>{REPORT_STYLE}</style></head><body><h1>⚗️ 制药工艺报告目录</h1>"
+        f"<p>目录版本: {get_store().version} | 产品数: {len(keys)}</p>"
+        "<table><tr><th>分类</th><th>产品</th><th>报告</th></tr>" + "".join(rows) + "</table></body></html>"
+    )
+    path = Path(output_dir) / "index.html"
+    path.write_text(page, encoding="utf-8")
+    return path
+
+
+def _init_worker(path):
+    """工作进程初始化：spawn 方式下按同一目录文件加载存储，fork 方式下存储已继承"""
+    os.environ[CATALOG_ENV_VAR] = str(path)
+    get_store()
+
+
+def export_reports(keys, output_dir, formats=("html",), workers=None):
+    """
+    并行导出一组产品的报告，返回写出的文件路径列表。
+
+    workers 为 1 时在当前进程串行执行；否则使用进程池，每个任务一个产品，
+    任务之间没有共享状态，导出耗时随核数近似线性下降。
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # 父进程先构建事实表与索引，fork 的工作进程直接复用
+    get_store()
+
+    if "html" in formats:
+        from plotly.offline import get_plotlyjs
+
+        (output_dir / PLOTLY_JS_NAME).write_text(get_plotlyjs(), encoding="utf-8")
+
+    task = partial(export_product, output_dir=output_dir, formats=tuple(formats))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(keys) <= 1:
+        results = [task(key) for key in keys]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        chunksize = max(1, len(keys) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(catalog_path(),)) as executor:
+            results = list(executor.map(task, keys, chunksize=chunksize))
+
+    written = [path for paths in results for path in paths]
+    if "html" in formats or "xlsx" in formats:
+        written.append(str(write_index(output_dir, keys, formats)))
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批量导出制药工艺产品报告")
+    parser.add_argument("--output", "-o", default="reports", help="输出目录")
+    parser.add_argument("--format", "-f", dest="formats", action="append", choices=REPORT_FORMATS,
+                        help="输出格式，可重复指定（默认 html）")
+    parser.add_argument("--category", "-c", dest="categories", action="append", help="只导出指定分类，可重复指定")
+    parser.add_argument("--product", "-p", dest="products", action="append", help="只导出指定产品，可重复指定")
+    parser.add_argument("--query", "-q", help="只导出全文检索命中的产品")
+    parser.add_argument("--workers", "-j", type=int, default=None, help="并行进程数（默认 CPU 核数）")
+    args = parser.parse_args(argv)
+
+    formats = tuple(dict.fromkeys(args.formats or ["html"]))
+    missing = missing_dependencies(formats)
+    if missing:
+        parser.error(f"所选格式需要安装: {', '.join(missing)}")
+
+    keys = select_products(args.categories, args.products, args.query)
+    if not keys:
+        parser.error("没有符合条件的产品")
+
+    start = time.perf_counter()
+    written = export_reports(keys, args.output, formats, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"已导出 {len(keys)} 个产品的报告（{len(written)} 个文件）到 {args.output}，用时 {elapsed:.1f} 秒")
+
+
+if __name__ == "__main__":
+    main()
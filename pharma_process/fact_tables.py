@@ -0,0 +1,336 @@
+"""工艺事实表 - 将嵌套的工艺目录展开为列式表格，加载时构建一次供所有视图共享"""
+
+import warnings
+from operator import attrgetter
+
+import numpy as np
+import pandas as pd
+
+from .canonical_names import build_canonicalizers
+from .classifiers import equipment_type_classifier, importance_classifier, parameter_type_classifier
+from .durations import find_duration, normalize_durations
+from .instrumentation import span
+from .process_graph import ProcessGraph, has_dependencies
+from .temperatures import TEMPERATURE_KEY, parse_temperatures
+
+
+def _categorical(values):
+    return pd.Categorical(values)
+
+
+def _concat_categorical(left, right):
+    """
+    拼接两个分类数组，类别取并集并去掉不再出现的类别，与整体构建的结果一致。
+
+    直接在编码上计算，避免 pandas 拼接不同类别表时逐值比较；right 的取值通常都已出现在
+    left 中，此时沿用 left 的类别表，只需映射 right 的少量类别。
+    """
+    categories = left.categories
+    mapping = categories.get_indexer(right.categories)
+    if (mapping < 0).any():
+        categories = categories.union(right.categories)
+        left_codes = categories.get_indexer(left.categories)[left.codes]
+        left_codes[left.codes < 0] = -1
+        mapping = categories.get_indexer(right.categories)
+    else:
+        left_codes = left.codes
+    right_codes = np.where(right.codes >= 0, mapping[right.codes], -1)
+    codes = np.concatenate([left_codes, right_codes])
+
+    used = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+    if not used.all():
+        codes = np.where(codes >= 0, (np.cumsum(used) - 1)[codes], -1)
+        categories = categories[used]
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories), validate=False)
+
+
+def _concat_tables(kept, delta):
+    """拼接保留行与新增行，分类列按编码合并"""
+    categorical = [column for column in kept.columns if isinstance(kept[column].dtype, pd.CategoricalDtype)]
+    frame = pd.concat([kept.drop(columns=categorical), delta.drop(columns=categorical)], ignore_index=True)
+    for column in categorical:
+        frame[column] = _concat_categorical(kept[column].array, delta[column].array)
+    return frame[kept.columns]
+
+
+def _splice_slices(old_slices, keep, delta_slices, offset, keys):
+    """
+    拼接后各产品的行范围：保留产品的范围减去其前面删除的行数，
+    重新展开的产品取 delta 中的范围加上保留行数 offset，按 keys 的顺序排列。
+    """
+    removed_before = np.concatenate([[0], np.cumsum(~keep)])
+    starts = np.fromiter(map(attrgetter("start"), old_slices.values()), np.int64, len(old_slices))
+    stops = np.fromiter(map(attrgetter("stop"), old_slices.values()), np.int64, len(old_slices))
+    shift = removed_before[starts]
+    # 被剔除产品的范围无意义，随后由 delta 中的范围覆盖或不再出现在 keys 中
+    shifted = dict(zip(old_slices, map(slice, (starts - shift).tolist(), (stops - shift).tolist())))
+    for key, part in delta_slices.items():
+        shifted[key] = slice(part.start + offset, part.stop + offset)
+    return {key: shifted[key] for key in keys}, removed_before
+
+
+class FactTables:
+    """
+    规范化的列式工艺数据：
+    - steps: 每个工艺步骤一行，时间统一换算为小时（时长(h)），温度解析为数值区间
+    - parameters: 每个关键参数一行，附规范参数 ID/名称、参数类型与重要程度
+    - equipment: 每次设备使用一行，附规范设备 ID/名称与设备类型
+    （parameters/equipment 的 步骤行号 指向 steps 中对应行）
+    - products: 每个产品一行的汇总统计，含按步骤依赖计算的关键路径工期
+    - categories: 每个分类一行的汇总统计（步骤数、参数数、设备种类、工期与温度极值）
+    - category_equipment: 分类 × 设备类型 的设备使用次数
+    - parameter_canonicalizer / equipment_canonicalizer: 本目录的名称规范化器，完整构建时新建，
+      增量更新沿用上一版本的实例
+    - graph_errors: 步骤依赖声明有误（循环或引用不存在的步骤）的产品 → 错误说明，
+      这些产品的关键路径工期与 DAG 均按线性流程处理
+
+    同一产品的行在各表中连续存放，按产品取子表只需切片。
+    """
+
+    def __init__(self, processes):
+        self._build_tables(processes)
+        canonicalizers = build_canonicalizers()
+        self.parameter_canonicalizer = canonicalizers["参数"]
+        self.equipment_canonicalizer = canonicalizers["设备"]
+        self._classify()
+        with span("产品汇总"):
+            self.products = self._build_product_summary(processes)
+        self._build_aggregates()
+
+    def _build_tables(self, processes):
+        step_cols = {"分类": [], "产品": [], "步骤序号": [], "步骤名称": [], "参数数": [], "设备数": []}
+        duration_values = []
+        duration_units = []
+        temperatures = []
+        param_cols = {"分类": [], "产品": [], "步骤序号": [], "步骤行号": [], "步骤名称": [], "参数名称": []}
+        equip_cols = {"分类": [], "产品": [], "步骤序号": [], "步骤行号": [], "步骤名称": [], "设备名称": []}
+        self.step_slices = {}
+        self.parameter_slices = {}
+        self.equipment_slices = {}
+
+        for category, products in processes.items():
+            for product, info in products.items():
+                key = (category, product)
+                step_start = len(step_cols["步骤序号"])
+                param_start = len(param_cols["参数名称"])
+                equip_start = len(equip_cols["设备名称"])
+
+                for i, step in enumerate(info.get("工艺步骤", []), 1):
+                    name = step["name"]
+                    step_row = len(step_cols["步骤序号"])
+                    params = step.get("关键参数", [])
+                    equips = step.get("设备", [])
+
+                    step_cols["分类"].append(category)
+                    step_cols["产品"].append(product)
+                    step_cols["步骤序号"].append(i)
+                    step_cols["步骤名称"].append(name)
+                    step_cols["参数数"].append(len(params))
+                    step_cols["设备数"].append(len(equips))
+
+                    value, unit = find_duration(step)
+                    duration_values.append(value)
+                    duration_units.append(unit)
+                    temperatures.append(step.get(TEMPERATURE_KEY))
+
+                    n = len(params)
+                    param_cols["分类"].extend([category] * n)
+                    param_cols["产品"].extend([product] * n)
+                    param_cols["步骤序号"].extend([i] * n)
+                    param_cols["步骤行号"].extend([step_row] * n)
+                    param_cols["步骤名称"].extend([name] * n)
+                    param_cols["参数名称"].extend(params)
+
+                    n = len(equips)
+                    equip_cols["分类"].extend([category] * n)
+                    equip_cols["产品"].extend([product] * n)
+                    equip_cols["步骤序号"].extend([i] * n)
+                    equip_cols["步骤行号"].extend([step_row] * n)
+                    equip_cols["步骤名称"].extend([name] * n)
+                    equip_cols["设备名称"].extend(equips)
+
+                self.step_slices[key] = slice(step_start, len(step_cols["步骤序号"]))
+                self.parameter_slices[key] = slice(param_start, len(param_cols["参数名称"]))
+                self.equipment_slices[key] = slice(equip_start, len(equip_cols["设备名称"]))
+
+        with span("构建 DataFrame"):
+            self.steps = self._to_frame(step_cols, ("分类", "产品", "步骤名称"))
+            self.steps = self.steps.join(normalize_durations(duration_values, duration_units))
+            self.steps["工艺温度"] = pd.Series(temperatures, dtype="object").astype("category")
+            self.steps = self.steps.join(parse_temperatures(temperatures))
+            self.parameters = self._to_frame(param_cols, ("分类", "产品", "步骤名称", "参数名称"))
+            self.equipment = self._to_frame(equip_cols, ("分类", "产品", "步骤名称", "设备名称"))
+
+    @classmethod
+    def updated(cls, old, processes, changed, removed):
+        """
+        在 old 的基础上得到新目录 processes 的事实表，只重新展开 changed（新增或修改）的产品。
+
+        未变化产品的行原样保留，删除与修改产品的旧行被剔除，新展开的行追加在末尾；
+        各产品的行范围按新目录的产品顺序重新编排，步骤行号随之重映射。
+        """
+        stale = [key for key in (*changed, *removed) if key in old.step_slices]
+        delta_processes = {}
+        for category, product in changed:
+            delta_processes.setdefault(category, {})[product] = processes[category][product]
+        # 只展开变化的产品，分类汇总在拼接后整体计算
+        delta = cls.__new__(cls)
+        delta._build_tables(delta_processes)
+        # 沿用上一版本的规范化器，未变化产品的规范 ID 与规范名称保持有效
+        delta.parameter_canonicalizer = old.parameter_canonicalizer
+        delta.equipment_canonicalizer = old.equipment_canonicalizer
+        delta._classify()
+        delta.products = delta._build_product_summary(delta_processes)
+
+        keys = [(category, product) for category, products in processes.items() for product in products]
+        facts = cls.__new__(cls)
+        facts.parameter_canonicalizer = old.parameter_canonicalizer
+        facts.equipment_canonicalizer = old.equipment_canonicalizer
+        step_map = None
+        for table, slices_name in (("steps", "step_slices"), ("parameters", "parameter_slices"),
+                                   ("equipment", "equipment_slices")):
+            old_slices = getattr(old, slices_name)
+            keep = np.ones(len(getattr(old, table)), dtype=bool)
+            for key in stale:
+                keep[old_slices[key]] = False
+            kept = getattr(old, table)[keep]
+            slices, removed_before = _splice_slices(old_slices, keep, getattr(delta, slices_name), len(kept), keys)
+            delta_table = getattr(delta, table)
+            if step_map is None:
+                step_map = removed_before, int(keep.sum())
+            else:
+                # 参数、设备行指向的步骤行号随步骤表的拼接平移
+                step_removed, step_offset = step_map
+                rows = kept["步骤行号"].to_numpy()
+                kept = kept.assign(步骤行号=(rows - step_removed[rows]).astype("int32"))
+                delta_table = delta_table.assign(步骤行号=(delta_table["步骤行号"] + step_offset).astype("int32"))
+            setattr(facts, table, _concat_tables(kept, delta_table))
+            setattr(facts, slices_name, slices)
+
+        with span("产品汇总"):
+            # products 的行与 step_slices 的产品顺序一致，按产品序号取保留行
+            stale_set = set(stale)
+            kept_rows = [i for i, key in enumerate(old.step_slices) if key not in stale_set]
+            positions = {key: n for n, key in enumerate(key for key in old.step_slices if key not in stale_set)}
+            positions.update((key, len(kept_rows) + i) for i, key in enumerate(delta.step_slices))
+            products = _concat_tables(old.products.iloc[kept_rows], delta.products)
+            facts.products = products.iloc[[positions[key] for key in keys]].reset_index(drop=True)
+            facts.graph_errors = {
+                **{key: error for key, error in old.graph_errors.items() if key not in stale_set},
+                **delta.graph_errors,
+            }
+        facts._build_aggregates()
+        return facts
+
+    def _classify(self):
+        # 近似重复的名称映射为同一规范 ID，计数与索引按 ID 进行，分类也按规范名称进行
+        with span("名称规范化"):
+            for table, canonicalizer, prefix in ((self.parameters, self.parameter_canonicalizer, "参数"),
+                                                 (self.equipment, self.equipment_canonicalizer, "设备")):
+                ids = canonicalizer.canonical_ids(table[f"{prefix}名称"])
+                table[f"{prefix}ID"] = ids
+                table[f"标准{prefix}名称"] = canonicalizer.categorical(ids)
+        # 分类结果按不同名称计算一次后映射回整列
+        with span("classify_parameter"):
+            self.parameters["参数类型"] = parameter_type_classifier.classify_series(self.parameters["标准参数名称"]).astype("category")
+        with span("assess_importance"):
+            self.parameters["重要程度"] = importance_classifier.classify_series(self.parameters["标准参数名称"]).astype("int8")
+        with span("classify_equipment"):
+            self.equipment["设备类型"] = equipment_type_classifier.classify_series(self.equipment["标准设备名称"]).astype("category")
+
+    def _build_aggregates(self):
+        self._products_by_key = self.products.set_index(["分类", "产品"], drop=False)
+        with span("分类汇总"):
+            self.categories = self._build_category_summary()
+            self.category_equipment = (
+                self.equipment.groupby(["分类", "设备类型"], observed=True).size().unstack(fill_value=0)
+            )
+
+    @staticmethod
+    def _to_frame(columns, categorical_columns):
+        frame = pd.DataFrame(columns)
+        for column in categorical_columns:
+            frame[column] = _categorical(frame[column])
+        frame["步骤序号"] = frame["步骤序号"].astype("int32")
+        if "步骤行号" in frame:
+            frame["步骤行号"] = frame["步骤行号"].astype("int32")
+        return frame
+
+    def _build_product_summary(self, processes):
+        keys = [(category, product) for category, products in processes.items() for product in products]
+        index = pd.MultiIndex.from_tuples(keys, names=["分类", "产品"])
+
+        # observed=True 只保留实际出现的产品组合
+        steps = self.steps.groupby(["分类", "产品"], observed=True)
+        equipment = self.equipment.groupby(["分类", "产品"], observed=True)["设备ID"]
+
+        summary = pd.DataFrame(index=index)
+        summary["步骤数"] = steps.size().reindex(index, fill_value=0)
+        summary["关键参数总数"] = steps["参数数"].sum().reindex(index, fill_value=0)
+        summary["设备种类数"] = equipment.nunique().reindex(index, fill_value=0)
+        summary = summary.astype("int64")
+        summary["总工艺时间(h)"] = steps["时长(h)"].sum().reindex(index, fill_value=0.0)
+
+        # 线性流程的工期即步骤时长之和，仅声明了依赖的产品需要按 DAG 计算
+        summary["关键路径工期(h)"] = summary["总工艺时间(h)"]
+        self.graph_errors = {}
+        for key in keys:
+            step_list = processes[key[0]][key[1]].get("工艺步骤", [])
+            if has_dependencies(step_list):
+                durations = self.steps["时长(h)"].iloc[self.step_slices[key]].tolist()
+                try:
+                    summary.loc[key, "关键路径工期(h)"] = ProcessGraph.from_steps(step_list, durations).makespan
+                except ValueError as exc:
+                    # 单个产品的依赖有误不应中断整个目录的加载，工期沿用线性流程的步骤时长之和
+                    self.graph_errors[key] = str(exc)
+                    warnings.warn(f"{key[0]} / {key[1]}: {exc}，按线性流程计算关键路径工期", stacklevel=2)
+        summary = summary.reset_index()
+        summary["子分类"] = summary["分类"].str.split("-").str[-1]
+        for column in ("分类", "产品", "子分类"):
+            summary[column] = _categorical(summary[column])
+        return summary[["分类", "子分类", "产品", "步骤数", "关键参数总数", "设备种类数", "总工艺时间(h)", "关键路径工期(h)"]]
+
+    def _build_category_summary(self):
+        products = self.products.groupby("分类", observed=True)
+        summary = pd.DataFrame({
+            "产品数量": products.size(),
+            "平均步骤数": products["步骤数"].mean(),
+            "最少步骤数": products["步骤数"].min(),
+            "最多步骤数": products["步骤数"].max(),
+            "平均关键参数数": products["关键参数总数"].mean(),
+            "平均设备种类数": products["设备种类数"].mean(),
+            "设备种类数": self.equipment.groupby("分类", observed=True)["设备ID"].nunique(),
+            "平均工艺时间(h)": products["总工艺时间(h)"].mean(),
+        })
+
+        # 温度极值只取有限的区间端点，"≤8℃" 之类的开区间不计入另一端
+        bounds = pd.concat([
+            self.steps[["分类", "温度下限(℃)"]].rename(columns={"温度下限(℃)": "温度(℃)"}),
+            self.steps[["分类", "温度上限(℃)"]].rename(columns={"温度上限(℃)": "温度(℃)"}),
+        ])
+        bounds = bounds[np.isfinite(bounds["温度(℃)"])].groupby("分类", observed=True)["温度(℃)"]
+        summary["最低温度(℃)"] = bounds.min()
+        summary["最高温度(℃)"] = bounds.max()
+        summary["设备种类数"] = summary["设备种类数"].fillna(0).astype("int64")
+        return summary.rename_axis("分类").reset_index()
+
+    def product_steps(self, main_category, product):
+        return self.steps.iloc[self.step_slices.get((main_category, product), slice(0, 0))]
+
+    def product_parameters(self, main_category, product):
+        return self.parameters.iloc[self.parameter_slices.get((main_category, product), slice(0, 0))]
+
+    def product_equipment(self, main_category, product):
+        return self.equipment.iloc[self.equipment_slices.get((main_category, product), slice(0, 0))]
+
+    def product_graph(self, main_category, product, steps):
+        """由工艺步骤列表构建 DAG，时长取自步骤事实表；依赖有误的产品按线性流程构建"""
+        durations = self.product_steps(main_category, product)["时长(h)"].tolist()
+        if (main_category, product) in self.graph_errors:
+            return ProcessGraph.linear([step["name"] for step in steps], durations)
+        return ProcessGraph.from_steps(steps, durations)
+
+    def product_summaries(self, keys):
+        """按 (分类, 产品) 列表取汇总行，保持传入顺序"""
+        keys = [key for key in keys if key in self.step_slices]
+        return self._products_by_key.loc[keys].reset_index(drop=True)
@@ -0,0 +1,255 @@
+"""工艺流程图渲染 - 所有节点、连线、标签各用一条 trace 绘制，支持线性流程与分层 DAG"""
+
+import plotly.graph_objects as go
+
+# 定义节点颜色方案
+NODE_COLORS = ['#636efa', '#ef553b', '#00cc96', '#ab63fa', '#ffa15a',
+               '#19d3f3', '#ff6692', '#b6e880', '#ff97ff', '#fecb52']
+
+# 步骤数超过该阈值时改用 WebGL 渲染
+WEBGL_STEP_THRESHOLD = 40
+
+# 步骤数超过该阈值时步骤名称上下交替排列，避免互相遮挡
+STAGGER_LABEL_THRESHOLD = 10
+
+
+def _step_hovertext(step):
+    return (f"<b>{step['name']}</b><br>关键参数: {', '.join(step.get('关键参数', []))}"
+            f"<br>设备: {', '.join(step.get('设备', []))}")
+
+
+def build_flowchart_figure(steps, title, webgl_threshold=WEBGL_STEP_THRESHOLD):
+    """
+    绘制线性工艺流程图。
+
+    节点、连线、流向箭头和步骤名称分别合并为一条 trace（连线用 None 分隔），
+    图表 JSON 大小随步骤数线性增长且常数很小；步骤较多时切换为 Scattergl。
+    """
+    num_steps = len(steps)
+    scatter = go.Scattergl if num_steps > webgl_threshold else go.Scatter
+
+    # 计算节点位置
+    x_positions = [i / (num_steps - 1) if num_steps > 1 else 0.5 for i in range(num_steps)]
+    y_position = 0.5
+    node_size = 40 if num_steps <= 15 else max(16, int(600 / num_steps))
+
+    if num_steps > STAGGER_LABEL_THRESHOLD:
+        label_y = [y_position - 0.15 if i % 2 == 0 else y_position + 0.15 for i in range(num_steps)]
+    else:
+        label_y = [y_position - 0.15] * num_steps
+
+    # 连接线：每段两个端点后接 None 断开
+    gap = min(0.03, 0.3 / max(num_steps, 1))
+    edge_x, edge_y = [], []
+    for i in range(num_steps - 1):
+        edge_x += [x_positions[i] + gap, x_positions[i + 1] - gap, None]
+        edge_y += [y_position, y_position, None]
+    arrow_x = [(x_positions[i] + x_positions[i + 1]) / 2 for i in range(num_steps - 1)]
+
+    fig = go.Figure()
+
+    # 添加工艺连接线
+    fig.add_trace(scatter(
+        x=edge_x,
+        y=edge_y,
+        mode="lines",
+        line=dict(width=3, color='#667eea'),
+        hoverinfo="none"
+    ))
+
+    # 添加流向箭头
+    fig.add_trace(scatter(
+        x=arrow_x,
+        y=[y_position] * len(arrow_x),
+        mode="markers",
+        marker=dict(symbol="triangle-right", size=12, color="#ffffff"),
+        hoverinfo="none"
+    ))
+
+    # 添加节点
+    fig.add_trace(scatter(
+        x=x_positions,
+        y=[y_position] * num_steps,
+        mode="markers+text",
+        marker=dict(
+            size=node_size,
+            color=[NODE_COLORS[i % len(NODE_COLORS)] for i in range(num_steps)],
+            line=dict(width=3, color='white')
+        ),
+        text=[str(i + 1) for i in range(num_steps)],
+        textposition="middle center",
+        textfont=dict(size=14, color="white", family="Arial Black"),
+        hoverinfo="text",
+        hovertext=[_step_hovertext(step) for step in steps]
+    ))
+
+    # 添加步骤名称标签
+    fig.add_trace(scatter(
+        x=x_positions,
+        y=label_y,
+        mode="text",
+        text=[step["name"] for step in steps],
+        textfont=dict(size=12, color="#e0e0e0", family="Arial"),
+        hoverinfo="none"
+    ))
+
+    # 添加工艺开始和结束标记
+    fig.add_annotation(
+        x=-0.05,
+        y=y_position,
+        text="🏁 开始",
+        showarrow=False,
+        font=dict(size=14, color="#00cc96", family="Arial Black"),
+        xref="paper"
+    )
+
+    fig.add_annotation(
+        x=1.05,
+        y=y_position,
+        text="✅ 完成",
+        showarrow=False,
+        font=dict(size=14, color="#00cc96", family="Arial Black"),
+        xref="paper"
+    )
+
+    # 更新布局 - 优化暗色主题
+    fig.update_layout(
+        title=dict(
+            text=title,
+            font=dict(size=20, color="white", family="Arial Black"),
+            x=0.5,
+            xanchor="center"
+        ),
+        # 不内嵌默认模板（约 8KB），样式均已显式设置
+        template="none",
+        height=400,
+        showlegend=False,
+        xaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False,
+            range=[-0.15, 1.15]
+        ),
+        yaxis=dict(
+            showgrid=False,
+            zeroline=False,
+            showticklabels=False,
+            range=[0, 1]
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=50, r=50, t=80, b=50),
+        hoverlabel=dict(
+            bgcolor="#1e2130",
+            font_size=12,
+            font_color="white"
+        )
+    )
+
+    return fig
+
+
+def build_process_graph_figure(graph, steps, title, webgl_threshold=WEBGL_STEP_THRESHOLD):
+    """
+    按分层布局绘制带并行分支的工艺 DAG，关键路径上的节点和连线高亮显示。
+
+    graph 为 process_graph.ProcessGraph，steps 为对应的工艺步骤列表（用于悬停信息）。
+    """
+    num_steps = len(steps)
+    scatter = go.Scattergl if num_steps > webgl_threshold else go.Scatter
+
+    # 分层布局：层号决定横坐标，同层步骤纵向均匀排列
+    layers = graph.layers()
+    num_layers = max(layers, default=0) + 1
+    members = [[] for _ in range(num_layers)]
+    for node in range(num_steps):
+        members[layers[node]].append(node)
+
+    x_positions = [0.0] * num_steps
+    y_positions = [0.0] * num_steps
+    for layer, nodes in enumerate(members):
+        for rank, node in enumerate(nodes):
+            x_positions[node] = layer / (num_layers - 1) if num_layers > 1 else 0.5
+            y_positions[node] = (rank + 1) / (len(nodes) + 1)
+
+    schedule = graph.schedule()
+    critical = schedule["关键路径"].tolist()
+    earliest_start = schedule["最早开始(h)"].tolist()
+    earliest_finish = schedule["最早完成(h)"].tolist()
+    node_size = 36 if num_layers <= 15 else max(14, int(540 / num_layers))
+
+    # 连线：普通连线与关键路径连线各一条 trace
+    edges = {False: ([], []), True: ([], [])}
+    for node in range(num_steps):
+        for succ in graph.successors[node]:
+            on_path = critical[node] and critical[succ] and abs(earliest_finish[node] - earliest_start[succ]) < 1e-9
+            edge_x, edge_y = edges[on_path]
+            edge_x += [x_positions[node], x_positions[succ], None]
+            edge_y += [y_positions[node], y_positions[succ], None]
+
+    fig = go.Figure()
+
+    for is_critical, (edge_x, edge_y) in edges.items():
+        fig.add_trace(scatter(
+            x=edge_x,
+            y=edge_y,
+            mode="lines",
+            line=dict(width=4 if is_critical else 2, color='#ef553b' if is_critical else '#667eea'),
+            hoverinfo="none"
+        ))
+
+    hovertext = [
+        f"{_step_hovertext(step)}<br>最早开始: {start:.1f} h | 浮动: {slack:.1f} h"
+        for step, start, slack in zip(steps, schedule["最早开始(h)"], schedule["浮动时间(h)"])
+    ]
+
+    # 添加节点
+    fig.add_trace(scatter(
+        x=x_positions,
+        y=y_positions,
+        mode="markers+text",
+        marker=dict(
+            size=node_size,
+            color=['#ef553b' if c else '#636efa' for c in critical],
+            line=dict(width=3, color='white')
+        ),
+        text=[str(i + 1) for i in range(num_steps)],
+        textposition="middle center",
+        textfont=dict(size=13, color="white", family="Arial Black"),
+        hoverinfo="text",
+        hovertext=hovertext
+    ))
+
+    # 添加步骤名称标签
+    fig.add_trace(scatter(
+        x=x_positions,
+        y=[y - 0.08 for y in y_positions],
+        mode="text",
+        text=[step["name"] for step in steps],
+        textfont=dict(size=11, color="#e0e0e0", family="Arial"),
+        hoverinfo="none"
+    ))
+
+    fig.update_layout(
+        title=dict(
+            text=title,
+            font=dict(size=20, color="white", family="Arial Black"),
+            x=0.5,
+            xanchor="center"
+        ),
+        template="none",
+        height=max(400, 120 * max(len(nodes) for nodes in members)) if num_steps else 400,
+        showlegend=False,
+        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=[-0.1, 1.1]),
+        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=[0, 1]),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=50, r=50, t=80, b=50),
+        hoverlabel=dict(
+            bgcolor="#1e2130",
+            font_size=12,
+            font_color="white"
+        )
+    )
+
+    return fig
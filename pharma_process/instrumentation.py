@@ -0,0 +1,307 @@
+"""
+运行时性能埋点 - 按重跑记录各代码段的耗时、内存变化、负载大小与缓存命中情况。
+
+埋点默认关闭：当前线程没有活动的 RerunProfile 时，span() 直接返回空上下文，
+开销只有一次属性查找。Streamlit 每个会话的脚本在各自线程中运行，
+因此活动记录按线程保存。记录可导出为 OpenTelemetry（OTLP/JSON）风格的 span。
+
+内存变化由 tracemalloc 统计，跟踪的是整个进程：同一进程中其他会话并发重跑的内存分配
+也计入各 span 的内存变化，只能作为量级参考。有活动记录时才开启跟踪，最后一个记录结束后
+即停止，不开埋点的会话不承担跟踪开销。
+"""
+
+import json
+import secrets
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+
+import pandas as pd
+
+PROFILE_ENV_VAR = "PHARMA_PROCESS_PROFILE"
+TRACE_FILE_ENV_VAR = "PHARMA_PROCESS_TRACE_FILE"
+DEFAULT_TRACE_FILE = Path("traces") / "spans.jsonl"
+
+SERVICE_NAME = "pharma-process-app"
+
+_local = threading.local()
+_NULL_SPAN = nullcontext()
+
+# 视图缓存的调用与未命中次数（进程级）
+_cache_lock = threading.Lock()
+_cache_calls = Counter()
+_cache_misses = Counter()
+
+# 正在统计内存的活动记录数；计数归零时停止由本模块开启的 tracemalloc 跟踪
+_memory_lock = threading.Lock()
+_memory_users = 0
+_memory_started = False
+
+
+def _acquire_memory_tracing():
+    global _memory_users, _memory_started
+    with _memory_lock:
+        if _memory_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _memory_started = True
+        _memory_users += 1
+
+
+def _release_memory_tracing():
+    global _memory_users, _memory_started
+    with _memory_lock:
+        _memory_users -= 1
+        # 进程启动时已开启的跟踪（如 PYTHONTRACEMALLOC）不由这里停止
+        if _memory_users == 0 and _memory_started:
+            tracemalloc.stop()
+            _memory_started = False
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "memory_bytes", "payload_bytes", "attributes")
+
+    def __init__(self, name, parent_id, attributes):
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.memory_bytes = None
+        self.payload_bytes = 0
+        self.attributes = dict(attributes)
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class RerunProfile:
+    """
+    一次脚本重跑（或片段重跑）的全部 span，根 span 即本次重跑。
+
+    track_memory 时从创建到 finish() 期间持有进程级的 tracemalloc 跟踪；重跑异常中断、
+    记录未经 finish() 即被丢弃时，由对象回收释放。
+    """
+
+    def __init__(self, name, track_memory=True):
+        self.trace_id = secrets.token_hex(16)
+        self.track_memory = track_memory
+        self._release_memory = None
+        if track_memory:
+            _acquire_memory_tracing()
+            self._release_memory = weakref.finalize(self, _release_memory_tracing)
+        self.spans = []
+        self._stack = []
+        self._memory = {}
+        self._perf = {}
+        self.root = self.open(name, {})
+
+    def open(self, name, attributes):
+        span = Span(name, self._stack[-1].span_id if self._stack else None, attributes)
+        self.spans.append(span)
+        self._stack.append(span)
+        if self.track_memory:
+            self._memory[span.span_id] = tracemalloc.get_traced_memory()[0]
+        self._perf[span.span_id] = time.perf_counter_ns()
+        return span
+
+    def close(self, span):
+        span.end_ns = span.start_ns + time.perf_counter_ns() - self._perf.pop(span.span_id)
+        if self.track_memory:
+            span.memory_bytes = tracemalloc.get_traced_memory()[0] - self._memory.pop(span.span_id)
+        while self._stack and self._stack[-1] is not span:
+            self._stack.pop()
+        if self._stack:
+            self._stack.pop()
+
+    @property
+    def current(self):
+        return self._stack[-1] if self._stack else None
+
+    def finish(self):
+        while self._stack:
+            self.close(self._stack[-1])
+        if self._release_memory is not None:
+            self._release_memory()
+        return self
+
+    @property
+    def duration_ms(self):
+        return self.root.duration_ms
+
+    def records(self):
+        """span 明细，按开始顺序排列，层级以缩进表示"""
+        depth = {None: -1}
+        rows = []
+        for span in self.spans:
+            depth[span.span_id] = depth.get(span.parent_id, -1) + 1
+            rows.append({
+                "代码段": "　" * depth[span.span_id] + span.name,
+                "耗时(ms)": round(span.duration_ms, 2),
+                "内存变化(KB)": None if span.memory_bytes is None else round(span.memory_bytes / 1024, 1),
+                "负载(KB)": round(span.payload_bytes / 1024, 1) if span.payload_bytes else None,
+            })
+        return rows
+
+    def to_otlp(self):
+        """OTLP/JSON 风格的 resourceSpans 文档"""
+        def attribute(key, value):
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for span in self.spans:
+            attributes = dict(span.attributes)
+            if span.memory_bytes is not None:
+                attributes["memory.delta_bytes"] = span.memory_bytes
+            if span.payload_bytes:
+                attributes["payload.bytes"] = span.payload_bytes
+            spans.append({
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or time.time_ns()),
+                "attributes": [attribute(key, value) for key, value in attributes.items()],
+            })
+        return {"resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+        }]}
+
+
+def current_profile():
+    return getattr(_local, "profile", None)
+
+
+def start_profile(name, track_memory=True):
+    """开始记录当前线程的一次重跑，先结束该线程遗留的未完成记录"""
+    finish_profile()
+    _local.profile = RerunProfile(name, track_memory)
+    return _local.profile
+
+
+def finish_profile():
+    """结束当前线程的记录并返回，没有活动记录时返回 None"""
+    profile = current_profile()
+    _local.profile = None
+    return profile.finish() if profile is not None else None
+
+
+@contextmanager
+def _span(profile, name, attributes):
+    span = profile.open(name, attributes)
+    try:
+        yield span
+    finally:
+        profile.close(span)
+
+
+def span(name, **attributes):
+    """记录一个代码段；未开启埋点时为空上下文"""
+    profile = current_profile()
+    if profile is None:
+        return _NULL_SPAN
+    return _span(profile, name, attributes)
+
+
+def traced(name):
+    """把整个函数调用记录为一个代码段"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def payload_size(obj):
+    """发送到浏览器的数据量估计：图表按 JSON、表格按 Arrow 序列化大小"""
+    if hasattr(obj, "to_plotly_json"):
+        return len(obj.to_json().encode("utf-8"))
+    # pandas Styler 的数据在 .data 中
+    data = getattr(obj, "data", obj)
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if isinstance(data, pd.DataFrame):
+        try:
+            import pyarrow as pa
+
+            return pa.Table.from_pandas(data).nbytes
+        except Exception:
+            return int(data.memory_usage(deep=True).sum())
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    if isinstance(data, bytes):
+        return len(data)
+    return 0
+
+
+def track_cache(name, cache_decorator):
+    """
+    为缓存装饰器（如 st.cache_data(...)）统计命中率。
+
+    外层记录调用次数并作为代码段计时，被缓存的函数体只在未命中时执行，
+    在其中记录未命中次数。
+    """
+    def decorate(func):
+        # 保留原函数的名称与源码，st.cache_data 以此区分不同函数的缓存
+        @wraps(func)
+        def on_miss(*args, **kwargs):
+            with _cache_lock:
+                _cache_misses[name] += 1
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(on_miss)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _cache_lock:
+                _cache_calls[name] += 1
+            with span(name, cache=True):
+                return cached(*args, **kwargs)
+
+        wrapper.clear = getattr(cached, "clear", None)
+        return wrapper
+    return decorate
+
+
+def cache_statistics(external=None):
+    """
+    各缓存的调用、命中次数与命中率。
+
+    external 为其他缓存的 {名称: (命中, 未命中)}，例如 analytics 分析函数的 cache_info()。
+    """
+    counts = {}
+    with _cache_lock:
+        for name, calls in _cache_calls.items():
+            counts[name] = (calls - _cache_misses[name], _cache_misses[name])
+    counts.update(external or {})
+    rows = []
+    for name, (hits, misses) in counts.items():
+        calls = hits + misses
+        if calls:
+            rows.append({"缓存": name, "调用": calls, "命中": hits, "命中率": hits / calls})
+    return rows
+
+
+def export_profile(profile, path=DEFAULT_TRACE_FILE):
+    """以 JSON Lines 追加写出一次重跑的 span（每行一个 OTLP/JSON 文档）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(profile.to_otlp(), ensure_ascii=False) + "\n")
+    return path
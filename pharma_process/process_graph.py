@@ -0,0 +1,156 @@
+"""工艺步骤有向无环图 - 支持并行分支、最早/最晚开始时间与关键路径计算"""
+
+import math
+from collections import deque
+
+import pandas as pd
+
+# 步骤字典中的可选依赖字段，取值为前置步骤名称或步骤序号（从 1 开始）列表；
+# 未声明依赖的步骤默认依赖列表中的上一步
+DEPENDENCY_KEY = "依赖"
+
+
+def has_dependencies(steps):
+    return any(DEPENDENCY_KEY in step for step in steps)
+
+
+class ProcessGraph:
+    """
+    工艺步骤 DAG。
+
+    节点为步骤在工艺步骤列表中的下标，predecessors[i] 为步骤 i 的前置步骤下标。
+    """
+
+    def __init__(self, names, durations, predecessors):
+        self.names = list(names)
+        self.durations = [0.0 if d is None or math.isnan(d) else float(d) for d in durations]
+        self.predecessors = [sorted(set(p)) for p in predecessors]
+        self.successors = [[] for _ in self.names]
+        for node, preds in enumerate(self.predecessors):
+            for pred in preds:
+                self.successors[pred].append(node)
+        self.order = self._topological_order()
+        self._schedule = None
+
+    @classmethod
+    def from_steps(cls, steps, durations):
+        """由工艺步骤列表和归一化时长（小时）构建，依赖可引用步骤名称或序号"""
+        positions = {}
+        for i, step in enumerate(steps):
+            positions.setdefault(step["name"], i)
+
+        predecessors = []
+        for i, step in enumerate(steps):
+            if DEPENDENCY_KEY not in step:
+                predecessors.append([i - 1] if i > 0 else [])
+                continue
+            preds = []
+            for ref in step[DEPENDENCY_KEY] or []:
+                # bool 是 int 的子类，True/False 不能当作步骤序号
+                if isinstance(ref, bool):
+                    raise ValueError(f"步骤 {step['name']} 的依赖应为步骤名称或序号: {ref}")
+                if isinstance(ref, int):
+                    pred = ref - 1
+                    if not 0 <= pred < len(steps):
+                        raise ValueError(f"步骤 {step['name']} 的依赖序号超出范围: {ref}")
+                elif ref in positions:
+                    pred = positions[ref]
+                else:
+                    raise ValueError(f"步骤 {step['name']} 的依赖步骤不存在: {ref}")
+                preds.append(pred)
+            predecessors.append(preds)
+        return cls([step["name"] for step in steps], durations, predecessors)
+
+    @classmethod
+    def linear(cls, names, durations):
+        """按列表顺序依次执行的线性流程，忽略依赖声明"""
+        return cls(names, durations, [[i - 1] if i > 0 else [] for i in range(len(names))])
+
+    def _topological_order(self):
+        indegree = [len(p) for p in self.predecessors]
+        ready = deque(node for node, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for succ in self.successors[node]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    ready.append(succ)
+        if len(order) != len(self.names):
+            raise ValueError("工艺步骤依赖存在循环")
+        return order
+
+    @property
+    def has_branches(self):
+        return any(len(s) > 1 for s in self.successors) or any(len(p) > 1 for p in self.predecessors)
+
+    def schedule(self):
+        """
+        前推/后推计算每个步骤的最早、最晚开始时间与浮动时间。
+
+        返回按步骤顺序排列的 DataFrame，浮动时间为 0 的步骤位于关键路径上。
+        """
+        if self._schedule is not None:
+            return self._schedule
+
+        n = len(self.names)
+        earliest_start = [0.0] * n
+        earliest_finish = [0.0] * n
+        for node in self.order:
+            start = max((earliest_finish[p] for p in self.predecessors[node]), default=0.0)
+            earliest_start[node] = start
+            earliest_finish[node] = start + self.durations[node]
+
+        makespan = max(earliest_finish, default=0.0)
+        latest_finish = [makespan] * n
+        latest_start = [0.0] * n
+        for node in reversed(self.order):
+            finish = min((latest_start[s] for s in self.successors[node]), default=makespan)
+            latest_finish[node] = finish
+            latest_start[node] = finish - self.durations[node]
+
+        slack = [latest_start[i] - earliest_start[i] for i in range(n)]
+        self._schedule = pd.DataFrame({
+            "步骤序号": range(1, n + 1),
+            "步骤名称": self.names,
+            "时长(h)": self.durations,
+            "最早开始(h)": earliest_start,
+            "最早完成(h)": earliest_finish,
+            "最晚开始(h)": latest_start,
+            "最晚完成(h)": latest_finish,
+            "浮动时间(h)": slack,
+            "关键路径": [abs(s) < 1e-9 for s in slack],
+        })
+        return self._schedule
+
+    @property
+    def makespan(self):
+        """按依赖关系并行执行时的总工期（小时）"""
+        schedule = self.schedule()
+        return float(schedule["最早完成(h)"].max()) if len(schedule) else 0.0
+
+    def critical_path(self):
+        """关键路径上的步骤下标，按执行顺序排列"""
+        critical = self.schedule()["关键路径"].tolist()
+        finish = self.schedule()["最早完成(h)"].tolist()
+        ends = [node for node in self.order if critical[node] and not any(critical[s] for s in self.successors[node])]
+        if not ends:
+            return []
+        node = max(ends, key=lambda i: finish[i])
+        path = [node]
+        while True:
+            preds = [p for p in self.predecessors[node] if critical[p] and abs(finish[p] - (finish[node] - self.durations[node])) < 1e-9]
+            if not preds:
+                break
+            node = preds[0]
+            path.append(node)
+        return path[::-1]
+
+    def layers(self):
+        """分层布局的层号：每个步骤位于其最长前置链之后的一层"""
+        layer = [0] * len(self.names)
+        for node in self.order:
+            for succ in self.successors[node]:
+                layer[succ] = max(layer[succ], layer[node] + 1)
+        return layer
@@ -0,0 +1,332 @@
+"""制药工艺数据存储 - 从外部文件加载工艺目录并建立查询索引"""
+
+import csv
+import itertools
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .alignment import StepAligner
+from .catalog_versions import SITE_ENV_VAR, CatalogDiff, catalog_hash, get_repository, hash_products
+from .compact_catalog import CompactCatalog
+from .equipment_incidence import EquipmentIncidence
+from .fact_tables import FactTables
+from .instrumentation import span
+from .search_index import SearchIndex
+from .similarity import SimilarityIndex
+from .temperatures import TemperatureIndex
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "data" / "processes.json"
+
+# 可通过环境变量指定其他工艺目录文件
+CATALOG_ENV_VAR = "PHARMA_PROCESS_CATALOG"
+
+# CSV 格式中的列表字段使用竖线分隔
+CSV_LIST_SEPARATOR = "|"
+CSV_BASE_COLUMNS = ("分类", "产品", "description", "关键特征", "name", "关键参数", "设备")
+CSV_STEP_LIST_COLUMNS = ("依赖",)
+
+
+def _split_list(value):
+    if not value:
+        return []
+    return [item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()]
+
+
+def _parse_scalar(value):
+    """CSV 单元格中的数字按数值读取，其余保持字符串"""
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_yaml(path):
+    try:
+        import yaml
+    except ImportError as exc:
+        raise ImportError("读取 YAML 工艺目录需要安装 PyYAML") from exc
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _load_csv(path):
+    """CSV 每行一个工艺步骤，除基础列外的非空列作为步骤属性（如 时间(h)、温度(℃)）"""
+    catalog = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            products = catalog.setdefault(row["分类"], {})
+            product = products.setdefault(row["产品"], {
+                "description": row.get("description", ""),
+                "关键特征": _split_list(row.get("关键特征", "")),
+                "工艺步骤": [],
+            })
+            step = {
+                "name": row["name"],
+                "关键参数": _split_list(row.get("关键参数", "")),
+                "设备": _split_list(row.get("设备", "")),
+            }
+            for column, value in row.items():
+                if column in CSV_STEP_LIST_COLUMNS:
+                    if value:
+                        step[column] = [_parse_scalar(item) for item in _split_list(value)]
+                elif column not in CSV_BASE_COLUMNS and value not in (None, ""):
+                    step[column] = _parse_scalar(value)
+            product["工艺步骤"].append(step)
+    return catalog
+
+
+LOADERS = {
+    ".json": _load_json,
+    ".yaml": _load_yaml,
+    ".yml": _load_yaml,
+    ".csv": _load_csv,
+}
+
+
+def load_catalog(path):
+    """按文件扩展名读取工艺目录，返回 {分类: {产品: 产品信息}} 结构"""
+    path = Path(path)
+    loader = LOADERS.get(path.suffix.lower())
+    if loader is None:
+        raise ValueError(f"不支持的工艺目录格式: {path.suffix}")
+    return loader(path)
+
+
+class ProcessStore:
+    """
+    工艺目录存储，加载时一次性建立分类/产品索引、事实表与各查询索引。
+
+    目录本身以 CompactCatalog（驻留取值表 + 整数编码数组）保存，解析得到的嵌套字典在建完
+    各索引后即可释放；product_index、get_product_info() 与 processes 按需还原为字典。
+
+    每个产品按内容哈希标识，目录版本由全部产品哈希得到；updated() 以已有存储为基础，
+    只为哈希变化的产品重建事实表与各索引中的对应部分。温度索引、设备关联矩阵与步骤比对编码
+    依赖整张事实表的行号，不做增量更新，而是在首次访问时按当前事实表构建一次。
+
+    完整构建的存储分配新的谱系编号 lineage，updated() 得到的存储沿用。名称规范化器随谱系
+    重建，规范名称及由其得到的分类、设备种类数在谱系之间可能不同，结果缓存的键须包含谱系编号
+    （见 cache_key、product_cache_key）。
+    """
+
+    def __init__(self, processes, product_hashes=None):
+        self.lineage = next(_lineages)
+        self.product_hashes = hash_products(processes) if product_hashes is None else product_hashes
+        self.version = catalog_hash(self.product_hashes)
+        # 由 updated() 得到时为相对上一版本的 CatalogDiff
+        self.diff = None
+        with span("构建紧凑目录"):
+            self.catalog = CompactCatalog(processes)
+        self._index_catalog()
+
+        # 列式事实表，所有视图共享
+        with span("构建事实表"):
+            self.facts = FactTables(processes)
+        with span("构建检索索引"):
+            self.search_index = SearchIndex(processes, self.facts)
+        with span("构建相似度索引"):
+            self.similarity = SimilarityIndex(self.facts)
+
+    def _index_catalog(self):
+        self.categories = self.catalog.categories
+        self.products_by_category = self.catalog.products_by_category()
+        # (分类, 产品) → 产品信息的只读映射，取值时由紧凑目录还原
+        self.product_index = self.catalog
+        # 按需构建的派生索引：名称 → 索引
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def _derive(self, name, label, build):
+        """首次访问时构建派生索引，并发访问只构建一次"""
+        index = self._derived.get(name)
+        if index is None:
+            with self._derived_lock:
+                index = self._derived.get(name)
+                if index is None:
+                    with span(label):
+                        index = self._derived[name] = build()
+        return index
+
+    @property
+    def temperature_index(self):
+        return self._derive("temperature_index", "构建温度索引", lambda: TemperatureIndex(self.facts.steps))
+
+    @property
+    def equipment_incidence(self):
+        return self._derive("equipment_incidence", "构建设备关联矩阵", lambda: EquipmentIncidence(self.facts))
+
+    @property
+    def aligner(self):
+        return self._derive("aligner", "构建步骤比对编码", lambda: StepAligner(self.facts))
+
+    @property
+    def processes(self):
+        """完整的 {分类: {产品: 产品信息}} 嵌套字典，每次调用重新还原"""
+        return self.catalog.to_dict()
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_catalog(path))
+
+    def updated(self, processes, product_hashes=None):
+        """
+        新目录 processes 对应的存储，只重建内容哈希变化的产品；内容未变时返回自身。
+        温度索引、设备关联矩阵与步骤比对编码不在此构建，新存储首次用到时才生成。
+
+        未给出 product_hashes 时为新目录的每个产品计算内容哈希，与当前存储保存的哈希比较得到
+        变化的产品，不从紧凑目录还原旧产品。原存储不被修改，正在使用它的页面与接口请求不受影响。
+        """
+        if product_hashes is None:
+            product_hashes = hash_products(processes)
+
+        diff = CatalogDiff(self.product_hashes, product_hashes)
+        if diff.is_empty:
+            return self
+        changed = [key for key, value in product_hashes.items() if self.product_hashes.get(key) != value]
+
+        store = ProcessStore.__new__(ProcessStore)
+        store.lineage = self.lineage
+        store.product_hashes = product_hashes
+        store.version = catalog_hash(product_hashes)
+        store.diff = diff
+        with span("更新紧凑目录"):
+            store.catalog = self.catalog.updated(processes, changed)
+        store._index_catalog()
+
+        with span("更新事实表", changed=len(changed), removed=len(diff.removed)):
+            store.facts = FactTables.updated(self.facts, processes, changed, diff.removed)
+        with span("更新检索索引"):
+            store.search_index = self.search_index.updated(processes, store.facts, changed, diff.removed)
+        with span("更新相似度索引"):
+            store.similarity = self.similarity.updated(store.facts, changed, diff.removed)
+        return store
+
+    def product_hash(self, main_category, product):
+        """产品内容哈希，产品不存在时为 None"""
+        return self.product_hashes.get((main_category, product))
+
+    @property
+    def cache_key(self):
+        """依赖整个目录的结果的缓存键：(谱系编号, 目录版本)"""
+        return self.lineage, self.version
+
+    def product_cache_key(self, main_category, product):
+        """单个产品结果的缓存键：(谱系编号, 产品内容哈希)，同一谱系内目录更新后未变化的产品沿用"""
+        return self.lineage, self.product_hash(main_category, product)
+
+    def get_main_categories(self):
+        return self.categories
+
+    def get_products(self, main_category):
+        return self.products_by_category.get(main_category, ())
+
+    def get_product_info(self, main_category, product):
+        """产品信息字典，由紧凑目录还原，调用方修改它不影响存储"""
+        return self.catalog.get((main_category, product), {})
+
+    @staticmethod
+    def _locations(table, column, name):
+        """事实表中 column 取值为 name 的行 → [(分类, 产品, 步骤下标), ...]，按分类编码比较"""
+        values = table[column].array
+        code = values.categories.get_indexer([name])[0]
+        if code < 0:
+            return []
+        rows = table.iloc[np.flatnonzero(values.codes == code)]
+        return list(zip(rows["分类"].astype(str), rows["产品"].astype(str), (rows["步骤序号"] - 1).tolist()))
+
+    def find_by_step(self, step_name):
+        return self._locations(self.facts.steps, "步骤名称", step_name)
+
+    def find_by_parameter(self, param_name):
+        return self._locations(self.facts.parameters, "参数名称", param_name)
+
+    def find_by_equipment(self, equip_name):
+        return self._locations(self.facts.equipment, "设备名称", equip_name)
+
+
+# 存储谱系编号
+_lineages = itertools.count(1)
+
+
+def catalog_path():
+    return Path(os.environ.get(CATALOG_ENV_VAR, DEFAULT_CATALOG_PATH))
+
+
+def _catalog_source():
+    """
+    当前目录来源及其签名。设置了 PHARMA_PROCESS_SITE 时从版本库检出该站点的最新版本，
+    签名为站点 HEAD 文件状态；否则读取目录文件，签名为文件的修改时间与大小。
+    """
+    site = os.environ.get(SITE_ENV_VAR)
+    if site:
+        repository = get_repository()
+        return ("site", str(repository.root), site), repository.head_signature(site)
+    path = catalog_path()
+    stat = path.stat()
+    return ("file", str(path)), (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_source(source):
+    """返回 (工艺目录, 产品哈希)；目录文件没有现成的哈希，返回 None 由存储按需计算"""
+    if source[0] == "site":
+        return get_repository().checkout(source[2])
+    return load_catalog(source[1]), None
+
+
+# 来源 → (签名, 存储)
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    """
+    进程级共享的工艺目录实例。来源内容变化（文件被修改、站点提交了新版本）时重新加载，
+    并以该来源上一次的存储为基础只重建变化的产品。
+    """
+    source, signature = _catalog_source()
+    entry = _stores.get(source)
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+    with _stores_lock:
+        entry = _stores.get(source)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with span("加载工艺目录", source=":".join(source[1:])):
+            processes, product_hashes = _read_source(source)
+            if entry is None:
+                store = ProcessStore(processes, product_hashes)
+            else:
+                store = entry[1].updated(processes, product_hashes)
+        _stores[source] = (signature, store)
+        return store
+
+
+def clear_stores():
+    """丢弃已加载的存储，下次 get_store() 完整重建"""
+    with _stores_lock:
+        _stores.clear()
+
+
+class PharmaceuticalProcesses:
+    """制药工艺数据库 - 页面使用的目录访问接口，数据由 get_store() 加载的共享存储提供"""
+    
+    @staticmethod
+    def get_main_categories():
+        return get_store().get_main_categories()
+    
+    @staticmethod
+    def get_products(main_category):
+        return get_store().get_products(main_category)
+    
+    @staticmethod
+    def get_product_info(main_category, product):
+        return get_store().get_product_info(main_category, product)
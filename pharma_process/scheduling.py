@@ -0,0 +1,358 @@
+"""
+多产品排产 - 按需求批次在共享设备上生成可行排程，目标为总工期最短或换产次数最少。
+
+    python -m pharma_process.scheduling --demand 片剂=30 --demand 颗粒剂=20 --demand 中药颗粒剂=10
+    python -m pharma_process.scheduling --demand 片剂=30 --demand 颗粒剂=20 --objective changeovers --output schedule.csv
+
+排程由批次顺序解码得到：按顺序依次安排每个批次，批次内步骤按依赖的拓扑顺序，
+每个步骤在前置步骤完成且所需设备全部可用时尽早开始；设备由一个产品切换到另一个产品时
+需先完成换产清洁。初始顺序取两种贪心排列（按产品成组的生产战役、各产品轮流）中较好者，
+再在顺序上做局部搜索（交换两个批次、整段移动一组批次），接受不劣于当前的解。
+步骤时长与设备取自配方（simulation.ProductRecipe），与产能仿真一致。
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from .simulation import parse_assignments, plan_equipment, recipes_for, resolve_product
+
+# 同一设备在不同产品之间切换的换产清洁时间（小时）
+DEFAULT_CHANGEOVER_HOURS = 4.0
+# 局部搜索的迭代上限与时间上限（秒），先到者为准
+DEFAULT_ITERATIONS = 3000
+DEFAULT_TIME_LIMIT = 3.0
+# 整段移动的最大批次数
+MAX_BLOCK_LENGTH = 8
+# 局部搜索每隔多少个批次保存一次解码状态
+CHECKPOINT_INTERVAL = 8
+DEFAULT_SEED = 20240601
+
+OBJECTIVES = {"makespan": "总工期最短", "changeovers": "换产次数最少"}
+
+# Schedule 各表的列
+TASK_COLUMNS = ["分类", "产品", "批次", "步骤", "设备", "开始(h)", "结束(h)"]
+EQUIPMENT_TASK_COLUMNS = ["设备", "设备名称", "分类", "产品", "批次", "步骤", "开始(h)", "结束(h)", "类型"]
+EQUIPMENT_COLUMNS = ["设备名称", "台数", "生产时间(h)", "换产次数", "换产时间(h)", "利用率"]
+
+
+class Schedule:
+    """
+    一个排程：
+    - order: 批次顺序，元素为 (分类, 产品)
+    - makespan: 总工期（小时）；changeovers: 换产次数
+    - tasks: 每个步骤一行，批次、步骤、占用设备与开始/结束时间
+    - equipment_tasks: 每台设备上的每个占用一行（含换产），供甘特图使用
+    - equipment: 每台设备一行，生产时间、换产次数/时间与利用率
+    """
+
+    def __init__(self, order, makespan, changeovers, tasks, equipment_tasks, equipment):
+        self.order = order
+        self.makespan = makespan
+        self.changeovers = changeovers
+        self.tasks = tasks
+        self.equipment_tasks = equipment_tasks
+        self.equipment = equipment
+
+    def campaigns(self):
+        """批次顺序中连续同一产品的生产战役：序号、分类、产品、批次数"""
+        rows = []
+        for key in self.order:
+            if rows and rows[-1]["key"] == key:
+                rows[-1]["批次数"] += 1
+            else:
+                rows.append({"key": key, "批次数": 1})
+        return pd.DataFrame({
+            "序号": range(1, len(rows) + 1),
+            "分类": [row["key"][0] for row in rows],
+            "产品": [row["key"][1] for row in rows],
+            "批次数": [row["批次数"] for row in rows],
+        })
+
+
+class CampaignScheduler:
+    """
+    共享设备上的多产品排产。
+
+    recipes 为 simulation.recipes_for() 的结果，demand 为 {(分类, 产品): 批次数}，
+    equipment_units 为 {设备名称: 台数}（未列出的设备按 1 台）。
+    """
+
+    def __init__(self, recipes, demand, equipment_units=None, changeover_hours=DEFAULT_CHANGEOVER_HOURS):
+        self.demand = {key: int(batches) for key, batches in demand.items() if int(batches) > 0}
+        self.products = list(self.demand)
+        self.changeover_hours = float(changeover_hours)
+        equipment_units = equipment_units or {}
+        self.equipment_names = plan_equipment(recipes, self.demand)
+        self.units = [int(equipment_units.get(name, 1)) for name in self.equipment_names]
+        for name, units in zip(self.equipment_names, self.units):
+            if units < 1:
+                raise ValueError(f"设备台数必须至少为 1: {name}")
+
+        # 每台设备单元一个槽位；解码用的紧凑配方为按拓扑顺序排列的
+        # (步骤, 前置步骤, 时长, 每种所需设备可选的槽位)
+        self._slot_items = [item for item, units in enumerate(self.units) for _ in range(units)]
+        self._slot_units = [unit for units in self.units for unit in range(units)]
+        item_slots = {}
+        for slot, item in enumerate(self._slot_items):
+            item_slots.setdefault(item, []).append(slot)
+        positions = {name: i for i, name in enumerate(self.equipment_names)}
+        self._steps = []
+        for key in self.products:
+            recipe = recipes[key]
+            self._steps.append([
+                (step, tuple(recipe.predecessors[step]), float(recipe.durations[step]),
+                 tuple(tuple(item_slots[positions[name]]) for name in recipe.equipment[step]))
+                for step in recipe.order
+            ])
+        self._step_counts = [len(recipe.names) for recipe in (recipes[key] for key in self.products)]
+        self._names = [recipes[key].names for key in self.products]
+        # 各产品占用设备的总时长，用于贪心排列
+        self._load = [sum(duration * len(groups) for _, _, duration, groups in steps) for steps in self._steps]
+
+    def _decode(self, order, start=0, state=None, checkpoints=None, records=None):
+        """
+        按批次顺序解码排程，order 为产品下标序列，返回 (总工期, 换产次数)。
+
+        从位置 start 的解码状态 state 继续（默认从空闲设备开始）。checkpoints 不为 None 时每
+        CHECKPOINT_INTERVAL 个批次把状态追加到其中，只改动了顺序后半段的候选解可从检查点继续；
+        records 不为 None 时追加每个步骤占用设备的记录。
+        """
+        free, last, makespan, changeovers = state or ([0.0] * len(self._slot_items), [-1] * len(self._slot_items), 0.0, 0)
+        free, last = list(free), list(last)
+        changeover_hours = self.changeover_hours
+        for position in range(start, len(order)):
+            if checkpoints is not None and position % CHECKPOINT_INTERVAL == 0:
+                checkpoints.append((tuple(free), tuple(last), makespan, changeovers))
+            product = order[position]
+            finish = [0.0] * self._step_counts[product]
+            for step, preds, duration, groups in self._steps[product]:
+                begin = 0.0
+                for pred in preds:
+                    if finish[pred] > begin:
+                        begin = finish[pred]
+                chosen = []
+                for slots in groups:
+                    # 多台同名设备取最早可用（含换产）的一台
+                    best_slot, best_time = -1, 0.0
+                    for slot in slots:
+                        available = free[slot]
+                        if last[slot] != product and last[slot] >= 0:
+                            available += changeover_hours
+                        if best_slot < 0 or available < best_time:
+                            best_slot, best_time = slot, available
+                    chosen.append(best_slot)
+                    if best_time > begin:
+                        begin = best_time
+                end = begin + duration
+                finish[step] = end
+                if end > makespan:
+                    makespan = end
+                for slot in chosen:
+                    switched = last[slot] != product and last[slot] >= 0
+                    if switched:
+                        changeovers += 1
+                    if records is not None:
+                        records.append((position, product, step, slot, begin, end, switched, free[slot]))
+                    free[slot] = end
+                    last[slot] = product
+                if records is not None and not chosen:
+                    records.append((position, product, step, -1, begin, end, False, begin))
+        return makespan, changeovers
+
+    def _objective(self, value, objective):
+        makespan, changeovers = value
+        return (makespan, changeovers) if objective == "makespan" else (changeovers, makespan)
+
+    def greedy_orders(self):
+        """初始顺序：按产品成组（设备负荷大的产品在前）与各产品按批次比例轮流排列"""
+        ranked = sorted(range(len(self.products)), key=lambda product: -self._load[product])
+        grouped = [product for product in ranked for _ in range(self.demand[self.products[product]])]
+
+        # 轮流排列：每次选已排比例最低的产品，批次均匀交错
+        counts = [self.demand[key] for key in self.products]
+        placed = [0] * len(self.products)
+        interleaved = []
+        for _ in range(sum(counts)):
+            product = min((p for p in ranked if placed[p] < counts[p]), key=lambda p: (placed[p] + 1) / counts[p])
+            placed[product] += 1
+            interleaved.append(product)
+        return {"成组": grouped, "轮流": interleaved}
+
+    def _neighbour(self, order, rng):
+        """随机邻域解：交换两个批次或整段移动一组批次，返回 (新顺序, 第一个改动的位置)"""
+        n = len(order)
+        candidate = list(order)
+        if rng.random() < 0.5:
+            i, j = rng.randrange(n), rng.randrange(n)
+            candidate[i], candidate[j] = candidate[j], candidate[i]
+        else:
+            length = rng.randint(1, min(MAX_BLOCK_LENGTH, n))
+            i = rng.randrange(n - length + 1)
+            block = candidate[i:i + length]
+            del candidate[i:i + length]
+            j = rng.randrange(len(candidate) + 1)
+            candidate[j:j] = block
+        return candidate, min(i, j)
+
+    def solve(self, objective="makespan", iterations=DEFAULT_ITERATIONS, time_limit=DEFAULT_TIME_LIMIT,
+              seed=DEFAULT_SEED):
+        """
+        贪心初始解加局部搜索，返回 Schedule。
+
+        greedy_values 记录各贪心排列的 (总工期, 换产次数)，history 记录每次改进的
+        (迭代, 总工期, 换产次数)，iterations 为实际完成的迭代次数。
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"未知优化目标: {objective}")
+        greedy = {name: (order, self._decode(order)) for name, order in self.greedy_orders().items()}
+        best_order, best_value = min(greedy.values(), key=lambda item: self._objective(item[1], objective))
+        self.greedy_values = {name: value for name, (_, value) in greedy.items()}
+        self.history = [(0, *best_value)]
+        self.iterations = 0
+        if len(set(best_order)) < 2:
+            return self.schedule(best_order)
+
+        current_order, current_value = best_order, best_value
+        checkpoints = []
+        self._decode(current_order, checkpoints=checkpoints)
+        rng = random.Random(seed)
+        deadline = time.perf_counter() + time_limit
+        for iteration in range(1, iterations + 1):
+            if time.perf_counter() > deadline:
+                break
+            candidate, first = self._neighbour(current_order, rng)
+            index = first // CHECKPOINT_INTERVAL
+            candidate_checkpoints = checkpoints[:index]
+            value = self._decode(candidate, index * CHECKPOINT_INTERVAL, checkpoints[index], candidate_checkpoints)
+            self.iterations = iteration
+            if self._objective(value, objective) <= self._objective(current_value, objective):
+                current_order, current_value, checkpoints = candidate, value, candidate_checkpoints
+                if self._objective(value, objective) < self._objective(best_value, objective):
+                    best_order, best_value = candidate, value
+                    self.history.append((iteration, *value))
+        return self.schedule(best_order)
+
+    def schedule(self, order):
+        """把产品下标顺序解码为 Schedule；需求为空或只含没有步骤的产品时各表为空"""
+        records = []
+        makespan, changeovers = self._decode(order, records=records)
+        if not records:
+            equipment = pd.DataFrame({
+                "设备名称": self.equipment_names, "台数": self.units,
+                "生产时间(h)": 0.0, "换产次数": 0, "换产时间(h)": 0.0, "利用率": 0.0,
+            }, columns=EQUIPMENT_COLUMNS)
+            return Schedule([self.products[product] for product in order], makespan, changeovers,
+                            pd.DataFrame(columns=TASK_COLUMNS), pd.DataFrame(columns=EQUIPMENT_TASK_COLUMNS), equipment)
+        tasks = pd.DataFrame(records, columns=["position", "product", "step", "slot", "开始(h)", "结束(h)", "换产",
+                                               "设备可用(h)"])
+        keys = [self.products[product] for product in tasks["product"]]
+        tasks.insert(0, "分类", [key[0] for key in keys])
+        tasks.insert(1, "产品", [key[1] for key in keys])
+        # 批次按在顺序中出现的先后对每个产品编号
+        batch_numbers = tasks.drop_duplicates("position").groupby("product").cumcount() + 1
+        tasks["批次"] = tasks["产品"] + "#" + tasks["position"].map(
+            pd.Series(batch_numbers.to_numpy(), index=tasks["position"].unique())
+        ).astype(str)
+        tasks["步骤"] = [self._names[product][step] for product, step in zip(tasks["product"], tasks["step"])]
+        tasks["item"] = [self._slot_items[slot] if slot >= 0 else -1 for slot in tasks["slot"]]
+        tasks["设备名称"] = ["" if item < 0 else self.equipment_names[item] for item in tasks["item"]]
+        tasks["设备"] = [
+            name if item < 0 or self.units[item] == 1 else f"{name}-{self._slot_units[slot] + 1}"
+            for name, item, slot in zip(tasks["设备名称"], tasks["item"], tasks["slot"])
+        ]
+
+        occupied = tasks[tasks["item"] >= 0]
+        production = occupied[EQUIPMENT_TASK_COLUMNS[:-1]].assign(类型="生产")
+        switches = occupied[occupied["换产"]]
+        changeover_rows = pd.DataFrame({
+            "设备": switches["设备"],
+            "设备名称": switches["设备名称"],
+            "分类": switches["分类"],
+            "产品": switches["产品"],
+            "批次": switches["批次"],
+            "步骤": "换产清洁",
+            "开始(h)": switches["设备可用(h)"],
+            "结束(h)": switches["设备可用(h)"] + self.changeover_hours,
+            "类型": "换产",
+        })
+        equipment_tasks = pd.concat([production, changeover_rows], ignore_index=True).sort_values(
+            ["设备", "开始(h)"], kind="stable"
+        ).reset_index(drop=True)
+
+        # 同一步骤占用多台设备时在步骤表中合并为一行
+        step_tasks = tasks.groupby(["position", "step"], sort=False).agg(
+            分类=("分类", "first"), 产品=("产品", "first"), 批次=("批次", "first"), 步骤=("步骤", "first"),
+            设备=("设备", lambda values: "、".join(value for value in values if value)),
+            开始=("开始(h)", "first"), 结束=("结束(h)", "first"),
+        ).reset_index()
+        step_tasks = step_tasks.rename(columns={"开始": "开始(h)", "结束": "结束(h)"})[TASK_COLUMNS]
+
+        span = makespan if makespan > 0 else 1.0
+        production_time = production.groupby("设备名称")["结束(h)"].sum() - production.groupby("设备名称")["开始(h)"].sum()
+        switch_counts = switches.groupby("设备名称").size()
+        equipment = pd.DataFrame({
+            "设备名称": self.equipment_names,
+            "台数": self.units,
+            "生产时间(h)": production_time.reindex(self.equipment_names, fill_value=0.0).to_numpy(),
+            "换产次数": switch_counts.reindex(self.equipment_names, fill_value=0).to_numpy(),
+        })
+        equipment["换产时间(h)"] = equipment["换产次数"] * self.changeover_hours
+        equipment["利用率"] = equipment["生产时间(h)"] / (equipment["台数"] * span)
+        equipment = equipment.sort_values("利用率", ascending=False, kind="stable").reset_index(drop=True)
+
+        return Schedule([self.products[product] for product in order], makespan, changeovers,
+                        step_tasks, equipment_tasks, equipment)
+
+
+def schedule_demand(demand, equipment_units=None, objective="makespan", changeover_hours=DEFAULT_CHANGEOVER_HOURS,
+                    iterations=DEFAULT_ITERATIONS, time_limit=DEFAULT_TIME_LIMIT, seed=DEFAULT_SEED, store=None):
+    """由需求 {(分类, 产品): 批次数} 直接求解排程，返回 (Schedule, CampaignScheduler)"""
+    scheduler = CampaignScheduler(recipes_for(demand, store), demand, equipment_units, changeover_hours)
+    return scheduler.solve(objective, iterations, time_limit, seed), scheduler
+
+
+def main(argv=None):
+    from .process_store import get_store
+
+    parser = argparse.ArgumentParser(description="共享设备上的多产品排产")
+    parser.add_argument("--demand", "-d", action="append", required=True, help="产品=批次数，产品可写作 分类/产品，可重复指定")
+    parser.add_argument("--equipment", "-e", action="append", help="设备名称=台数（默认每种设备 1 台），可重复指定")
+    parser.add_argument("--objective", choices=list(OBJECTIVES), default="makespan")
+    parser.add_argument("--changeover", type=float, default=DEFAULT_CHANGEOVER_HOURS, help="换产清洁时间（小时）")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="局部搜索迭代上限")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="局部搜索时间上限（秒）")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", "-o", help="把步骤排程写入 CSV 文件")
+    args = parser.parse_args(argv)
+
+    store = get_store()
+    try:
+        demand = {resolve_product(store, name): batches for name, batches in parse_assignments(args.demand, "--demand").items()}
+        units = {store.facts.equipment_canonicalizer.canonical(name): count
+                 for name, count in parse_assignments(args.equipment, "--equipment").items()}
+    except (KeyError, argparse.ArgumentTypeError) as exc:
+        parser.error(exc.args[0])
+
+    started = time.perf_counter()
+    result, scheduler = schedule_demand(demand, units, args.objective, args.changeover, args.iterations,
+                                        args.time_limit, args.seed, store)
+    elapsed = time.perf_counter() - started
+
+    for name, (makespan, changeovers) in scheduler.greedy_values.items():
+        print(f"贪心（{name}）：总工期 {makespan:.1f} h，换产 {changeovers} 次")
+    print(f"局部搜索 {scheduler.iterations} 次迭代（{elapsed:.2f} s）：总工期 {result.makespan:.1f} h，"
+          f"换产 {result.changeovers} 次")
+    pd.set_option("display.width", 200)
+    print(result.campaigns().to_string(index=False))
+    print()
+    print(result.equipment.round(3).to_string(index=False))
+    if args.output:
+        result.tasks.to_csv(args.output, index=False, encoding="utf-8-sig")
+        print(f"步骤排程已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
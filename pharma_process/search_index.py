@@ -0,0 +1,286 @@
+"""全文检索与分面过滤 - 基于字符 n-gram 倒排索引检索产品、步骤、参数与设备"""
+
+import re
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# 文本按连续的中文/字母数字片段切分，片段内取字符二元组
+_RUN_PATTERN = re.compile(r"[0-9a-z\u4e00-\u9fff]+")
+
+FACETS = ("分类", "设备类型", "参数类型")
+
+
+def query_grams(text):
+    """查询词的 n-gram：片段长度 ≥ 2 取二元组，单字片段取单字"""
+    grams = set()
+    for run in _RUN_PATTERN.findall(text.lower()):
+        if len(run) == 1:
+            grams.add(run)
+        else:
+            grams.update(run[i:i + 2] for i in range(len(run) - 1))
+    return grams
+
+
+def index_grams(text):
+    """索引用 n-gram：单字与二元组都收录，以支持单字查询"""
+    grams = set()
+    for run in _RUN_PATTERN.findall(text.lower()):
+        grams.update(run)
+        grams.update(run[i:i + 2] for i in range(len(run) - 1))
+    return grams
+
+
+class _VocabularyIndex:
+    """
+    对一个字段的不同取值（词表）建立 n-gram 倒排索引。
+
+    目录中参数、设备名称大量重复，只对不同取值建索引，命中后再经 postings
+    映射到步骤行号，索引规模与词表大小而非步骤数成正比。词表只追加不删除，
+    词条下标在目录增量更新前后保持不变。
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = []
+        self._lower = []
+        self.grams = {}
+        self._add_terms(vocabulary)
+
+    def _add_terms(self, terms):
+        start = len(self.vocabulary)
+        terms = [str(term) for term in terms]
+        self.vocabulary.extend(terms)
+        self._lower.extend(term.lower() for term in terms)
+        grams = defaultdict(list)
+        for term_id, term in enumerate(self._lower[start:], start):
+            for gram in index_grams(term):
+                grams[gram].append(term_id)
+        for gram, ids in grams.items():
+            ids = np.array(ids, dtype=np.int32)
+            existing = self.grams.get(gram)
+            self.grams[gram] = ids if existing is None else np.concatenate([existing, ids])
+
+    def extended(self, terms):
+        """追加词条后的新索引；原索引不受影响（未变化的 n-gram 下标数组共享）"""
+        index = _VocabularyIndex.__new__(_VocabularyIndex)
+        index.vocabulary = list(self.vocabulary)
+        index._lower = list(self._lower)
+        index.grams = dict(self.grams)
+        index._add_terms(terms)
+        return index
+
+    def match_terms(self, word):
+        """
+        包含 word（不区分大小写）的词表下标。
+
+        word 只由 n-gram 字符集之外的符号组成（如 "℃"、"±"）时没有可用的 n-gram，退回逐词条子串扫描。
+        """
+        word_lower = word.lower()
+        grams = query_grams(word)
+        if not grams:
+            return np.array([i for i, term in enumerate(self._lower) if word_lower in term], dtype=np.int32)
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self.grams.get(g, ()))):
+            ids = self.grams.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+            if not len(candidates):
+                return candidates
+        return np.array([i for i in candidates if word_lower in self._lower[i]], dtype=np.int32)
+
+
+class _Postings:
+    """词条 → 行号 的 CSR 结构：rows[indptr[t]:indptr[t + 1]] 为词条 t 出现的行号（去重、有序）"""
+
+    def __init__(self, term_ids, rows, size):
+        order = np.lexsort((rows, term_ids))
+        term_ids = term_ids[order]
+        rows = rows[order]
+        if len(rows):
+            first = np.ones(len(rows), dtype=bool)
+            first[1:] = (term_ids[1:] != term_ids[:-1]) | (rows[1:] != rows[:-1])
+            term_ids, rows = term_ids[first], rows[first]
+        self.rows = rows.astype(np.int32)
+        self.indptr = np.searchsorted(term_ids, np.arange(size + 1))
+
+    def rows_for(self, terms):
+        if not len(terms):
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate([self.rows[self.indptr[t]:self.indptr[t + 1]] for t in terms])
+
+
+class _ColumnField:
+    """步骤级字段：词表为事实表分类列的取值，postings 指向步骤行号"""
+
+    def __init__(self, vocabulary, lookup, postings):
+        self.vocabulary = vocabulary
+        self._lookup = lookup
+        self.postings = postings
+
+    @classmethod
+    def build(cls, column, rows, previous=None):
+        """
+        由分类列及各行对应的步骤行号构建字段。
+
+        给出 previous 时沿用其词表，只为新出现的取值追加词条；postings 按当前事实表重建。
+        """
+        categories = column.cat.categories.astype(str)
+        if previous is None:
+            vocabulary = _VocabularyIndex(categories)
+            lookup = pd.Index(vocabulary.vocabulary)
+        else:
+            vocabulary, lookup = previous.vocabulary, previous._lookup
+            new_terms = categories[lookup.get_indexer(categories) < 0]
+            if len(new_terms):
+                vocabulary = vocabulary.extended(new_terms)
+                lookup = lookup.append(new_terms)
+        term_of_code = lookup.get_indexer(categories)
+        codes = column.cat.codes.to_numpy()
+        postings = _Postings(term_of_code[codes], rows, len(vocabulary.vocabulary))
+        return cls(vocabulary, lookup, postings)
+
+    def match_rows(self, word):
+        return self.postings.rows_for(self.vocabulary.match_terms(word))
+
+
+def _product_text(processes, key):
+    info = processes[key[0]][key[1]]
+    return " ".join([key[1], key[0], info.get("description", ""), *info.get("关键特征", [])])
+
+
+class _ProductField:
+    """
+    产品级字段：每个产品一个文档，命中后按当前事实表展开为该产品的步骤行号范围。
+
+    增量更新时删除或修改的产品文档只标记失效（docs 中置为 None），修改后的文本作为新文档追加。
+    """
+
+    def __init__(self, vocabulary, docs, facts):
+        self.vocabulary = vocabulary
+        self.docs = docs
+        self.doc_ids = {key: doc for doc, key in enumerate(docs) if key is not None}
+        self.facts = facts
+
+    @classmethod
+    def build(cls, processes, facts):
+        keys = list(facts.step_slices)
+        return cls(_VocabularyIndex([_product_text(processes, key) for key in keys]), keys, facts)
+
+    def updated(self, processes, facts, changed, removed):
+        docs = list(self.docs)
+        for key in (*changed, *removed):
+            doc = self.doc_ids.get(key)
+            if doc is not None:
+                docs[doc] = None
+        docs.extend(changed)
+        vocabulary = self.vocabulary.extended([_product_text(processes, key) for key in changed])
+        return _ProductField(vocabulary, docs, facts)
+
+    def match_rows(self, word):
+        slices = self.facts.step_slices
+        parts = [slices[self.docs[doc]] for doc in self.vocabulary.match_terms(word) if self.docs[doc] is not None]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate([np.arange(part.start, part.stop, dtype=np.int32) for part in parts])
+
+
+class SearchIndex:
+    """
+    工艺目录全文检索。
+
+    - 步骤级字段（步骤名称、关键参数、设备）命中对应步骤；
+    - 产品级字段（产品名称、分类、描述、关键特征）命中该产品的全部步骤；
+    多个关键词之间为“且”关系，结果可按分类、设备类型、参数类型分面过滤。
+    """
+
+    def __init__(self, processes, facts):
+        self.facts = facts
+        self.num_steps = len(facts.steps)
+        self.fields = self._column_fields(facts)
+        self.fields["产品"] = _ProductField.build(processes, facts)
+        self.facets = self._build_facets(facts)
+
+    @staticmethod
+    def _column_fields(facts, previous=None):
+        all_rows = np.arange(len(facts.steps), dtype=np.int32)
+        sources = (
+            ("步骤名称", facts.steps["步骤名称"], all_rows),
+            ("参数名称", facts.parameters["参数名称"], facts.parameters["步骤行号"].to_numpy()),
+            ("设备名称", facts.equipment["设备名称"], facts.equipment["步骤行号"].to_numpy()),
+        )
+        return {
+            field: _ColumnField.build(column, rows, previous.fields[field] if previous else None)
+            for field, column, rows in sources
+        }
+
+    def _build_facets(self, facts):
+        """分面：每个取值对应一个长度为步骤数的布尔掩码"""
+        facets = {facet: {} for facet in FACETS}
+        category_codes = facts.steps["分类"].cat.codes.to_numpy()
+        for code, category in enumerate(facts.steps["分类"].cat.categories):
+            facets["分类"][category] = category_codes == code
+        for facet, table in (("设备类型", facts.equipment), ("参数类型", facts.parameters)):
+            for value, rows in table.groupby(facet, observed=True)["步骤行号"]:
+                mask = np.zeros(self.num_steps, dtype=bool)
+                mask[rows.to_numpy()] = True
+                facets[facet][value] = mask
+        return facets
+
+    def updated(self, processes, facts, changed, removed):
+        """
+        目录增量更新后的检索索引：沿用原有词表与 n-gram 索引，只为新出现的取值
+        和变化产品的文本建索引；postings 与分面按新的事实表重建。
+        """
+        index = SearchIndex.__new__(SearchIndex)
+        index.facts = facts
+        index.num_steps = len(facts.steps)
+        index.fields = self._column_fields(facts, self)
+        index.fields["产品"] = self.fields["产品"].updated(processes, facts, changed, removed)
+        index.facets = index._build_facets(facts)
+        return index
+
+    def facet_values(self, facet):
+        return list(self.facets[facet])
+
+    def search(self, query, filters=None):
+        """
+        返回命中的步骤行号（有序）。
+
+        query 以空白分隔多个关键词；filters 为 {分面: [取值, ...]}，
+        同一分面内多个取值为“或”，不同分面之间为“且”。
+        """
+        words = query.split()
+        if words:
+            rows = None
+            for word in words:
+                hits = np.unique(np.concatenate([field.match_rows(word) for field in self.fields.values()]))
+                rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+                if not len(rows):
+                    break
+        else:
+            rows = np.arange(self.num_steps, dtype=np.int32)
+
+        for facet, values in (filters or {}).items():
+            if not values:
+                continue
+            mask = np.zeros(self.num_steps, dtype=bool)
+            for value in values:
+                mask |= self.facets[facet].get(value, False)
+            rows = rows[mask[rows]]
+        return rows
+
+    def matched_steps(self, rows):
+        return self.facts.steps.iloc[rows]
+
+    def matched_products(self, rows):
+        """命中步骤按产品汇总：每个产品的命中步骤数"""
+        matched = self.facts.steps.iloc[rows]
+        counts = matched.groupby(["分类", "产品"], observed=True, sort=False).size()
+        return counts.rename("命中步骤数").reset_index()
+
+    def facet_counts(self, rows, facet):
+        """命中步骤在某分面各取值上的数量"""
+        return pd.Series({value: int(mask[rows].sum()) for value, mask in self.facets[facet].items()},
+                         name=facet).loc[lambda counts: counts > 0].sort_values(ascending=False)
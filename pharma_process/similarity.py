@@ -0,0 +1,222 @@
+"""产品工艺相似度 - 以步骤、参数、设备构成的稀疏特征向量计算余弦/Jaccard 相似度"""
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# 产品数超过该阈值时，最相似产品查询先经 MinHash LSH 召回候选再精确计算
+LSH_PRODUCT_THRESHOLD = 2000
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# 2^31 - 1：系数与特征编码都小于该值，乘积不会超出 uint64
+_MERSENNE_PRIME = (1 << 31) - 1
+# LSH 段键的混合乘数（64 位黄金比例常数）
+_BAND_KEY_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _minhash_signatures(matrix):
+    """
+    0/1 稀疏矩阵各行的 MinHash 签名。
+
+    使用 (a·x + b) mod p 形式的哈希族，每个哈希函数对全部非零元一次计算，
+    再按 CSR 行分段取最小值。
+    """
+    rng = np.random.default_rng(20240601)
+    a = rng.integers(1, _MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+    features = matrix.indices.astype(np.uint64)
+    prime = np.uint64(_MERSENNE_PRIME)
+
+    signatures = np.full((matrix.shape[0], MINHASH_PERMUTATIONS), _MERSENNE_PRIME, dtype=np.uint64)
+    indptr = matrix.indptr
+    non_empty = np.flatnonzero(np.diff(indptr) > 0)
+    if len(non_empty):
+        for i in range(MINHASH_PERMUTATIONS):
+            hashed = (features * a[i] + b[i]) % prime
+            signatures[non_empty, i] = np.minimum.reduceat(hashed, indptr[non_empty])
+    return signatures
+
+
+def _band_keys(signatures, band):
+    """各行签名第 band 段的段键：段内各值按乘加混合为一个 uint64（溢出按模 2^64 回绕）"""
+    rows_per_band = MINHASH_PERMUTATIONS // LSH_BANDS
+    keys = np.zeros(len(signatures), dtype=np.uint64)
+    for column in range(band * rows_per_band, (band + 1) * rows_per_band):
+        keys = keys * _BAND_KEY_MULTIPLIER + signatures[:, column]
+    return keys
+
+
+class SimilarityIndex:
+    """
+    产品 × 特征 的 0/1 稀疏矩阵。
+
+    特征为 步骤:名称、参数:名称、设备:名称 三类，取自事实表的分类编码（参数与设备取规范名称）；
+    相似度矩阵由一次稀疏矩阵乘法得到，不做逐对循环。
+    """
+
+    FIELDS = (("步骤", "steps", "步骤名称"), ("参数", "parameters", "标准参数名称"), ("设备", "equipment", "标准设备名称"))
+    SLICES = {"steps": "step_slices", "parameters": "parameter_slices", "equipment": "equipment_slices"}
+
+    def __init__(self, facts):
+        self.keys = list(facts.step_slices)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.feature_names = []
+        self._feature_lookup = pd.Index([], dtype=object)
+        self._set_matrix(self._feature_matrix(facts, self.keys))
+
+    def _set_matrix(self, matrix):
+        self.matrix = matrix
+        self.feature_counts = np.asarray(matrix.sum(axis=1)).ravel()
+        norms = np.sqrt(self.feature_counts)
+        norms[norms == 0] = 1.0
+        self.normalized = sparse.diags(1.0 / norms) @ matrix
+
+    def _feature_columns(self, prefix, categories, codes):
+        """
+        codes 中出现的分类编码 → 特征列号（未出现的编码为 -1）。特征列只追加不复用：
+        新出现的特征排在末尾，已有产品的矩阵行与 MinHash 签名在目录增量更新后仍然有效。
+        """
+        used = np.flatnonzero(np.bincount(codes, minlength=len(categories)))
+        names = pd.Index([f"{prefix}:{name}" for name in categories[used]], dtype=object)
+        found = self._feature_lookup.get_indexer(names)
+        new = found < 0
+        if new.any():
+            found[new] = np.arange(len(self.feature_names), len(self.feature_names) + int(new.sum()))
+            self.feature_names.extend(names[new])
+            self._feature_lookup = self._feature_lookup.append(names[new])
+        columns = np.full(len(categories), -1, dtype=np.int64)
+        columns[used] = found
+        return columns
+
+    def _feature_matrix(self, facts, keys):
+        """keys 中各产品的特征行（产品行在各事实表中连续存放，按行范围取各产品的行）"""
+        rows, cols = [], []
+        for prefix, table_name, column in self.FIELDS:
+            slices = getattr(facts, self.SLICES[table_name])
+            starts = np.fromiter((slices[key].start for key in keys), np.int64, len(keys))
+            lengths = np.fromiter((slices[key].stop for key in keys), np.int64, len(keys)) - starts
+            owners = np.repeat(np.arange(len(keys)), lengths)
+            table_rows = np.arange(len(owners)) + np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+
+            values = getattr(facts, table_name)[column]
+            codes = values.cat.codes.to_numpy()[table_rows]
+            rows.append(owners)
+            cols.append(self._feature_columns(prefix, values.cat.categories, codes)[codes])
+
+        matrix = sparse.csr_matrix(
+            (np.ones(sum(len(r) for r in rows), dtype=np.float32), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(keys), len(self.feature_names)),
+        )
+        # 同一产品内重复出现的特征只计一次
+        matrix.sum_duplicates()
+        matrix.data[:] = 1.0
+        return matrix
+
+    def updated(self, facts, changed, removed):
+        """
+        目录增量更新后的相似度索引：未变化产品的矩阵行原样保留，只为 changed（新增或修改）的产品
+        计算特征行；已计算的 MinHash 签名同样只补算变化的产品，LSH 分桶在需要时重新计算。
+        """
+        index = SimilarityIndex.__new__(SimilarityIndex)
+        index.keys = list(facts.step_slices)
+        index.positions = {key: i for i, key in enumerate(index.keys)}
+        index.feature_names = list(self.feature_names)
+        index._feature_lookup = self._feature_lookup
+        delta = index._feature_matrix(facts, changed)
+
+        delta_positions = {key: len(self.keys) + i for i, key in enumerate(changed)}
+        order = [delta_positions.get(key, self.positions.get(key)) for key in index.keys]
+        previous = sparse.csr_matrix(
+            (self.matrix.data, self.matrix.indices, self.matrix.indptr),
+            shape=(self.matrix.shape[0], len(index.feature_names)),
+        )
+        index._set_matrix(sparse.vstack([previous, delta], format="csr")[order])
+        if "minhash_signatures" in self.__dict__:
+            signatures = np.vstack([self.minhash_signatures, _minhash_signatures(delta)])
+            index.__dict__["minhash_signatures"] = signatures[order]
+        return index
+
+    def _similarity(self, left, right, metric):
+        """left、right 为产品序号数组，返回 len(left) × len(right) 的稠密相似度"""
+        if metric == "cosine":
+            return (self.normalized[left] @ self.normalized[right].T).toarray()
+        if metric == "jaccard":
+            intersection = (self.matrix[left] @ self.matrix[right].T).toarray()
+            union = self.feature_counts[left][:, None] + self.feature_counts[right][None, :] - intersection
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(union > 0, intersection / union, 0.0)
+        raise ValueError(f"未知的相似度度量: {metric}")
+
+    def similarity_matrix(self, keys, metric="cosine"):
+        """一组产品两两之间的相似度矩阵，行列以“分类 | 产品”标注"""
+        indices = np.array([self.positions[key] for key in keys], dtype=np.int64)
+        labels = [f"{category} | {product}" for category, product in keys]
+        return pd.DataFrame(self._similarity(indices, indices, metric), index=labels, columns=labels)
+
+    def most_similar(self, key, top_n=10, metric="cosine"):
+        """与指定产品最相似的 top_n 个产品（不含自身）"""
+        target = self.positions[key]
+        candidates = None
+        if len(self.keys) > LSH_PRODUCT_THRESHOLD:
+            candidates = self.lsh_candidates(key)
+            # LSH 召回不足时（目标产品与其他产品整体相似度较低）退回全量精确计算
+            if len(candidates) <= top_n:
+                candidates = None
+        if candidates is None:
+            candidates = np.arange(len(self.keys))
+        candidates = candidates[candidates != target]
+        if not len(candidates):
+            return pd.DataFrame(columns=["分类", "产品", "相似度", "共有特征数"])
+
+        scores = self._similarity(np.array([target]), candidates, metric)[0]
+        top = np.argsort(-scores, kind="stable")[:top_n]
+        chosen = candidates[top]
+        shared = (self.matrix[chosen] @ self.matrix[target].T).toarray().ravel()
+        return pd.DataFrame({
+            "分类": [self.keys[i][0] for i in chosen],
+            "产品": [self.keys[i][1] for i in chosen],
+            "相似度": scores[top],
+            "共有特征数": shared.astype(int),
+        })
+
+    def shared_features(self, left, right):
+        """两个产品共有的特征名称"""
+        a = self.matrix[self.positions[left]].indices
+        b = self.matrix[self.positions[right]].indices
+        return [self.feature_names[i] for i in np.intersect1d(a, b)]
+
+    @cached_property
+    def minhash_signatures(self):
+        """每个产品的 MinHash 签名（产品数 × MINHASH_PERMUTATIONS）"""
+        return _minhash_signatures(self.matrix)
+
+    @cached_property
+    def lsh_buckets(self):
+        """
+        LSH 分桶：签名切为 LSH_BANDS 段，任一段完全相同的产品进入同一桶。
+
+        每段为 ({段键: 桶号}, 按桶排列的产品序号, 各桶起始位置)，分桶只建一次，查询按目标产品
+        各段的段键直接取桶。段键由该段签名混合为一个 64 位整数，极少数不同段签名落入同一桶时
+        只多召回候选，最终相似度仍精确计算。
+        """
+        buckets = []
+        for band in range(LSH_BANDS):
+            keys = _band_keys(self.minhash_signatures, band)
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            lookup = dict(zip(sorted_keys[starts].tolist(), range(len(starts))))
+            buckets.append((lookup, order, np.r_[starts, len(keys)]))
+        return buckets
+
+    def lsh_candidates(self, key):
+        """与指定产品至少在一个 LSH 段同桶的产品序号（含自身，有序）"""
+        signature = self.minhash_signatures[self.positions[key]][None, :]
+        parts = []
+        for band, (lookup, order, indptr) in enumerate(self.lsh_buckets):
+            bucket = lookup[int(_band_keys(signature, band)[0])]
+            parts.append(order[indptr[bucket]:indptr[bucket + 1]])
+        return np.unique(np.concatenate(parts))
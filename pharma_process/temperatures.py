@@ -0,0 +1,97 @@
+"""工艺温度解析与区间索引 - 将 温度(℃) 文本解析为数值区间并支持区间查询"""
+
+import numpy as np
+import pandas as pd
+
+TEMPERATURE_KEY = "温度(℃)"
+
+# 非数值描述对应的温度区间
+NAMED_TEMPERATURES = {
+    "室温": (15.0, 25.0),
+    "常温": (10.0, 30.0),
+    "阴凉": (0.0, 20.0),
+    "冷处": (2.0, 10.0),
+}
+
+# 单值或范围，如 "121"、"4-8"、"-40~25"、"4~-196"、"-150以下"、"300以上"
+TEMPERATURE_PATTERN = (
+    r"^\s*(?P<low>-?\d+(?:\.\d+)?)\s*"
+    r"(?:[-~～—至到]\s*(?P<high>-?\d+(?:\.\d+)?)\s*)?"
+    r"(?P<bound>以下|以上)?\s*(?:℃)?\s*$"
+)
+
+
+def parse_temperatures(values):
+    """
+    向量化地将温度文本解析为 (温度下限(℃), 温度上限(℃))。
+
+    "以下"/"以上" 解析为半开区间（另一端为 ±inf），范围两端顺序不限；
+    "多种" 等无法解析的取值为 NaN。
+    """
+    raw = pd.Series(values, dtype="object").astype("string").str.strip()
+    parts = raw.str.extract(TEMPERATURE_PATTERN)
+
+    first = pd.to_numeric(parts["low"], errors="coerce").astype("float64")
+    second = pd.to_numeric(parts["high"], errors="coerce").astype("float64").fillna(first)
+    low = np.fmin(first, second)
+    high = np.fmax(first, second)
+
+    below = (parts["bound"] == "以下").fillna(False).to_numpy(dtype=bool)
+    above = (parts["bound"] == "以上").fillna(False).to_numpy(dtype=bool)
+    low = np.where(below, -np.inf, low)
+    high = np.where(above, np.inf, high)
+
+    named = raw.map(NAMED_TEMPERATURES, na_action="ignore")
+    is_named = named.notna().to_numpy(dtype=bool)
+    if is_named.any():
+        named_bounds = np.array(named[is_named].tolist(), dtype="float64")
+        low[is_named] = named_bounds[:, 0]
+        high[is_named] = named_bounds[:, 1]
+
+    return pd.DataFrame({"温度下限(℃)": low, "温度上限(℃)": high})
+
+
+class TemperatureIndex:
+    """
+    基于排序数组的温度区间索引。
+
+    查询返回步骤事实表中的行号，可用 steps.iloc[rows] 取出对应步骤。
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        low = steps["温度下限(℃)"].to_numpy(dtype="float64")
+        high = steps["温度上限(℃)"].to_numpy(dtype="float64")
+        valid = np.flatnonzero(~(np.isnan(low) | np.isnan(high)))
+
+        by_low = valid[np.argsort(low[valid], kind="stable")]
+        by_high = valid[np.argsort(high[valid], kind="stable")]
+        self._rows_by_low = by_low
+        self._sorted_low = low[by_low]
+        self._rows_by_high = by_high
+        self._sorted_high = high[by_high]
+        self._high = high
+
+    def at_or_below(self, temperature):
+        """温度区间能达到 temperature 或更低的步骤（下限 ≤ temperature）"""
+        end = np.searchsorted(self._sorted_low, temperature, side="right")
+        return np.sort(self._rows_by_low[:end])
+
+    def at_or_above(self, temperature):
+        """温度区间能达到 temperature 或更高的步骤（上限 ≥ temperature）"""
+        start = np.searchsorted(self._sorted_high, temperature, side="left")
+        return np.sort(self._rows_by_high[start:])
+
+    def overlapping(self, low, high):
+        """温度区间与 [low, high] 有交集的步骤"""
+        end = np.searchsorted(self._sorted_low, high, side="right")
+        candidates = self._rows_by_low[:end]
+        return np.sort(candidates[self._high[candidates] >= low])
+
+    def step_rows(self, rows):
+        return self.steps.iloc[rows]
+
+    def products(self, rows):
+        """命中步骤所属的 (分类, 产品) 组合，保持目录顺序"""
+        matched = self.steps.iloc[rows][["分类", "产品"]].astype(str)
+        return list(dict.fromkeys(zip(matched["分类"], matched["产品"])))
@@ -0,0 +1,39 @@
+"""
+页面渲染 - 各查看模式的页面片段。
+
+页面脚本（app.py）只负责页头、侧边栏与模式分发；这里的模块在进程内只导入一次，
+每次重跑不再重新定义函数。Plotly 只在绘图的分支中导入，首屏不绘图时不加载。
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+from .comparison import render_comparison_page
+from .equipment import render_equipment_page
+from .overview import render_overview_page
+from .product import render_product_page
+from .scheduling import render_scheduling_page
+from .search import render_search_page
+from .simulation import render_simulation_page
+from .versions import render_versions_page
+
+STYLESHEET_PATH = Path(__file__).resolve().parent.parent / "static" / "app.css"
+
+# 查看模式：侧边栏设置标题与页面片段。各片段把设置项写入侧边栏、把内容写入主区域，
+# 改动某个模式内的设置只重跑该片段，样式表、页头和侧边栏其余部分不会重建
+PAGES = {
+    "单一产品详情": ("#### 选择产品", render_product_page),
+    "多产品对比": ("#### 选择对比产品", render_comparison_page),
+    "分类概览": ("#### 分类概览设置", render_overview_page),
+    "全文检索": ("#### 检索条件", render_search_page),
+    "设备共用": ("#### 设备查询", render_equipment_page),
+    "版本对比": ("#### 选择版本", render_versions_page),
+    "产能模拟": ("#### 计划设置", render_simulation_page),
+    "排产计划": ("#### 排产设置", render_scheduling_page)
+}
+
+
+@lru_cache(maxsize=None)
+def stylesheet():
+    """页面样式表，每个进程只读取一次"""
+    return "<style>\n" + STYLESHEET_PATH.read_text(encoding="utf-8") + "</style>"
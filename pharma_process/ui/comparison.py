@@ -0,0 +1,248 @@
+"""多产品对比 - 产品汇总对比、工艺相似度与工艺步骤比对"""
+
+import streamlit as st
+
+from .. import analytics
+from ..process_store import get_store
+from .profiling import profiled, show_chart, show_table
+
+# 步骤比对表按比对操作着色
+ALIGNMENT_COLORS = {
+    "相同": "background-color: rgba(0, 204, 150, 0.25)",
+    "替换": "background-color: rgba(255, 161, 90, 0.25)",
+    "插入": "background-color: rgba(99, 110, 250, 0.25)",
+    "删除": "background-color: rgba(239, 85, 59, 0.25)"
+}
+
+
+@st.fragment
+@profiled("多产品对比")
+def render_comparison_page(settings):
+    """多产品对比：对比产品选择与对比分析"""
+    with settings:
+        product_table = get_store().facts.products
+        all_products = (product_table["分类"].astype(str) + " | " + product_table["产品"].astype(str)).tolist()
+        
+        # 默认选中项只在首次进入时写入会话状态：选项随搜索结果变化，不能再把默认值传给控件；
+        # 切换目录版本后去掉已不存在的产品
+        if "selected_comparison" not in st.session_state:
+            st.session_state["selected_comparison"] = all_products[:3]
+        else:
+            existing = set(all_products)
+            st.session_state["selected_comparison"] = [
+                p for p in st.session_state["selected_comparison"] if p in existing
+            ]
+        
+        # 按关键词缩小候选产品，已选产品始终保留在选项中
+        product_query = st.text_input("🔍 搜索产品（名称、描述、步骤、参数、设备）")
+        if product_query.strip():
+            matched = get_store().search_index.matched_products(get_store().search_index.search(product_query))
+            options = (matched["分类"].astype(str) + " | " + matched["产品"].astype(str)).tolist()
+            options += [p for p in st.session_state["selected_comparison"] if p not in options]
+        else:
+            options = all_products
+        
+        selected_comparison = st.multiselect(
+            "选择要对比的产品（最多6个）",
+            options,
+            key="selected_comparison"
+        )
+        
+        if len(selected_comparison) > 6:
+            st.warning("最多选择6个产品进行对比")
+            selected_comparison = selected_comparison[:6]
+    
+    st.header("📊 多产品工艺对比分析")
+    
+    if selected_comparison:
+        # Plotly 只在需要绘图时导入
+        import plotly.express as px
+        
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.subheader("产品基本信息对比")
+        
+        # 这里简化对比逻辑，重点展示工艺差异
+        comparison_keys = [
+            tuple(parts) for parts in (path.split(" | ") for path in selected_comparison) if len(parts) == 2
+        ]
+        comparison_df = get_store().facts.product_summaries(comparison_keys)
+        
+        if not comparison_df.empty:
+            comparison_df = comparison_df.rename(columns={
+                "产品": "产品名称",
+                "分类": "所属分类",
+                "步骤数": "工艺步骤数"
+            })[["产品名称", "所属分类", "工艺步骤数", "关键参数总数", "设备种类数", "总工艺时间(h)", "关键路径工期(h)"]]
+            comparison_df[["产品名称", "所属分类"]] = comparison_df[["产品名称", "所属分类"]].astype(str)
+            
+            # 显示对比表格
+            show_table(
+                comparison_df,
+                column_config={
+                    "产品名称": st.column_config.TextColumn("产品名称"),
+                    "所属分类": st.column_config.TextColumn("所属分类"),
+                    "工艺步骤数": st.column_config.NumberColumn("工艺步骤数"),
+                    "关键参数总数": st.column_config.NumberColumn("关键参数总数"),
+                    "设备种类数": st.column_config.NumberColumn("设备种类数"),
+                    "总工艺时间(h)": st.column_config.NumberColumn("总工艺时间(h)", format="%.1f"),
+                    "关键路径工期(h)": st.column_config.NumberColumn("关键路径工期(h)", format="%.1f")
+                },
+                width="stretch",
+                hide_index=True
+            )
+            
+            # 创建对比图表
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig1 = px.bar(
+                    comparison_df,
+                    x="产品名称",
+                    y="工艺步骤数",
+                    color="所属分类",
+                    title="各产品工艺步骤数对比",
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                
+                fig1.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='white',
+                    title_font_color='white'
+                )
+                
+                show_chart(fig1, width="stretch")
+            
+            with col2:
+                fig2 = px.scatter(
+                    comparison_df,
+                    x="关键参数总数",
+                    y="设备种类数",
+                    size="工艺步骤数",
+                    color="所属分类",
+                    text="产品名称",
+                    title="复杂度分析",
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                
+                fig2.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='white',
+                    title_font_color='white'
+                )
+                
+                show_chart(fig2, width="stretch")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # 工艺相似度分析
+        similarity_keys = [key for key in comparison_keys if key in get_store().similarity.positions]
+        if similarity_keys:
+            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+            st.subheader("工艺相似度分析")
+            metric_label = st.radio("相似度度量", ["余弦相似度", "Jaccard 相似度"], horizontal=True)
+            metric = "cosine" if metric_label == "余弦相似度" else "jaccard"
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                similarity_df = analytics.similarity_matrix(tuple(similarity_keys), metric)
+                labels = [product for _, product in similarity_keys]
+                fig3 = px.imshow(
+                    similarity_df.to_numpy(),
+                    x=labels,
+                    y=labels,
+                    zmin=0,
+                    zmax=1,
+                    text_auto=".2f",
+                    color_continuous_scale="Viridis",
+                    title="产品工艺相似度热力图"
+                )
+                
+                fig3.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font_color='white',
+                    title_font_color='white'
+                )
+                
+                show_chart(fig3, width="stretch")
+            
+            with col2:
+                reference = st.selectbox(
+                    "参考产品",
+                    similarity_keys,
+                    format_func=lambda key: f"{key[1]}（{key[0]}）"
+                )
+                st.write("**全目录中最相似的产品**")
+                show_table(
+                    analytics.similar_products(*reference, 10, metric),
+                    column_config={
+                        "相似度": st.column_config.ProgressColumn("相似度", min_value=0, max_value=1, format="%.2f"),
+                        "共有特征数": st.column_config.NumberColumn("共有步骤/参数/设备数")
+                    },
+                    width="stretch",
+                    hide_index=True
+                )
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        # 工艺步骤比对
+        alignment_keys = [key for key in comparison_keys if key in get_store().facts.step_slices]
+        if len(alignment_keys) >= 2:
+            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+            st.subheader("工艺步骤比对")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                align_reference = st.selectbox(
+                    "参考产品",
+                    alignment_keys,
+                    format_func=lambda key: f"{key[1]}（{key[0]}）",
+                    key="align_reference"
+                )
+            other_keys = [key for key in alignment_keys if key != align_reference]
+            with col2:
+                align_other = st.selectbox(
+                    "对比产品",
+                    other_keys,
+                    format_func=lambda key: f"{key[1]}（{key[0]}）",
+                    key="align_other"
+                )
+            
+            align_score, alignment_df = analytics.step_alignment(align_reference, align_other)
+            counts = alignment_df["操作"].value_counts()
+            
+            col1, col2, col3, col4, col5 = st.columns(5)
+            col1.metric("比对得分", f"{align_score:.1f}")
+            col2.metric("相同", int(counts.get("相同", 0)))
+            col3.metric("替换", int(counts.get("替换", 0)))
+            col4.metric("插入", int(counts.get("插入", 0)))
+            col5.metric("删除", int(counts.get("删除", 0)))
+            
+            show_table(
+                alignment_df.style.apply(
+                    lambda row: [ALIGNMENT_COLORS[row["操作"]]] * len(row), axis=1
+                ),
+                column_config={
+                    "参考步骤序号": st.column_config.NumberColumn("参考序号", format="%d"),
+                    "对比步骤序号": st.column_config.NumberColumn("对比序号", format="%d")
+                },
+                width="stretch",
+                hide_index=True
+            )
+            st.caption("插入：仅对比产品有的步骤；删除：仅参考产品有的步骤；替换：名称不同的对应步骤，得分随关键参数重合度提高")
+            
+            if len(other_keys) > 1:
+                st.write("**参考产品与其余所选产品的比对汇总**")
+                show_table(
+                    analytics.alignment_summary(align_reference, tuple(other_keys)),
+                    column_config={
+                        "一致率": st.column_config.ProgressColumn("一致率", min_value=0, max_value=1, format="%.2f")
+                    },
+                    width="stretch",
+                    hide_index=True
+                )
+            st.markdown('</div>', unsafe_allow_html=True)
+    
+    else:
+        st.info("请在侧边栏选择要对比的产品")
@@ -0,0 +1,139 @@
+"""设备共用 - 设备的使用产品、两个产品的设备重叠与分类之间的设备共用热图"""
+
+import streamlit as st
+
+from .. import analytics
+from ..process_store import get_store
+from .profiling import profiled, show_chart, show_table
+
+# 设备重叠表按归属着色
+OVERLAP_COLORS = {
+    "共用": "background-color: rgba(0, 204, 150, 0.25)",
+    "仅A": "background-color: rgba(99, 110, 250, 0.25)",
+    "仅B": "background-color: rgba(255, 161, 90, 0.25)"
+}
+
+
+def _dark_layout(fig):
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        title_font_color='white'
+    )
+    return fig
+
+
+def render_equipment_products(settings):
+    """某设备被哪些产品使用"""
+    usage = analytics.equipment_usage()
+    counts = dict(zip(usage["设备名称"], usage["产品数"]))
+    with settings:
+        name = st.selectbox(
+            "设备",
+            usage["设备名称"].tolist(),
+            format_func=lambda name: f"{name}（{counts[name]} 个产品）",
+            key="equipment_name"
+        )
+    if name is None:
+        st.info("工艺目录中没有设备")
+        return
+
+    row = usage[usage["设备名称"] == name].iloc[0]
+    products_df = analytics.products_using_equipment(name)
+
+    st.subheader(f"使用 {name} 的产品")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("设备类型", row["设备类型"])
+    col2.metric("产品数", int(row["产品数"]))
+    col3.metric("分类数", int(row["分类数"]))
+    col4.metric("使用次数", int(row["使用次数"]))
+
+    if products_df["分类"].nunique() > 1:
+        import plotly.express as px
+
+        by_category = products_df.groupby("分类", sort=False).size().rename("产品数").reset_index()
+        fig = px.bar(by_category, x="分类", y="产品数", color="分类", title="各分类使用该设备的产品数",
+                     color_discrete_sequence=px.colors.qualitative.Set3)
+        show_chart(_dark_layout(fig), width="stretch")
+    show_table(products_df, width="stretch", hide_index=True)
+
+
+def render_product_overlap(settings):
+    """两个产品的设备重叠"""
+    keys = list(get_store().product_index)
+    with settings:
+        first = st.selectbox("产品 A", keys, format_func=lambda key: f"{key[1]}（{key[0]}）", key="overlap_a")
+        second = st.selectbox("产品 B", keys, index=min(1, len(keys) - 1),
+                              format_func=lambda key: f"{key[1]}（{key[0]}）", key="overlap_b")
+    if first is None or second is None:
+        st.info("工艺目录中没有产品")
+        return
+
+    overlap_df = analytics.equipment_overlap(first, second)
+    counts = overlap_df["归属"].value_counts()
+    shared = int(counts.get("共用", 0))
+
+    st.subheader(f"设备重叠：{first[1]} ↔ {second[1]}")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("共用设备", shared)
+    col2.metric("仅 A 使用", int(counts.get("仅A", 0)))
+    col3.metric("仅 B 使用", int(counts.get("仅B", 0)))
+    col4.metric("Jaccard", f"{shared / len(overlap_df):.2f}" if len(overlap_df) else "-")
+
+    if overlap_df.empty:
+        st.info("两个产品都没有登记设备")
+        return
+    show_table(
+        overlap_df.style.apply(lambda row: [OVERLAP_COLORS[row["归属"]]] * len(row), axis=1),
+        column_config={
+            "A使用次数": st.column_config.NumberColumn(f"{first[1]} 使用次数"),
+            "B使用次数": st.column_config.NumberColumn(f"{second[1]} 使用次数")
+        },
+        width="stretch",
+        hide_index=True
+    )
+
+
+def render_category_co_usage(settings):
+    """分类之间的设备共用热图与跨分类共用最多的设备"""
+    with settings:
+        measure = st.radio("热图指标", ["Jaccard 系数", "共用设备种类数"], key="co_usage_measure")
+
+    import plotly.express as px
+
+    shared_df, jaccard_df = analytics.category_equipment_co_usage()
+    values = jaccard_df if measure == "Jaccard 系数" else shared_df
+    st.subheader("各分类之间的设备共用")
+    fig = px.imshow(
+        values,
+        text_auto=".2f" if measure == "Jaccard 系数" else True,
+        color_continuous_scale="Viridis",
+        aspect="auto",
+        title=f"分类设备共用（{measure}）"
+    )
+    fig.update_layout(height=max(450, 40 * len(values) + 150))
+    show_chart(_dark_layout(fig), width="stretch")
+
+    st.write("**跨分类共用的设备**")
+    usage = analytics.equipment_usage()
+    show_table(usage[usage["分类数"] > 1].sort_values(["分类数", "产品数"], ascending=False, kind="stable"),
+               width="stretch", hide_index=True)
+
+
+@st.fragment
+@profiled("设备共用")
+def render_equipment_page(settings):
+    """设备共用：查询类型选择与对应视图"""
+    with settings:
+        query_type = st.radio("查询类型", ["设备使用产品", "产品设备重叠", "分类共用热图"], key="equipment_query")
+
+    st.header("🔧 共用设备分析")
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    if query_type == "设备使用产品":
+        render_equipment_products(settings)
+    elif query_type == "产品设备重叠":
+        render_product_overlap(settings)
+    else:
+        render_category_co_usage(settings)
+    st.markdown('</div>', unsafe_allow_html=True)
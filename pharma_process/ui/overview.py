@@ -0,0 +1,170 @@
+"""分类概览 - 工艺步骤数对比、工艺复杂度雷达图、设备需求对比与温度区间查询"""
+
+import streamlit as st
+
+from .. import analytics
+from ..process_store import get_store
+from .profiling import profiled, show_chart, show_table
+
+# 工艺复杂度雷达图的指标
+RADAR_METRICS = ["平均步骤数", "平均关键参数数", "平均设备种类数", "平均工艺时间(h)", "温度跨度(℃)"]
+
+
+@st.fragment
+@profiled("分类概览")
+def render_overview_page(settings):
+    """分类概览：概览类型选择与各分类汇总"""
+    with settings:
+        overview_type = st.selectbox(
+            "概览类型",
+            ["工艺步骤数对比", "工艺复杂度雷达图", "设备需求对比", "温度区间查询"]
+        )
+    
+    st.header("🌐 制药品类工艺概览")
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    
+    # 产品汇总表在加载工艺目录时已构建
+    overview_df = get_store().facts.products
+    
+    if not overview_df.empty:
+        
+        # Plotly 只在绘图的概览类型中导入
+        if overview_type == "工艺步骤数对比":
+            st.subheader("各品类工艺步骤数对比")
+            import plotly.express as px
+            
+            # 创建分类对比图
+            category_stats = analytics.category_aggregates()
+            
+            fig = px.bar(
+                category_stats,
+                x="分类",
+                y="平均步骤数",
+                error_y="最多步骤数",
+                hover_data=["产品数量", "平均工艺时间(h)"],
+                title="各分类平均工艺步骤数对比",
+                color="分类",
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            
+            fig.update_layout(
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font_color='white',
+                title_font_color='white'
+            )
+            
+            show_chart(fig, width="stretch")
+        
+        elif overview_type == "工艺复杂度雷达图":
+            st.subheader("各品类工艺复杂度雷达图")
+            import plotly.graph_objects as go
+            
+            
+            category_stats = analytics.category_aggregates()
+            selected_categories = st.multiselect(
+                "对比分类",
+                category_stats["分类"].tolist(),
+                default=category_stats["分类"].tolist()[:4]
+            )
+            
+            # 各指标按分类间最大值归一化到 0-1，悬停显示原始值
+            radar_stats = category_stats.set_index("分类")
+            radar_stats["温度跨度(℃)"] = radar_stats["最高温度(℃)"] - radar_stats["最低温度(℃)"]
+            radar_stats = radar_stats[RADAR_METRICS].fillna(0)
+            radar_scaled = radar_stats / radar_stats.max().replace(0, 1)
+            
+            fig = go.Figure()
+            for category in selected_categories:
+                fig.add_trace(go.Scatterpolar(
+                    r=radar_scaled.loc[category].tolist() + [radar_scaled.loc[category].iloc[0]],
+                    theta=RADAR_METRICS + [RADAR_METRICS[0]],
+                    customdata=radar_stats.loc[category].tolist() + [radar_stats.loc[category].iloc[0]],
+                    hovertemplate="%{theta}: %{customdata}<extra>" + category + "</extra>",
+                    fill='toself',
+                    name=category
+                ))
+            
+            fig.update_layout(
+                polar=dict(
+                    bgcolor='rgba(0,0,0,0)',
+                    radialaxis=dict(visible=True, range=[0, 1], gridcolor='#2d3746'),
+                    angularaxis=dict(gridcolor='#2d3746')
+                ),
+                title="工艺复杂度对比（各指标按分类最大值归一化）",
+                paper_bgcolor='rgba(0,0,0,0)',
+                font_color='white',
+                title_font_color='white',
+                legend_font_color='white'
+            )
+            
+            show_chart(fig, width="stretch")
+            show_table(category_stats, width="stretch", hide_index=True)
+        
+        elif overview_type == "设备需求对比":
+            st.subheader("各品类设备需求对比")
+            import plotly.express as px
+            
+            equipment_demand = analytics.category_equipment_demand()
+            demand_long = equipment_demand.reset_index().melt(id_vars="分类", var_name="设备类型", value_name="使用次数")
+            
+            fig = px.bar(
+                demand_long,
+                x="分类",
+                y="使用次数",
+                color="设备类型",
+                title="各分类按设备类型的设备使用次数",
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            
+            fig.update_layout(
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font_color='white',
+                title_font_color='white',
+                xaxis=dict(gridcolor='#2d3746'),
+                yaxis=dict(gridcolor='#2d3746')
+            )
+            
+            show_chart(fig, width="stretch")
+            
+            category_stats = analytics.category_aggregates().set_index("分类")
+            equipment_table = equipment_demand.copy()
+            equipment_table.insert(0, "设备种类数", category_stats["设备种类数"])
+            equipment_table.insert(1, "平均设备种类数", category_stats["平均设备种类数"])
+            show_table(equipment_table, width="stretch")
+        
+        elif overview_type == "温度区间查询":
+            st.subheader("工艺温度区间查询")
+            temperature_index = get_store().temperature_index
+            
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                query_type = st.radio(
+                    "查询方式",
+                    ["温度不高于", "温度不低于", "与温度区间重叠"],
+                    horizontal=True
+                )
+            with col2:
+                query_low = st.number_input("温度(℃)" if query_type != "与温度区间重叠" else "区间下限(℃)", value=-70.0, step=1.0)
+            with col3:
+                query_high = st.number_input("区间上限(℃)", value=125.0, step=1.0, disabled=query_type != "与温度区间重叠")
+            
+            if query_type == "温度不高于":
+                rows = temperature_index.at_or_below(query_low)
+            elif query_type == "温度不低于":
+                rows = temperature_index.at_or_above(query_low)
+            else:
+                rows = temperature_index.overlapping(query_low, query_high)
+            
+            matched_steps = temperature_index.step_rows(rows)[["分类", "产品", "步骤序号", "步骤名称", "工艺温度", "工艺时间"]]
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("命中步骤数", len(matched_steps))
+            with col2:
+                st.metric("涉及产品数", len(temperature_index.products(rows)))
+            
+            show_table(matched_steps, width="stretch", hide_index=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,280 @@
+"""单一产品详情 - 产品选择、视图切换与四个产品视图"""
+
+import streamlit as st
+
+from .. import analytics, instrumentation
+from ..durations import format_hours
+from ..process_graph import has_dependencies
+from ..process_store import PharmaceuticalProcesses, get_store
+from .profiling import profiled, show_chart, show_table
+
+# 派生视图缓存：按 (存储谱系, 产品内容哈希) 缓存，重复访问或目录增量更新后内容未变的产品只需反序列化
+VIEW_CACHE_MAX_ENTRIES = 256
+VIEW_CACHE_TTL = 3600
+
+
+@instrumentation.track_cache("build_parameter_view", st.cache_data(max_entries=VIEW_CACHE_MAX_ENTRIES, ttl=VIEW_CACHE_TTL, show_spinner=False))
+def build_parameter_view(product_version, main_category, product):
+    """关键参数表与参数类型饼图，按 (产品缓存键, 分类, 产品) 缓存"""
+    params_df = analytics.parameter_breakdown(main_category, product)
+    if params_df.empty:
+        return None, None
+    
+    from ..charts import build_parameter_type_figure
+    
+    fig1 = build_parameter_type_figure(analytics.parameter_type_counts(main_category, product))
+    
+    return params_df, fig1
+
+
+@instrumentation.track_cache("build_equipment_view", st.cache_data(max_entries=VIEW_CACHE_MAX_ENTRIES, ttl=VIEW_CACHE_TTL, show_spinner=False))
+def build_equipment_view(product_version, main_category, product):
+    """设备清单汇总与设备类型柱状图，按 (产品缓存键, 分类, 产品) 缓存"""
+    equip_summary = analytics.equipment_breakdown(main_category, product)
+    if equip_summary.empty:
+        return None, None
+    
+    from ..charts import build_equipment_type_figure
+    
+    fig2 = build_equipment_type_figure(analytics.equipment_type_counts(main_category, product))
+    
+    return equip_summary, fig2
+
+
+@instrumentation.track_cache("build_flowchart", st.cache_data(max_entries=VIEW_CACHE_MAX_ENTRIES, ttl=VIEW_CACHE_TTL, show_spinner=False))
+def build_flowchart(product_version, main_category, product):
+    """工艺流程图，按 (产品缓存键, 分类, 产品) 缓存；声明了步骤依赖的产品按分层 DAG 绘制"""
+    from ..charts import build_product_flowchart
+    
+    return build_product_flowchart(main_category, product)
+
+
+# 单一产品详情的各视图：每次只计算并发送当前选中的一个视图
+DETAIL_VIEWS = ["📋 工艺步骤详情", "🔧 关键参数分析", "🏭 设备需求", "📊 工艺流程图"]
+
+
+@instrumentation.traced("工艺步骤详情")
+def render_step_details(main_category, product, product_info, product_summary):
+    """工艺步骤详情与工艺统计"""
+    facts = get_store().facts
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("工艺步骤详解")
+    steps = product_info.get("工艺步骤", [])
+    step_rows = facts.product_steps(main_category, product)
+    step_durations = step_rows["工艺时间"].tolist()
+    step_temperatures = step_rows["工艺温度"].tolist()
+    
+    for i, step in enumerate(steps, 1):
+        with st.expander(f"步骤{i}: {step['name']}", expanded=(i==1)):
+            col1, col2, col3 = st.columns([2, 2, 1])
+            
+            with col1:
+                st.markdown("**关键参数:**")
+                for param in step.get("关键参数", []):
+                    st.write(f"• {param}")
+            
+            with col2:
+                st.markdown("**主要设备:**")
+                for equip in step.get("设备", []):
+                    st.write(f"• {equip}")
+            
+            with col3:
+                # 工艺条件
+                if step_durations[i - 1]:
+                    st.metric("工艺时间", step_durations[i - 1])
+                if isinstance(step_temperatures[i - 1], str):
+                    st.metric("工艺温度(℃)", step_temperatures[i - 1])
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # 工艺统计
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("工艺统计")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("总步骤数", len(steps))
+    
+    with col2:
+        st.metric("关键参数总数", int(product_summary["关键参数总数"]))
+    
+    with col3:
+        st.metric("设备种类数", int(product_summary["设备种类数"]))
+    
+    with col4:
+        st.metric("总工艺时间", format_hours(product_summary["总工艺时间(h)"]))
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@instrumentation.traced("关键参数分析")
+def render_parameter_analysis(main_category, product):
+    """关键参数饼图与参数详情表"""
+    product_version = get_store().product_cache_key(main_category, product)
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("关键参数分析")
+    params_df, fig1 = build_parameter_view(product_version, main_category, product)
+    
+    if fig1 is not None:
+        show_chart(fig1, width="stretch")
+        
+        # 参数详情表格
+        st.write("### 参数详情")
+        show_table(
+            params_df,
+            column_config={
+                "参数名称": st.column_config.TextColumn("参数名称"),
+                "所属步骤": st.column_config.TextColumn("所属步骤"),
+                "参数类型": st.column_config.TextColumn("参数类型"),
+                "重要程度": st.column_config.ProgressColumn(
+                    "重要程度",
+                    min_value=1,
+                    max_value=5
+                )
+            },
+            width="stretch"
+        )
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@instrumentation.traced("设备需求")
+def render_equipment_analysis(main_category, product):
+    """设备类型分布与设备清单"""
+    product_version = get_store().product_cache_key(main_category, product)
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("设备需求分析")
+    equip_summary, fig2 = build_equipment_view(product_version, main_category, product)
+    
+    if fig2 is not None:
+        show_chart(fig2, width="stretch")
+        
+        # 详细设备列表
+        st.write("### 详细设备清单")
+        show_table(
+            equip_summary,
+            column_config={
+                "设备名称": st.column_config.TextColumn("设备名称"),
+                "设备类型": st.column_config.TextColumn("设备类型"),
+                "使用频率": st.column_config.NumberColumn("使用次数"),
+                "使用步骤": st.column_config.TextColumn("使用步骤", width="large")
+            },
+            width="stretch"
+        )
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@instrumentation.traced("工艺流程图")
+def render_flowchart(main_category, product, product_info, product_summary):
+    """工艺流程图与关键路径分析"""
+    product_version = get_store().product_cache_key(main_category, product)
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("工艺流程图")
+    fig = build_flowchart(product_version, main_category, product)
+    
+    show_chart(fig, width="stretch")
+    
+    graph_error = get_store().facts.graph_errors.get((main_category, product))
+    if graph_error:
+        st.warning(f"步骤依赖声明有误，已按线性流程绘制并计算工期：{graph_error}")
+    
+    # 流程图说明
+    if has_dependencies(product_info.get("工艺步骤", [])) and not graph_error:
+        st.info("""
+        **流程图说明:**
+        - 🔵 每个圆点代表一个工艺步骤，数字表示步骤序号，同一列的步骤可并行执行
+        - 🔴 红色节点和连线为关键路径，决定总工期
+        - 💡 悬停在圆点上查看参数、设备、最早开始时间和浮动时间
+        """)
+    else:
+        st.info("""
+        **流程图说明:**
+        - 🔵 每个彩色圆点代表一个工艺步骤，数字表示步骤顺序
+        - ⬇️ 下方文字显示步骤名称
+        - ⬅️ 箭头表示工艺流向
+        - 💡 悬停在圆点上查看详细参数和设备信息
+        - 🏁 左侧为工艺开始，✅ 右侧为工艺完成
+        """)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # 关键路径与工期
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("关键路径分析")
+    schedule = analytics.process_schedule(main_category, product)
+    schedule_df, makespan, critical_steps = schedule["排程"], schedule["关键路径工期(h)"], schedule["关键路径"]
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("关键路径工期", format_hours(makespan))
+    with col2:
+        st.metric("步骤时长合计", format_hours(product_summary["总工艺时间(h)"]))
+    with col3:
+        st.metric("并行节省", format_hours(product_summary["总工艺时间(h)"] - makespan))
+    
+    st.write("**关键路径:** " + " → ".join(critical_steps))
+    with st.expander("📅 步骤排程（最早/最晚开始时间）"):
+        show_table(schedule_df, width="stretch", hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+@st.fragment
+@profiled("产品详情视图")
+def render_product_detail(main_category, product):
+    """
+    产品详情视图切换。
+    
+    以分段控件代替 st.tabs：st.tabs 每次重跑都会执行并发送全部标签页，
+    这里只渲染当前视图；切换视图只重跑本片段，不重跑整个页面。
+    """
+    product_info = PharmaceuticalProcesses.get_product_info(main_category, product)
+    product_summary = analytics.product_statistics(main_category, product)
+    
+    view = st.segmented_control(
+        "查看内容",
+        DETAIL_VIEWS,
+        default=DETAIL_VIEWS[0],
+        key="detail_view",
+        label_visibility="collapsed"
+    )
+    
+    if view == DETAIL_VIEWS[1]:
+        render_parameter_analysis(main_category, product)
+    elif view == DETAIL_VIEWS[2]:
+        render_equipment_analysis(main_category, product)
+    elif view == DETAIL_VIEWS[3]:
+        render_flowchart(main_category, product, product_info, product_summary)
+    else:
+        render_step_details(main_category, product, product_info, product_summary)
+
+
+@st.fragment
+@profiled("单一产品详情")
+def render_product_page(settings):
+    """单一产品详情：产品选择与产品工艺详情"""
+    with settings:
+        main_categories = PharmaceuticalProcesses.get_main_categories()
+        selected_main = st.selectbox("选择药品主分类", main_categories, index=0)
+        selected_product = None
+        
+        if selected_main:
+            products = PharmaceuticalProcesses.get_products(selected_main)
+            selected_product = st.selectbox("选择具体产品", products, index=0)
+            
+            product_info = PharmaceuticalProcesses.get_product_info(selected_main, selected_product)
+            if product_info:
+                with st.expander("📝 产品简介"):
+                    st.write(f"**描述**: {product_info.get('description', '')}")
+                    st.write("**关键特征**:")
+                    for feature in product_info.get("关键特征", []):
+                        st.write(f"- {feature}")
+    
+    if selected_main and selected_product:
+        product_info = PharmaceuticalProcesses.get_product_info(selected_main, selected_product)
+        
+        if product_info:
+            # 产品标题
+            st.markdown(f'<div class="custom-card"><h2>🔬 {selected_product} 生产工艺流程</h2><p>所属分类: {selected_main}</p></div>', unsafe_allow_html=True)
+            
+            # 分段控件切换视图，仅渲染当前视图
+            render_product_detail(selected_main, selected_product)
+    
+    else:
+        st.info("请在侧边栏选择产品和分类")
@@ -0,0 +1,140 @@
+"""
+页面性能埋点 - 把 instrumentation 的重跑记录接入 Streamlit：片段埋点、
+图表与表格的负载记录，以及侧边栏调试面板。
+
+设置环境变量 PHARMA_PROCESS_PROFILE=1 或在地址后加 ?profile=1 开启。
+"""
+
+import json
+import os
+from functools import wraps
+
+import pandas as pd
+import streamlit as st
+
+from .. import analytics, api_server, instrumentation
+
+# 调试面板保留的最近重跑记录数
+PROFILE_HISTORY_SIZE = 20
+
+
+def save_profile(profile):
+    """保存一次重跑的记录到会话历史，开启导出时同时追加写出 span"""
+    history = st.session_state.setdefault("profile_history", [])
+    history.append(profile)
+    del history[:-PROFILE_HISTORY_SIZE]
+    if st.session_state.get("profile_export"):
+        instrumentation.export_profile(profile, trace_file())
+
+
+def trace_file():
+    return os.environ.get(instrumentation.TRACE_FILE_ENV_VAR, str(instrumentation.DEFAULT_TRACE_FILE))
+
+
+def profiled(name):
+    """
+    页面片段埋点。
+    
+    整页重跑时片段记录为本次重跑的一个代码段；片段单独重跑时不经过脚本开头，
+    为这次片段重跑单独开始一条记录。
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiling_enabled() or instrumentation.current_profile() is not None:
+                with instrumentation.span(name):
+                    return func(*args, **kwargs)
+            instrumentation.start_profile(f"片段重跑: {name}")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                save_profile(instrumentation.finish_profile())
+        return wrapper
+    return decorate
+
+
+def show_chart(fig, **kwargs):
+    """st.plotly_chart，开启埋点时记录发送耗时与图表 JSON 大小"""
+    with instrumentation.span("plotly_chart") as chart_span:
+        st.plotly_chart(fig, **kwargs)
+    if chart_span is not None:
+        chart_span.payload_bytes = instrumentation.payload_size(fig)
+
+
+def show_table(data, **kwargs):
+    """st.dataframe，开启埋点时记录发送耗时与 Arrow 数据大小"""
+    with instrumentation.span("dataframe") as table_span:
+        st.dataframe(data, **kwargs)
+    if table_span is not None:
+        table_span.payload_bytes = instrumentation.payload_size(data)
+
+
+def profiling_enabled():
+    return os.environ.get(instrumentation.PROFILE_ENV_VAR) == "1" or st.query_params.get("profile") == "1"
+
+
+def start_rerun():
+    """整页重跑开始：开启埋点时开始记录，否则清除上次异常中断遗留的记录"""
+    if profiling_enabled():
+        instrumentation.start_profile("整页重跑")
+    else:
+        instrumentation.finish_profile()
+
+
+def finish_rerun():
+    """整页重跑结束：保存本次记录并绘制调试面板"""
+    if profiling_enabled():
+        save_profile(instrumentation.finish_profile())
+        render_profile_panel()
+
+
+def render_profile_panel():
+    """侧边栏调试面板：最近几次重跑的代码段耗时、内存变化、负载大小与缓存命中率"""
+    history = st.session_state.get("profile_history", [])
+    if not history:
+        return
+    
+    with st.sidebar.expander("🐞 性能分析", expanded=True):
+        st.caption("片段单独重跑的记录在下次整页重跑时显示；内存变化按整个进程统计，含其他会话并发重跑的分配")
+        # 默认显示最近一次，其余按由新到旧排列；已结束记录的标签不再变化，选择可跨重跑保留
+        selected = st.selectbox(
+            "重跑记录",
+            [None] + history[-2::-1],
+            format_func=lambda p: "最近一次" if p is None else f"{p.root.name}（{p.duration_ms:.0f} ms · {p.trace_id[:6]}）",
+            key="profile_record"
+        )
+        profile = selected or history[-1]
+        records = pd.DataFrame(profile.records())
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("总耗时", f"{profile.duration_ms:.0f} ms")
+        with col2:
+            st.metric("发送负载", f"{records['负载(KB)'].sum():.0f} KB")
+        st.dataframe(records, width="stretch", hide_index=True)
+        
+        # 视图缓存、分析函数缓存与 HTTP 接口响应缓存
+        external = {
+            f"analytics.{name}": (func.cache_info().hits, func.cache_info().misses)
+            for name, func in vars(analytics).items() if callable(getattr(func, "cache_info", None))
+        }
+        external["api_server.response_cache"] = (api_server.response_cache.hits, api_server.response_cache.misses)
+        cache_stats = pd.DataFrame(instrumentation.cache_statistics(external))
+        if not cache_stats.empty:
+            st.markdown("**缓存命中率**")
+            st.dataframe(
+                cache_stats,
+                column_config={
+                    "命中率": st.column_config.ProgressColumn("命中率", min_value=0, max_value=1, format="percent")
+                },
+                width="stretch",
+                hide_index=True
+            )
+        
+        st.download_button(
+            "⬇️ 下载 span（OTLP/JSON）",
+            json.dumps(profile.to_otlp(), ensure_ascii=False),
+            file_name=f"spans-{profile.trace_id}.json",
+            mime="application/json"
+        )
+        st.toggle(f"每次重跑追加导出到 {trace_file()}", key="profile_export")
@@ -0,0 +1,174 @@
+"""排产计划 - 共享设备上的多产品排产、设备甘特图与生产战役"""
+
+import pandas as pd
+import streamlit as st
+
+from .. import instrumentation, scheduling, simulation
+from ..process_store import get_store
+from .profiling import profiled, show_chart, show_table
+
+# 排产结果缓存：键包含所选产品的缓存键（存储谱系与内容哈希），产品修改或目录重新加载后重新排产
+SCHEDULE_MAX_ENTRIES = 16
+# 甘特图中换产清洁的颜色
+CHANGEOVER_COLOR = "rgba(200, 200, 200, 0.6)"
+
+
+@instrumentation.track_cache("schedule_demand", st.cache_data(max_entries=SCHEDULE_MAX_ENTRIES, show_spinner="正在排产…"))
+def schedule_demand(demand, product_versions, equipment_units, objective, changeover_hours, time_limit):
+    """
+    贪心加局部搜索排产，返回 (Schedule, 各贪心排列的 (总工期, 换产次数), 迭代次数)。
+    
+    demand、equipment_units 为 ((键, 数量), ...) 元组以便缓存；product_versions 只参与缓存键。
+    """
+    result, scheduler = scheduling.schedule_demand(
+        dict(demand), dict(equipment_units), objective, changeover_hours, time_limit=time_limit, store=get_store()
+    )
+    return result, scheduler.greedy_values, scheduler.iterations
+
+
+def build_gantt(result):
+    """设备甘特图：每台设备一行，生产按产品着色，换产清洁为灰色"""
+    import plotly.express as px
+    
+    tasks = result.equipment_tasks.assign(
+        时长=lambda df: df["结束(h)"] - df["开始(h)"],
+        图例=lambda df: df["产品"].where(df["类型"] == "生产", "换产清洁")
+    )
+    products = list(dict.fromkeys(tasks["产品"]))
+    colors = dict(zip(products, px.colors.qualitative.Set3 * (len(products) // 12 + 1)))
+    colors["换产清洁"] = CHANGEOVER_COLOR
+    
+    fig = px.bar(
+        tasks,
+        x="时长",
+        y="设备",
+        base="开始(h)",
+        orientation="h",
+        color="图例",
+        color_discrete_map=colors,
+        hover_data={"批次": True, "步骤": True, "开始(h)": ":.1f", "结束(h)": ":.1f", "时长": False, "图例": False},
+        title=f"设备甘特图（总工期 {result.makespan:.0f} h）"
+    )
+    fig.update_yaxes(categoryorder="category descending", title=None)
+    fig.update_xaxes(title="时间 (h)")
+    fig.update_layout(
+        height=max(400, 22 * tasks["设备"].nunique() + 120),
+        barmode="overlay",
+        legend_title_text="产品",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        title_font_color='white'
+    )
+    return fig
+
+
+@st.fragment
+@profiled("排产计划")
+def render_scheduling_page(settings):
+    """排产计划：需求产品、优化目标与换产时间设置，排程结果与甘特图"""
+    store = get_store()
+    with settings:
+        product_table = store.facts.products
+        all_products = (product_table["分类"].astype(str) + " | " + product_table["产品"].astype(str)).tolist()
+        selected = st.multiselect(
+            "需求产品",
+            all_products,
+            default=all_products[:3],
+            key="scheduling_products"
+        )
+        objective = st.radio(
+            "优化目标",
+            list(scheduling.OBJECTIVES),
+            format_func=scheduling.OBJECTIVES.get
+        )
+        changeover_hours = st.number_input(
+            "换产清洁时间(h)", min_value=0.0, max_value=72.0, value=scheduling.DEFAULT_CHANGEOVER_HOURS, step=1.0
+        )
+        time_limit = st.slider("局部搜索时间上限(s)", 0.5, 10.0, scheduling.DEFAULT_TIME_LIMIT, 0.5)
+    
+    st.header("📅 多产品排产")
+    
+    keys = [tuple(parts) for parts in (path.split(" | ") for path in selected) if len(parts) == 2]
+    if not keys:
+        st.info("请在侧边栏选择需求产品")
+        return
+    
+    recipes = simulation.recipes_for(keys, store)
+    equipment_names = simulation.plan_equipment(recipes, keys)
+    
+    # 需求与设备台数在表单中编辑，提交后才重新排产
+    with st.form("scheduling_settings"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**需求批次**")
+            demand_df = st.data_editor(
+                pd.DataFrame({"分类": [key[0] for key in keys], "产品": [key[1] for key in keys], "批次数": 20}),
+                column_config={"批次数": st.column_config.NumberColumn("批次数", min_value=0, step=1)},
+                disabled=["分类", "产品"],
+                hide_index=True,
+                width="stretch"
+            )
+        with col2:
+            st.write("**设备台数**")
+            units_df = st.data_editor(
+                pd.DataFrame({"设备名称": equipment_names, "台数": 1}),
+                column_config={"台数": st.column_config.NumberColumn("台数", min_value=1, step=1)},
+                disabled=["设备名称"],
+                hide_index=True,
+                width="stretch"
+            )
+        st.form_submit_button("生成排程")
+    
+    demand = tuple(
+        (key, int(batches)) for key, batches in zip(keys, demand_df["批次数"].fillna(0)) if batches > 0
+    )
+    if not demand:
+        st.info("请至少为一个产品设置需求批次")
+        return
+    equipment_units = tuple(zip(units_df["设备名称"], units_df["台数"].fillna(1).astype(int)))
+    product_versions = tuple(store.product_cache_key(*key) for key, _ in demand)
+    result, greedy_values, iterations = schedule_demand(
+        demand, product_versions, equipment_units, objective, float(changeover_hours), float(time_limit)
+    )
+    
+    best_greedy = min(greedy_values.values())
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("总批次", sum(batches for _, batches in demand))
+    col2.metric("总工期(h)", f"{result.makespan:.1f}", delta=f"{result.makespan - best_greedy[0]:+.1f} 相对贪心",
+                delta_color="inverse")
+    col3.metric("换产次数", result.changeovers)
+    col4.metric("局部搜索迭代", iterations)
+    st.caption("贪心初始解：" + "；".join(
+        f"{name} 总工期 {makespan:.1f} h、换产 {changeovers} 次" for name, (makespan, changeovers) in greedy_values.items()
+    ))
+    
+    if result.equipment_tasks.empty:
+        st.info("所选产品没有占用设备的工艺步骤")
+    else:
+        show_chart(build_gantt(result), width="stretch")
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    tab1, tab2, tab3 = st.tabs(["生产战役", "设备负荷", "步骤排程"])
+    with tab1:
+        show_table(result.campaigns(), width="stretch", hide_index=True)
+    with tab2:
+        show_table(
+            result.equipment,
+            column_config={
+                "利用率": st.column_config.ProgressColumn("利用率", min_value=0, max_value=1, format="%.2f"),
+                "生产时间(h)": st.column_config.NumberColumn("生产时间(h)", format="%.1f"),
+                "换产时间(h)": st.column_config.NumberColumn("换产时间(h)", format="%.1f")
+            },
+            width="stretch",
+            hide_index=True
+        )
+    with tab3:
+        show_table(result.tasks, width="stretch", hide_index=True)
+        st.download_button(
+            "下载步骤排程 CSV",
+            result.tasks.to_csv(index=False).encode("utf-8-sig"),
+            file_name="schedule.csv",
+            mime="text/csv"
+        )
@@ -0,0 +1,60 @@
+"""全文检索 - 关键词与分面过滤检索工艺步骤"""
+
+import streamlit as st
+
+from ..process_store import get_store
+from .profiling import profiled, show_table
+
+# 全文检索结果表格的最大显示行数
+SEARCH_MAX_ROWS = 500
+
+
+@st.fragment
+@profiled("全文检索")
+def render_search_page(settings):
+    """全文检索：检索条件与检索结果"""
+    with settings:
+        search_index = get_store().search_index
+        search_query = st.text_input("关键词（空格分隔表示同时包含）", placeholder="如：灭菌 温度")
+        search_filters = {
+            facet: st.multiselect(f"按{facet}过滤", search_index.facet_values(facet))
+            for facet in ("分类", "设备类型", "参数类型")
+        }
+    
+    st.header("🔍 工艺全文检索")
+    
+    if search_query.strip() or any(search_filters.values()):
+        rows = search_index.search(search_query, search_filters)
+        matched_products = search_index.matched_products(rows)
+        
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("命中步骤数", len(rows))
+        with col2:
+            st.metric("涉及产品数", len(matched_products))
+        
+        # 分面统计
+        facet_cols = st.columns(3)
+        for col, facet in zip(facet_cols, ("分类", "设备类型", "参数类型")):
+            with col:
+                st.write(f"**{facet}分布**")
+                show_table(search_index.facet_counts(rows, facet).rename("步骤数"), width="stretch")
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        if len(rows):
+            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+            st.subheader("命中产品")
+            show_table(matched_products, width="stretch", hide_index=True)
+            
+            st.subheader("命中步骤")
+            if len(rows) > SEARCH_MAX_ROWS:
+                st.caption(f"仅显示前 {SEARCH_MAX_ROWS} 条")
+            show_table(
+                search_index.matched_steps(rows[:SEARCH_MAX_ROWS])[["分类", "产品", "步骤序号", "步骤名称", "工艺时间", "工艺温度"]],
+                width="stretch",
+                hide_index=True
+            )
+            st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("请在侧边栏输入关键词或选择过滤条件")
@@ -0,0 +1,219 @@
+"""产能模拟 - 生产计划的设备利用率、排队与产出仿真及蒙特卡洛时长波动分析"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from .. import instrumentation, simulation
+from ..process_store import get_store
+from .profiling import profiled, show_chart, show_table
+
+# 仿真结果缓存：键包含所选产品的缓存键（存储谱系与内容哈希），产品修改或目录重新加载后重新仿真
+SIMULATION_MAX_ENTRIES = 32
+# 计划周期选项（小时）
+PERIOD_OPTIONS = {"一周": 168.0, "一个月": simulation.DEFAULT_PERIOD_HOURS, "一个季度": 2160.0}
+# 利用率图与分布图显示的设备数
+TOP_EQUIPMENT = 15
+# 页面默认与最多的蒙特卡洛仿真次数；仿真在 Streamlit 服务进程内执行，默认值保持较小
+DEFAULT_RUNS = 20
+MAX_RUNS = 500
+# 次数不超过该值时在服务进程内串行仿真：spawn 进程池的启动与导入开销超过并行收益
+SERIAL_RUNS = 100
+# 并行仿真的最多工作进程数
+MAX_WORKERS = 4
+
+
+@instrumentation.track_cache("simulate_plan", st.cache_data(max_entries=SIMULATION_MAX_ENTRIES, show_spinner="正在仿真…"))
+def simulate_plan(plan, product_versions, equipment_units, period_hours, runs, cv):
+    """
+    确定性仿真与（runs > 0 时）蒙特卡洛汇总。
+    
+    plan、equipment_units 为 ((键, 数量), ...) 元组以便缓存；product_versions 只参与缓存键。
+    相同输入再次提交直接取缓存结果；次数较少时串行仿真，不启动进程池。
+    """
+    plan = dict(plan)
+    equipment_units = dict(equipment_units)
+    recipes = simulation.recipes_for(plan, get_store())
+    result = simulation.simulate(recipes, plan, equipment_units, period_hours)
+    summary = None
+    if runs > 0:
+        workers = 1 if runs <= SERIAL_RUNS else min(os.cpu_count() or 1, MAX_WORKERS)
+        summary = simulation.monte_carlo(recipes, plan, equipment_units, runs, period_hours, cv,
+                                         workers=workers)
+    return result, summary
+
+
+def _dark_layout(fig):
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        title_font_color='white'
+    )
+    return fig
+
+
+@st.fragment
+@profiled("产能模拟")
+def render_simulation_page(settings):
+    """产能模拟：计划产品与周期选择、批次与设备台数设置、仿真结果"""
+    store = get_store()
+    with settings:
+        product_table = store.facts.products
+        all_products = (product_table["分类"].astype(str) + " | " + product_table["产品"].astype(str)).tolist()
+        selected = st.multiselect(
+            "计划生产的产品",
+            all_products,
+            default=all_products[:2],
+            key="simulation_products"
+        )
+        period_label = st.selectbox("计划周期", list(PERIOD_OPTIONS), index=1)
+        period_hours = PERIOD_OPTIONS[period_label]
+    
+    st.header("🏭 产能模拟")
+    
+    keys = [tuple(parts) for parts in (path.split(" | ") for path in selected) if len(parts) == 2]
+    if not keys:
+        st.info("请在侧边栏选择计划生产的产品")
+        return
+    
+    recipes = simulation.recipes_for(keys, store)
+    equipment_names = simulation.plan_equipment(recipes, keys)
+    
+    # 计划与设备台数在表单中编辑，提交后才重新仿真
+    with st.form("simulation_settings"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**生产计划（周期内批次数）**")
+            plan_df = st.data_editor(
+                pd.DataFrame({"分类": [key[0] for key in keys], "产品": [key[1] for key in keys], "批次数": 10}),
+                column_config={"批次数": st.column_config.NumberColumn("批次数", min_value=0, step=1)},
+                disabled=["分类", "产品"],
+                hide_index=True,
+                width="stretch"
+            )
+        with col2:
+            st.write("**设备台数**")
+            units_df = st.data_editor(
+                pd.DataFrame({"设备名称": equipment_names, "台数": 1}),
+                column_config={"台数": st.column_config.NumberColumn("台数", min_value=1, step=1)},
+                disabled=["设备名称"],
+                hide_index=True,
+                width="stretch"
+            )
+        col1, col2 = st.columns(2)
+        with col1:
+            runs = st.number_input("蒙特卡洛仿真次数（0 为只做确定性仿真）", min_value=0, max_value=MAX_RUNS,
+                                   value=DEFAULT_RUNS, step=10)
+        with col2:
+            cv = st.slider("步骤时长波动（变异系数）", 0.0, 0.5, simulation.DEFAULT_DURATION_CV, 0.05)
+        st.form_submit_button("运行仿真")
+    
+    plan = tuple(
+        (key, int(batches)) for key, batches in zip(keys, plan_df["批次数"].fillna(0)) if batches > 0
+    )
+    if not plan:
+        st.info("请至少为一个产品设置批次数")
+        return
+    equipment_units = tuple(zip(units_df["设备名称"], units_df["台数"].fillna(1).astype(int)))
+    product_versions = tuple(store.product_cache_key(*key) for key, _ in plan)
+    result, summary = simulate_plan(plan, product_versions, equipment_units, period_hours, int(runs), float(cv))
+    
+    import plotly.express as px
+    
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader("确定性仿真（名义时长）")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("总批次", sum(batches for _, batches in plan))
+    col2.metric("总工期(h)", f"{result.makespan:.1f}", delta=f"{result.makespan - period_hours:+.1f} 相对计划周期",
+                delta_color="inverse")
+    col3.metric("瓶颈设备", result.bottleneck or "无")
+    col4.metric("瓶颈利用率", f"{result.equipment['利用率'].iat[0]:.0%}" if result.bottleneck else "-")
+    
+    if not result.equipment.empty:
+        top = result.equipment.head(TOP_EQUIPMENT)
+        fig = px.bar(
+            top.iloc[::-1],
+            x="利用率",
+            y="设备名称",
+            orientation="h",
+            color="利用率",
+            hover_data=["台数", "平均等待(h)", "最大队列长度"],
+            color_continuous_scale="RdYlGn_r",
+            range_color=(0, 1),
+            title=f"设备利用率（前 {len(top)} 台）"
+        )
+        fig.update_xaxes(tickformat=".0%")
+        show_chart(_dark_layout(fig), width="stretch")
+    
+    st.write("**设备利用率与排队**")
+    show_table(
+        result.equipment,
+        column_config={
+            "利用率": st.column_config.ProgressColumn("利用率", min_value=0, max_value=1, format="%.2f"),
+            "忙碌时间(h)": st.column_config.NumberColumn("忙碌时间(h)", format="%.1f"),
+            "平均等待(h)": st.column_config.NumberColumn("平均等待(h)", format="%.2f"),
+            "最长等待(h)": st.column_config.NumberColumn("最长等待(h)", format="%.2f"),
+            "平均队列长度": st.column_config.NumberColumn("平均队列长度", format="%.3f")
+        },
+        width="stretch",
+        hide_index=True
+    )
+    st.write("**产品周期与产出**")
+    show_table(
+        result.products,
+        column_config={
+            column: st.column_config.NumberColumn(column, format="%.1f")
+            for column in ("名义周期(h)", "平均周期(h)", "最长周期(h)", "平均等待(h)", "每周期产出(批)")
+        },
+        width="stretch",
+        hide_index=True
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    if summary is None:
+        return
+    
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader(f"蒙特卡洛分析（{len(summary.runs)} 次，变异系数 {cv:.2f}）")
+    percentiles = summary.makespan_percentiles()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("总工期 P5(h)", f"{percentiles[5]:.1f}")
+    col2.metric("总工期 P50(h)", f"{percentiles[50]:.1f}")
+    col3.metric("总工期 P95(h)", f"{percentiles[95]:.1f}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = px.histogram(summary.runs, x="总工期(h)", nbins=30, title="总工期分布")
+        fig.add_vline(x=period_hours, line_dash="dash", line_color="orange")
+        show_chart(_dark_layout(fig), width="stretch")
+    with col2:
+        top_names = summary.equipment["设备名称"].head(TOP_EQUIPMENT // 2).tolist()
+        utilization = summary.utilization[top_names].melt(var_name="设备名称", value_name="利用率")
+        fig = px.box(utilization, x="设备名称", y="利用率", title="主要设备利用率分布")
+        fig.update_yaxes(tickformat=".0%")
+        show_chart(_dark_layout(fig), width="stretch")
+    
+    show_table(
+        summary.equipment,
+        column_config={
+            "利用率均值": st.column_config.ProgressColumn("利用率均值", min_value=0, max_value=1, format="%.2f"),
+            "利用率P5": st.column_config.NumberColumn("利用率P5", format="%.2f"),
+            "利用率P95": st.column_config.NumberColumn("利用率P95", format="%.2f"),
+            "平均等待(h)": st.column_config.NumberColumn("平均等待(h)", format="%.2f"),
+            "瓶颈概率": st.column_config.ProgressColumn("瓶颈概率", min_value=0, max_value=1, format="%.2f")
+        },
+        width="stretch",
+        hide_index=True
+    )
+    show_table(
+        summary.products,
+        column_config={
+            column: st.column_config.NumberColumn(column, format="%.1f")
+            for column in ("平均周期(h)", "周期P95(h)", "每周期产出(批)")
+        },
+        width="stretch",
+        hide_index=True
+    )
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,154 @@
+"""版本对比 - 多站点工艺目录版本之间的产品差异与同一产品两个版本的工艺比对"""
+
+import streamlit as st
+
+from .. import instrumentation
+from ..catalog_versions import SITE_NAME_PATTERN, compare_product_versions, get_repository
+from ..process_store import get_store
+from .comparison import ALIGNMENT_COLORS
+from .profiling import profiled, show_table
+
+# 产品版本比对缓存：产品对象按内容哈希存储，同一对哈希的比对结果不会变化
+VERSION_COMPARISON_MAX_ENTRIES = 128
+
+
+@instrumentation.track_cache("compare_product_versions", st.cache_data(max_entries=VERSION_COMPARISON_MAX_ENTRIES, show_spinner=False))
+def build_version_comparison(old_hash, new_hash):
+    """同一产品两个版本的比对，按 (旧哈希, 新哈希) 缓存"""
+    repository = get_repository()
+    return compare_product_versions(repository.product(old_hash), repository.product(new_hash))
+
+
+def _version_label(entry):
+    label = f"版本 {entry['version']}（{entry['created'][:10]}）"
+    return f"{label} {entry['message']}" if entry["message"] else label
+
+
+def render_commit_form(sites):
+    """把当前加载的工艺目录提交为站点的新版本"""
+    with st.form("commit_catalog_version"):
+        st.write("**提交当前目录为站点版本**")
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            site = st.text_input("站点", value=sites[0] if sites else "")
+        with col2:
+            message = st.text_input("提交说明")
+        submitted = st.form_submit_button("提交")
+    
+    if submitted:
+        site = site.strip()
+        if not site:
+            st.warning("请填写站点名称")
+            return
+        if not SITE_NAME_PATTERN.fullmatch(site):
+            st.error("站点名称只能包含字母、数字、汉字、下划线与连字符")
+            return
+        repository = get_repository()
+        head = repository.head(site)
+        version = repository.commit(site, get_store().processes, message)
+        if version == head:
+            st.info(f"{site}: 内容与版本 {version} 相同，未产生新版本")
+        else:
+            st.success(f"{site}: 已提交版本 {version}")
+
+
+@st.fragment
+@profiled("版本对比")
+def render_versions_page(settings):
+    """版本对比：站点与版本选择、目录差异与产品工艺比对"""
+    repository = get_repository()
+    sites = repository.sites()
+    
+    st.header("🕘 工艺目录版本对比")
+    
+    if not sites:
+        st.info(
+            f"版本库 {repository.root} 中还没有站点版本。可在下方提交当前目录，或使用命令行：\n\n"
+            "`python -m pharma_process.catalog_versions commit --site 站点 目录文件 -m 说明`"
+        )
+        render_commit_form(sites)
+        return
+    
+    with settings:
+        st.caption(f"版本库：{repository.root}")
+        refs = []
+        for side, default_offset in (("A", 1), ("B", 0)):
+            site = st.selectbox(f"站点 {side}", sites, key=f"version_site_{side}")
+            entries = {entry["version"]: entry for entry in repository.versions(site)}
+            version = st.selectbox(
+                f"版本 {side}",
+                list(entries),
+                index=min(default_offset, len(entries) - 1),
+                format_func=lambda version: _version_label(entries[version]),
+                key=f"version_{side}_{site}"
+            )
+            refs.append((site, version))
+    
+    old_manifest = repository.manifest(*refs[0])["products"]
+    new_manifest = repository.manifest(*refs[1])["products"]
+    diff = repository.diff(*refs)
+    
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.subheader(f"目录差异：{refs[0][0]}@{refs[0][1]} → {refs[1][0]}@{refs[1][1]}")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("修改", len(diff.changed))
+    col2.metric("新增", len(diff.added))
+    col3.metric("删除", len(diff.removed))
+    col4.metric("未变", diff.unchanged)
+    if diff.is_empty:
+        st.success("两个版本的工艺目录内容相同")
+    else:
+        show_table(diff.summary(), width="stretch", hide_index=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # 两个版本都包含的产品可以逐步比对，修改过的产品排在前面
+    common = [key for key in new_manifest if key in old_manifest]
+    common.sort(key=lambda key: old_manifest[key] == new_manifest[key])
+    if not common:
+        st.info("两个版本没有共同的产品")
+    else:
+        with settings:
+            key = st.selectbox(
+                "比对产品",
+                common,
+                format_func=lambda key: f"{key[1]}（{key[0]}）" + ("" if old_manifest[key] == new_manifest[key] else " ✎"),
+                key="version_product"
+            )
+        
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.subheader(f"产品工艺比对：{key[1]}")
+        if old_manifest[key] == new_manifest[key]:
+            st.success("该产品在两个版本中内容相同")
+        else:
+            score, alignment_df, changes_df = build_version_comparison(old_manifest[key], new_manifest[key])
+            counts = alignment_df["操作"].value_counts()
+            
+            col1, col2, col3, col4, col5 = st.columns(5)
+            col1.metric("比对得分", f"{score:.1f}")
+            col2.metric("相同", int(counts.get("相同", 0)))
+            col3.metric("替换", int(counts.get("替换", 0)))
+            col4.metric("新增步骤", int(counts.get("插入", 0)))
+            col5.metric("删除步骤", int(counts.get("删除", 0)))
+            
+            show_table(
+                alignment_df.style.apply(
+                    lambda row: [ALIGNMENT_COLORS[row["操作"]]] * len(row), axis=1
+                ),
+                column_config={
+                    "参考步骤": st.column_config.TextColumn("旧版本步骤"),
+                    "对比步骤": st.column_config.TextColumn("新版本步骤"),
+                    "参考步骤序号": st.column_config.NumberColumn("旧序号", format="%d"),
+                    "对比步骤序号": st.column_config.NumberColumn("新序号", format="%d")
+                },
+                width="stretch",
+                hide_index=True
+            )
+            
+            st.write("**属性变化**")
+            if changes_df.empty:
+                st.caption("对应步骤的属性没有变化")
+            else:
+                show_table(changes_df, width="stretch", hide_index=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    render_commit_form(sites)
@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+# 测试用的小型工艺目录：两个分类、三个产品，步骤带时间、温度、关键参数与设备
+SAMPLE_PROCESSES = {
+    "化学药物-固体制剂": {
+        "片剂": {
+            "description": "口服固体制剂",
+            "关键特征": ["剂量准确", "稳定性好"],
+            "工艺步骤": [
+                {"name": "称配", "关键参数": ["称量精度"], "设备": ["精密电子天平"], "时间(h)": 1, "温度(℃)": "室温"},
+                {"name": "制粒", "关键参数": ["粘合剂浓度", "粒度分布"], "设备": ["高速剪切制粒机"], "时间(h)": 3,
+                 "温度(℃)": "25-35"},
+                {"name": "干燥", "关键参数": ["进风温度", "水分含量"], "设备": ["流化床干燥机", "烘箱"], "时间(h)": 4,
+                 "温度(℃)": "50-60"},
+                {"name": "压片", "关键参数": ["压片压力", "硬度"], "设备": ["旋转压片机"], "时间(h)": 4, "温度(℃)": "室温"},
+            ],
+        },
+        "胶囊剂": {
+            "description": "硬胶囊",
+            "关键特征": ["掩味"],
+            "工艺步骤": [
+                {"name": "称配", "关键参数": ["称量精度"], "设备": ["精密电子天平"], "时间(h)": 1, "温度(℃)": "室温"},
+                {"name": "填充", "关键参数": ["装量差异"], "设备": ["全自动胶囊填充机"], "时间(h)": 5, "温度(℃)": "室温"},
+            ],
+        },
+    },
+    "生物制品": {
+        "疫苗": {
+            "description": "灭活疫苗",
+            "关键特征": ["免疫原性"],
+            "工艺步骤": [
+                {"name": "细胞培养", "关键参数": ["细胞密度", "pH值"], "设备": ["生物反应器"], "时间(天)": "3-5",
+                 "温度(℃)": "37"},
+                {"name": "灭活", "关键参数": ["灭活剂浓度"], "设备": ["灭活罐"], "时间(h)": 24, "温度(℃)": "2-8"},
+                {"name": "冻干", "关键参数": ["水分含量"], "设备": ["冻干机"], "时间(h)": "48", "温度(℃)": "-40~25"},
+            ],
+        },
+    },
+}
+
+
+@pytest.fixture
+def processes():
+    """可随意修改的样例目录副本"""
+    return copy.deepcopy(SAMPLE_PROCESSES)
@@ -0,0 +1,87 @@
+import copy
+from functools import lru_cache
+
+import numpy as np
+import pytest
+
+from pharma_process.alignment import GAP_SCORE, MATCH_SCORE, MISMATCH_SCORE, SUBSTITUTION_MAX, needleman_wunsch
+from pharma_process.process_store import ProcessStore
+
+TABLET = ("化学药物-固体制剂", "片剂")
+CAPSULE = ("化学药物-固体制剂", "胶囊剂")
+VACCINE = ("生物制品", "疫苗")
+
+
+def _best_score(scores, gap=GAP_SCORE):
+    """穷举递推的最优全局比对得分"""
+    @lru_cache(maxsize=None)
+    def best(i, j):
+        if i == 0 or j == 0:
+            return gap * (i + j)
+        return max(best(i - 1, j - 1) + scores[i - 1, j - 1], best(i - 1, j) + gap, best(i, j - 1) + gap)
+    return best(*scores.shape)
+
+
+def _path_score(scores, path, gap=GAP_SCORE):
+    return sum(gap if i is None or j is None else scores[i, j] for i, j in path)
+
+
+@pytest.mark.parametrize("shape", [(0, 0), (0, 3), (4, 0), (1, 1), (3, 5), (6, 4), (7, 7)])
+def test_needleman_wunsch_is_optimal(shape):
+    rng = np.random.default_rng(sum(shape))
+    scores = rng.uniform(-1.5, 2.0, shape)
+    total, path = needleman_wunsch(scores)
+    assert total == pytest.approx(_best_score(scores))
+    assert _path_score(scores, path) == pytest.approx(total)
+    # 路径按顺序覆盖两侧全部步骤各一次
+    assert [i for i, _ in path if i is not None] == list(range(shape[0]))
+    assert [j for _, j in path if j is not None] == list(range(shape[1]))
+
+
+@pytest.fixture
+def aligner(processes):
+    solids = processes["化学药物-固体制剂"]
+    steps = copy.deepcopy(solids["片剂"]["工艺步骤"])
+    # 去掉干燥、压片改名（参数不变）的变体
+    del steps[2]
+    steps[2]["name"] = "压制"
+    solids["片剂变体"] = {**solids["片剂"], "工艺步骤": steps}
+    return ProcessStore(processes).aligner
+
+
+def test_identical_products_align_step_by_step(aligner):
+    total, table = aligner.align(TABLET, TABLET)
+    assert total == MATCH_SCORE * 4
+    assert table["操作"].tolist() == ["相同"] * 4
+    assert table["参考步骤序号"].tolist() == table["对比步骤序号"].tolist() == [1, 2, 3, 4]
+
+
+def test_deletion_and_substitution(aligner):
+    total, table = aligner.align(TABLET, ("化学药物-固体制剂", "片剂变体"))
+    assert table["操作"].tolist() == ["相同", "相同", "删除", "替换"]
+    assert table["对比步骤"].tolist() == ["称配", "制粒", "", "压制"]
+    # 改名步骤的关键参数完全相同，替换得分取上限
+    assert table["得分"].tolist() == [MATCH_SCORE, MATCH_SCORE, GAP_SCORE, SUBSTITUTION_MAX]
+    assert total == pytest.approx(MATCH_SCORE * 2 + GAP_SCORE + SUBSTITUTION_MAX)
+
+
+def test_unrelated_steps_score_as_mismatch(aligner):
+    scores, same_name = aligner.encoding.score_matrix(aligner.encoding.step_rows(TABLET),
+                                                      aligner.encoding.step_rows(VACCINE))
+    assert not same_name.any()
+    # 干燥（进风温度、水分含量）与冻干（水分含量）的参数 Jaccard 为 1/2，其余组合没有共同参数
+    assert scores[2, 2] == pytest.approx(MISMATCH_SCORE + (SUBSTITUTION_MAX - MISMATCH_SCORE) / 2)
+    assert np.count_nonzero(scores == MISMATCH_SCORE) == scores.size - 1
+
+
+def test_align_many_matches_pairwise_alignment(aligner):
+    others = [CAPSULE, VACCINE, ("化学药物-固体制剂", "片剂变体")]
+    summary = aligner.align_many(TABLET, others).set_index("产品")
+    for key in others:
+        total, table = aligner.align(TABLET, key)
+        row = summary.loc[key[1]]
+        assert row["比对得分"] == pytest.approx(round(total, 2))
+        assert row["相同"] == (table["操作"] == "相同").sum()
+        assert row["一致率"] == pytest.approx((table["操作"] == "相同").mean())
+    assert list(summary["比对得分"]) == sorted(summary["比对得分"], reverse=True)
+    assert aligner.align_many(TABLET, []).empty
@@ -0,0 +1,74 @@
+import json
+import threading
+from http.client import HTTPConnection
+from urllib.parse import quote
+
+import pytest
+
+from pharma_process import analytics
+from pharma_process.api_server import make_server, response_cache
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = make_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(scope="module")
+def product():
+    return tuple(analytics.list_products().iloc[0][["分类", "产品"]].astype(str))
+
+
+def _get(server, path, etag=None):
+    connection = HTTPConnection(*server.server_address, timeout=30)
+    try:
+        connection.request("GET", quote(path, safe="/?=&"), headers={"If-None-Match": etag} if etag else {})
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, response.getheader("ETag"), json.loads(body) if body else None
+    finally:
+        connection.close()
+
+
+def test_version_etag_and_revalidation(server):
+    status, etag, body = _get(server, "/api/version")
+    assert status == 200
+    assert etag == f'"{analytics.catalog_version()}"' == f'"{body["version"]}"'
+    status, again, body = _get(server, "/api/version", etag)
+    assert (status, again, body) == (304, etag, None)
+    assert _get(server, "/api/version", '"stale"')[0] == 200
+
+
+def test_product_etag_is_product_hash(server, product):
+    status, etag, body = _get(server, f"/api/products/{product[0]}/{product[1]}/durations")
+    assert status == 200 and body
+    assert etag == f'"{analytics.product_version(*product)}"'
+    hits = response_cache.hits
+    assert _get(server, f"/api/products/{product[0]}/{product[1]}/durations", etag)[0] == 304
+    assert response_cache.hits == hits + 1
+
+
+def test_unknown_resources_are_not_revalidated(server, product):
+    # 未知产品与路径使用目录版本作 ETag，携带它也必须得到 404 而不是 304
+    catalog_etag = f'"{analytics.catalog_version()}"'
+    assert _get(server, "/api/products/不存在/不存在", catalog_etag)[0] == 404
+    assert _get(server, "/api/unknown", catalog_etag)[0] == 404
+    assert _get(server, f"/api/products/{product[0]}/{product[1]}/unknown")[0] == 404
+
+
+@pytest.mark.parametrize("query", ["top_n=0", "top_n=-3", "top_n=abc", "metric=unknown"])
+def test_invalid_similar_parameters_are_rejected(server, product, query):
+    status, _, body = _get(server, f"/api/products/{product[0]}/{product[1]}/similar?{query}")
+    assert status == 400
+    assert body["error"]
+
+
+def test_similar_products(server, product):
+    status, _, body = _get(server, f"/api/products/{product[0]}/{product[1]}/similar?top_n=3")
+    assert status == 200
+    assert len(body) == 3
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from pharma_process import benchmark
+
+
+@pytest.mark.parametrize("num_steps", [1, 37, 500])
+def test_synthetic_catalog_has_exact_step_count(num_steps):
+    catalog = benchmark.synthetic_catalog(num_steps, seed=3)
+    assert sum(len(info["工艺步骤"]) for products in catalog.values() for info in products.values()) == num_steps
+    assert catalog == benchmark.synthetic_catalog(num_steps, seed=3)
+    assert all(catalog.values())
+
+
+def test_truncated_products_drop_dependencies():
+    # 截断的产品不能引用被截掉的步骤
+    for num_steps in range(1, 40):
+        catalog = benchmark.synthetic_catalog(num_steps, seed=num_steps)
+        for products in catalog.values():
+            for info in products.values():
+                names = {step["name"] for step in info["工艺步骤"]}
+                for step in info["工艺步骤"]:
+                    for ref in step.get("依赖", []):
+                        assert ref in names or (isinstance(ref, int) and ref <= len(info["工艺步骤"]))
+
+
+def test_main_writes_well_formed_report(tmp_path):
+    output = tmp_path / "bench.json"
+    benchmark.main(["--sizes", "120", "--repeat", "1", "--no-apptest", "--output", str(output)])
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert {"python", "packages", "cpu_count"} <= set(report["environment"])
+    results = report["results"]
+    assert results and all(set(result) == {"steps", "group", "name", "value", "unit"} for result in results)
+    assert {result["steps"] for result in results} == {120}
+    groups = {result["group"] for result in results}
+    assert {"load", "reload", "scheduling", "单一产品详情", "多产品对比", "分类概览", "全文检索"} <= groups
+    assert all(result["value"] >= 0 for result in results if result["unit"] == "s")
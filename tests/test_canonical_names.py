@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+from pharma_process.canonical_names import NameCanonicalizer, build_canonicalizers, variant_groups
+
+SYNONYMS = {"分析天平": ["电子天平", "精密电子天平"]}
+SUFFIXES = ["设备", "机"]
+
+
+@pytest.fixture
+def canonicalizer():
+    return NameCanonicalizer(SYNONYMS, SUFFIXES)
+
+
+def test_synonyms_map_to_standard_name(canonicalizer):
+    assert canonicalizer("精密电子天平") == canonicalizer("分析天平") == 0
+    assert canonicalizer.canonical("电子天平") == "分析天平"
+
+
+def test_normalized_key_ignores_width_case_space_and_suffix(canonicalizer):
+    first = canonicalizer("压片机")
+    assert canonicalizer("压片") == first
+    assert canonicalizer(" 压 片 设备") == first
+    assert canonicalizer("ＡＢ压片机") == canonicalizer("ab压片")
+    assert canonicalizer.names[first] == "压片机"
+    # 去掉后缀后过短的名称保留后缀
+    assert canonicalizer.normalize("筛机") == "筛机"
+
+
+def test_fuzzy_match_requires_equal_digits(canonicalizer):
+    base = canonicalizer("全自动胶囊填充机")
+    assert canonicalizer("全自动硬胶囊填充机") == base
+    assert canonicalizer("灌装机-3") != canonicalizer("灌装机-4")
+    assert canonicalizer("离心机") not in (base, 0)
+
+
+def test_find_and_canonical_do_not_register(canonicalizer):
+    size = len(canonicalizer)
+    assert canonicalizer.find("离心机") is None
+    assert canonicalizer.canonical("离心机") == "离心机"
+    assert canonicalizer.find("精密电子天平") == 0
+    assert len(canonicalizer) == size
+
+
+def test_canonical_ids_resolve_most_frequent_spelling_first():
+    values = pd.Series(["压片", "压片机", "压片机", None, "分析天平"])
+    first = NameCanonicalizer(SYNONYMS, SUFFIXES)
+    ids = first.canonical_ids(values)
+    assert ids.tolist()[3] == -1
+    assert ids[0] == ids[1] == ids[2]
+    assert first.names[ids[0]] == "压片机"
+    # 新建的规范化器解析同一列名称得到同样的结果，与此前解析过什么无关
+    second = NameCanonicalizer(SYNONYMS, SUFFIXES)
+    second("离心机")
+    assert [second.names[i] for i in second.canonical_ids(values) if i >= 0] == \
+        [first.names[i] for i in ids if i >= 0]
+
+
+def test_categorical_lists_used_names_sorted(canonicalizer):
+    ids = canonicalizer.canonical_ids(pd.Series(["压片机", "分析天平", "压片机"]))
+    categorical = canonicalizer.categorical(list(ids) + [-1])
+    assert list(categorical.categories) == sorted(["压片机", "分析天平"])
+    assert list(categorical[:3]) == ["压片机", "分析天平", "压片机"]
+    assert pd.isna(categorical[3])
+
+
+def test_build_canonicalizers_returns_fresh_instances():
+    first, second = build_canonicalizers(), build_canonicalizers()
+    assert set(first) == {"设备", "参数"}
+    assert first["设备"] is not second["设备"]
+    first["设备"]("离心机")
+    assert second["设备"].find("离心机") is None
+    assert first["参数"].canonical("含水量") == "水分含量"
+
+
+def test_variant_groups_reports_merged_names(processes):
+    from pharma_process.process_store import ProcessStore
+
+    processes["化学药物-固体制剂"]["胶囊剂"]["工艺步骤"][0]["设备"] = ["电子天平"]
+    equipment = ProcessStore(processes).facts.equipment
+    report = variant_groups(equipment, "设备ID", "设备名称", "标准设备名称")
+    assert report.to_dict("records") == [
+        {"规范名称": "分析天平", "原始写法": "电子天平、精密电子天平", "写法数": 2, "使用次数": 2},
+    ]
@@ -0,0 +1,86 @@
+import pytest
+
+from pharma_process.catalog_versions import (CatalogDiff, CatalogRepository, catalog_hash, compare_product_versions,
+                                             hash_products, product_hash)
+
+TABLET = {
+    "description": "口服固体制剂",
+    "工艺步骤": [
+        {"name": "称量", "时间(h)": "1", "设备": ["电子天平"]},
+        {"name": "混合", "时间(h)": "2", "设备": ["混合机"]},
+        {"name": "压片", "时间(h)": "3", "设备": ["压片机"]},
+    ],
+}
+CAPSULE = {"description": "硬胶囊", "工艺步骤": [{"name": "填充", "时间(h)": "4", "设备": ["胶囊填充机"]}]}
+
+
+def _catalog(**overrides):
+    processes = {"固体制剂": {"片剂": TABLET, "胶囊剂": CAPSULE}}
+    for product, info in overrides.items():
+        if info is None:
+            processes["固体制剂"].pop(product)
+        else:
+            processes["固体制剂"][product] = info
+    return processes
+
+
+def test_product_hash_ignores_key_order():
+    reordered = {"工艺步骤": TABLET["工艺步骤"], "description": TABLET["description"]}
+    assert product_hash(reordered) == product_hash(TABLET)
+    assert product_hash({**TABLET, "description": "改"}) != product_hash(TABLET)
+
+
+def test_catalog_hash_ignores_product_order():
+    hashes = hash_products(_catalog())
+    assert catalog_hash(dict(reversed(list(hashes.items())))) == catalog_hash(hashes)
+    assert catalog_hash(hash_products(_catalog(胶囊剂=None))) != catalog_hash(hashes)
+
+
+def test_catalog_diff():
+    old = hash_products(_catalog())
+    new = hash_products(_catalog(片剂={**TABLET, "description": "改"}, 胶囊剂=None, 颗粒剂=CAPSULE))
+    diff = CatalogDiff(old, new)
+    assert diff.changed == [("固体制剂", "片剂")]
+    assert diff.added == [("固体制剂", "颗粒剂")]
+    assert diff.removed == [("固体制剂", "胶囊剂")]
+    assert diff.unchanged == 0
+    assert diff.summary()["变化"].tolist() == ["修改", "新增", "删除"]
+    assert CatalogDiff(old, old).is_empty
+
+
+def test_repository_commit_checkout_and_diff(tmp_path):
+    repository = CatalogRepository(tmp_path)
+    assert repository.head("总部") is None
+    assert repository.commit("总部", _catalog(), "初始版本") == 1
+    # 内容未变时不产生新版本
+    assert repository.commit("总部", _catalog()) == 1
+    changed = _catalog(片剂={**TABLET, "description": "改"})
+    assert repository.commit("总部", changed, "修改片剂") == 2
+    # 未变化的产品对象只写入一次
+    assert len(list((tmp_path / "objects").rglob("*.json"))) == 3
+
+    processes, hashes = repository.checkout("总部", 1)
+    assert processes == _catalog()
+    assert repository.manifest("总部")["catalog_version"] == catalog_hash(hash_products(changed))
+    assert [entry["version"] for entry in repository.versions("总部")] == [2, 1]
+    diff = repository.diff(("总部", 1), ("总部", None))
+    assert diff.changed == [("固体制剂", "片剂")] and diff.unchanged == 1
+    assert repository.sites() == ["总部"]
+    with pytest.raises(KeyError):
+        repository.manifest("总部", 3)
+
+
+@pytest.mark.parametrize("site", ["../outside", "a/b", "..", "", " 总部"])
+def test_repository_rejects_unsafe_site_names(tmp_path, site):
+    repository = CatalogRepository(tmp_path / "repo")
+    with pytest.raises(ValueError):
+        repository.commit(site, _catalog())
+    assert not (tmp_path / "outside").exists()
+
+
+def test_compare_product_versions_lists_step_changes():
+    steps = [dict(step) for step in TABLET["工艺步骤"]]
+    steps[1]["时间(h)"] = "3"
+    _, alignment, changes = compare_product_versions(TABLET, {**TABLET, "工艺步骤": steps})
+    assert alignment["操作"].tolist() == ["相同", "相同", "相同"]
+    assert changes[["步骤", "属性", "旧值", "新值"]].values.tolist() == [["混合", "时间(h)", "2", "3"]]
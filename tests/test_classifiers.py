@@ -0,0 +1,88 @@
+import json
+
+import pandas as pd
+import pytest
+
+from pharma_process.classifiers import CLASSIFIERS, DEFAULT_RULES_PATH, KeywordClassifier, load_rules
+
+# 改为规则表之前 app.py 中 if/elif 链的关键词，按分支顺序排列
+LEGACY_RULES = {
+    "参数类型": ("其他参数", [
+        ("物理化学参数", ["温度", "压力", "ph", "浓度"]),
+        ("过程控制参数", ["时间", "速率", "速度"]),
+        ("质量参数", ["含量", "纯度", "杂质"]),
+        ("经济性参数", ["收率", "效率", "产量"]),
+    ]),
+    "重要程度": (2, [
+        (5, ["无菌", "灭菌", "病毒", "安全"]),
+        (4, ["含量", "纯度", "关键质量"]),
+        (3, ["温度", "时间", "ph"]),
+    ]),
+    "设备类型": ("其他设备", [
+        ("生物反应设备", ["反应器", "发酵罐", "生物"]),
+        ("分离纯化设备", ["离心", "过滤", "层析", "纯化"]),
+        ("干燥浓缩设备", ["干燥", "浓缩", "蒸发"]),
+        ("混合制备设备", ["混合", "搅拌", "制粒"]),
+        ("灌装包装设备", ["灌装", "包装", "贴标"]),
+        ("灭菌消毒设备", ["灭菌", "消毒"]),
+    ]),
+}
+
+# 关键词重叠、大小写与优先级冲突的名称
+TRICKY_NAMES = ["", "PH值", "pH 温度", "灭菌时间", "含量与收率", "无菌含量", "生物安全柜", "离心干燥机",
+                "混合灌装线", "蒸汽灭菌柜", "冷冻干燥浓缩", "ph", "Ph计", "收获率", "产量效率"]
+
+
+def _if_elif_chain(default, branches, name):
+    """与原 if/elif 链逐分支相同的判断"""
+    lower = name.lower()
+    for label, words in branches:
+        if any(word in lower for word in words):
+            return label
+    return default
+
+
+def _catalog_names():
+    with open(DEFAULT_RULES_PATH.with_name("processes.json"), encoding="utf-8") as f:
+        processes = json.load(f)
+    parameters, equipment = set(), set()
+    for products in processes.values():
+        for info in products.values():
+            for step in info["工艺步骤"]:
+                parameters.update(step.get("关键参数", []))
+                equipment.update(step.get("设备", []))
+    return sorted(parameters), sorted(equipment)
+
+
+PARAMETERS, EQUIPMENT = _catalog_names()
+
+
+@pytest.mark.parametrize("table", list(LEGACY_RULES))
+def test_matches_legacy_if_elif_chain(table):
+    default, branches = LEGACY_RULES[table]
+    classifier = KeywordClassifier([{"label": label, "keywords": words} for label, words in branches], default)
+    names = (EQUIPMENT if table == "设备类型" else PARAMETERS) + TRICKY_NAMES
+    assert [classifier(name) for name in names] == [_if_elif_chain(default, branches, name) for name in names]
+
+
+@pytest.mark.parametrize("table", list(LEGACY_RULES))
+def test_shipped_rules_match_sequential_evaluation(table):
+    spec = load_rules()[table]
+    branches = [(rule["label"], rule["keywords"]) for rule in spec["rules"]]
+    names = (EQUIPMENT if table == "设备类型" else PARAMETERS) + TRICKY_NAMES
+    classifier = CLASSIFIERS[table]
+    assert [classifier(name) for name in names] == [_if_elif_chain(spec["default"], branches, name) for name in names]
+
+
+def test_classify_series_handles_plain_and_categorical_columns():
+    classifier = CLASSIFIERS["设备类型"]
+    names = pd.Series(["离心机", "压片机", "离心机", "发酵罐"], index=[10, 11, 12, 13])
+    expected = ["分离纯化设备", "其他设备", "分离纯化设备", "生物反应设备"]
+    assert classifier.classify_series(names).tolist() == expected
+    categorical = classifier.classify_series(names.astype("category"))
+    assert categorical.tolist() == expected
+    assert categorical.index.tolist() == [10, 11, 12, 13]
+
+
+def test_empty_rule_table_returns_default():
+    assert KeywordClassifier([], "其他")("任意名称") == "其他"
@@ -0,0 +1,114 @@
+import json
+
+import numpy as np
+import pytest
+
+from pharma_process.catalog_versions import product_hash
+from pharma_process.compact_catalog import CompactCatalog, InternPool, memory_footprint
+from pharma_process.process_store import ProcessStore
+
+TABLET = ("化学药物-固体制剂", "片剂")
+CAPSULE = ("化学药物-固体制剂", "胶囊剂")
+VACCINE = ("生物制品", "疫苗")
+
+
+def test_round_trip_preserves_values_and_key_order(processes):
+    # 非列表的设备、数值与布尔取值、缺少名称的步骤、没有工艺步骤的产品都按原样还原
+    steps = processes["化学药物-固体制剂"]["片剂"]["工艺步骤"]
+    steps[0]["设备"] = "精密电子天平"
+    steps[1]["依赖"] = [0]
+    steps[2] = {"时间(h)": 4.0, "name": "干燥", "在线监测": True, "设备": ["流化床干燥机", 3]}
+    steps.append({"关键参数": []})
+    processes["生物制品"]["血液制品"] = {"description": None, "关键特征": {"来源": "血浆"}}
+    processes["中药制剂"] = {}
+    catalog = CompactCatalog(processes)
+    restored = catalog.to_dict()
+    assert restored == processes
+    assert json.dumps(restored, ensure_ascii=False) == json.dumps(processes, ensure_ascii=False)
+    assert catalog.products_by_category()["中药制剂"] == ()
+    assert catalog.num_steps == 10
+    assert product_hash(catalog[TABLET]) == product_hash(processes["化学药物-固体制剂"]["片剂"])
+
+
+def test_restored_products_are_independent_copies(processes):
+    catalog = CompactCatalog(processes)
+    product = catalog[VACCINE]
+    product["工艺步骤"][0]["设备"].append("离心机")
+    product["关键特征"].append("新特征")
+    assert catalog[VACCINE] == processes["生物制品"]["疫苗"]
+
+
+def test_intern_pool_distinguishes_types():
+    pool = InternPool()
+    ids = [pool.intern(value) for value in (1, 1.0, True, "1", None, [1], 1)]
+    assert ids == [0, 1, 2, 3, 4, 5, 0]
+    assert pool.intern_names(["a", "b", "a"]) == [6, 7, 6]
+    assert pool.intern_names(["a", 2]) is None
+
+
+def test_compacted_pool_remaps_ids():
+    pool = InternPool()
+    for value in ("a", "b", 3, "c"):
+        pool.intern(value)
+    compacted, mapping = pool.compacted(np.array([1, 2]))
+    assert compacted.values == ["b", 3]
+    assert mapping.tolist() == [-1, 0, 1, -1]
+    assert compacted.intern("b") == 0 and compacted.intern(3) == 1 and compacted.intern("d") == 2
+
+
+def test_updated_matches_full_encoding(processes):
+    catalog = CompactCatalog(processes)
+    processes["生物制品"]["疫苗"]["工艺步骤"][1]["设备"] = ["灭活罐", "离心机"]
+    del processes["化学药物-固体制剂"]["胶囊剂"]
+    processes["中药制剂"] = {"丸剂": {"description": "水丸", "工艺步骤": [{"name": "泛丸", "设备": ["泛丸锅"]}]}}
+    updated = catalog.updated(processes, [VACCINE, ("中药制剂", "丸剂")])
+    assert updated.to_dict() == processes
+    assert list(updated) == [TABLET, VACCINE, ("中药制剂", "丸剂")]
+    assert CAPSULE not in updated
+    # 原目录不受影响，新目录沿用其驻留表
+    assert catalog[CAPSULE]["工艺步骤"][1]["name"] == "填充"
+    assert updated.values is catalog.values
+
+
+def test_compact_drops_unreferenced_values(processes):
+    catalog = CompactCatalog(processes)
+    pool = catalog.values
+    only_vaccine = {"生物制品": processes["生物制品"]}
+    updated = catalog.updated(only_vaccine, [])
+    assert updated.values is not pool
+    assert len(updated.values) == len(updated.value_ids()) < len(pool)
+    assert updated.to_dict() == only_vaccine
+    # 原目录仍使用未压缩的驻留表
+    assert catalog.values is pool and catalog.to_dict() == processes
+
+
+def test_compact_keeps_pool_below_ratio(processes):
+    catalog = CompactCatalog(processes)
+    processes["生物制品"]["疫苗"]["description"] = "减毒活疫苗"
+    updated = catalog.updated(processes, [VACCINE])
+    assert updated.values is catalog.values
+    updated._compact(ratio=0.0)
+    assert updated.values is not catalog.values
+    assert updated.to_dict() == processes
+
+
+def test_each_store_lineage_has_its_own_pool(processes):
+    store = ProcessStore(processes)
+    processes["生物制品"]["疫苗"]["description"] = "减毒活疫苗"
+    updated = store.updated(processes)
+    rebuilt = ProcessStore(processes)
+    assert updated.catalog.values is store.catalog.values
+    assert rebuilt.catalog.values is not store.catalog.values
+    assert rebuilt.catalog.to_dict() == updated.catalog.to_dict() == processes
+
+
+def test_memory_footprint(processes):
+    footprint = memory_footprint(processes, CompactCatalog(processes))
+    assert footprint["紧凑合计"] == footprint["紧凑数组"] + footprint["驻留取值"] + footprint["布局表"]
+    assert all(size > 0 for size in footprint.values())
+
+
+@pytest.mark.parametrize("steps", [0, 1])
+def test_products_without_steps_round_trip(steps):
+    processes = {"分类": {"产品": {"工艺步骤": [{"name": "步骤"}] * steps}}}
+    assert CompactCatalog(processes).to_dict() == processes
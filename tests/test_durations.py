@@ -0,0 +1,43 @@
+import pytest
+
+from pharma_process.durations import find_duration, format_hours, normalize_durations
+from pharma_process.fact_tables import FactTables
+
+
+@pytest.mark.parametrize("step, expected", [
+    ({"name": "混合", "时间(h)": "2"}, ("2", "h")),
+    ({"name": "发酵", "时间（天）": "3-5"}, ("3-5", "天")),
+    ({"name": "干燥", "Time(H)": 4}, (4, "h")),
+    ({"name": "包装"}, (None, None)),
+])
+def test_find_duration(step, expected):
+    assert find_duration(step) == expected
+
+
+def test_normalize_single_values_and_ranges():
+    result = normalize_durations(["2", "2-4", "12~24h", "3天", "1.5"], ["h", "h", "天", "h", "周"])
+    assert result["时长下限(h)"].tolist() == [2.0, 2.0, 12.0, 72.0, 252.0]
+    assert result["时长上限(h)"].tolist() == [2.0, 4.0, 24.0, 72.0, 252.0]
+    assert result["时长(h)"].tolist() == [2.0, 3.0, 18.0, 72.0, 252.0]
+
+
+def test_normalize_display_keeps_explicit_unit():
+    result = normalize_durations(["2-3", "12~24h", "5"], ["h", "天", "d"])
+    assert result["工艺时间"].tolist() == ["2-3 小时", "12~24h", "5 天"]
+
+
+def test_normalize_unparsable_values_are_nan():
+    result = normalize_durations(["多次", None, "2"], ["h", "h", "分钟"])
+    assert result["时长(h)"].isna().tolist() == [True, True, True]
+
+
+def test_format_hours():
+    assert format_hours(12) == "12.0 小时"
+    assert format_hours(96) == "96.0 小时（约 4.0 天）"
+
+
+def test_step_facts_use_each_step_unit(processes):
+    steps = FactTables(processes).product_steps("生物制品", "疫苗")
+    assert steps["时长下限(h)"].tolist() == [72.0, 24.0, 48.0]
+    assert steps["时长上限(h)"].tolist() == [120.0, 24.0, 48.0]
+    assert steps["工艺时间"].tolist() == ["3-5 天", "24 小时", "48 小时"]
@@ -0,0 +1,73 @@
+import pytest
+
+from pharma_process.process_store import ProcessStore
+
+TABLET = ("化学药物-固体制剂", "片剂")
+CAPSULE = ("化学药物-固体制剂", "胶囊剂")
+VACCINE = ("生物制品", "疫苗")
+
+
+@pytest.fixture
+def incidence(processes):
+    # 胶囊剂的天平写法不同，压片也用到天平；同义词表把精密电子天平规范为 分析天平
+    processes["化学药物-固体制剂"]["胶囊剂"]["工艺步骤"][0]["设备"] = ["精密 电子天平"]
+    processes["化学药物-固体制剂"]["片剂"]["工艺步骤"][3]["设备"].append("精密电子天平")
+    return ProcessStore(processes).equipment_incidence
+
+
+def test_matrices_count_step_usage(incidence):
+    assert incidence.product_equipment.shape == (3, 9)
+    assert incidence.product_equipment.sum() == 11
+    assert (incidence.equipment_products != incidence.product_equipment.tocsc()).nnz == 0
+    assert incidence.step_equipment.sum(axis=1).ravel().tolist() == [[1, 1, 2, 2, 1, 1, 1, 1, 1]]
+
+
+def test_equipment_usage(incidence):
+    usage = incidence.equipment_usage().set_index("设备名称")
+    assert usage.index[0] == "分析天平"
+    assert usage.loc["分析天平", ["产品数", "分类数", "使用次数"]].tolist() == [2, 1, 3]
+    assert usage.loc["冻干机", ["产品数", "分类数", "使用次数"]].tolist() == [1, 1, 1]
+
+
+def test_products_using_resolves_variants(incidence):
+    using = incidence.products_using("精密 电子天平")
+    assert using["产品"].tolist() == ["片剂", "胶囊剂"]
+    assert using["使用次数"].tolist() == [2, 1]
+    assert using["使用步骤"].tolist() == ["称配, 压片", "称配"]
+    with pytest.raises(KeyError, match="设备不存在"):
+        incidence.products_using("离心机")
+
+
+def test_product_breakdown(incidence):
+    breakdown = incidence.product_breakdown(TABLET).set_index("设备名称")
+    assert list(breakdown.index) == sorted(breakdown.index)
+    assert len(breakdown) == 5
+    assert breakdown.loc["分析天平", "使用频率"] == 2
+    assert breakdown.loc["烘箱", "使用步骤"] == "干燥"
+    with pytest.raises(KeyError, match="产品不存在"):
+        incidence.product_breakdown(("生物制品", "血液制品"))
+
+
+def test_overlap(incidence):
+    overlap = incidence.overlap(TABLET, CAPSULE)
+    assert overlap["归属"].tolist() == ["共用"] + ["仅A"] * 4 + ["仅B"]
+    assert overlap.iloc[0][["设备名称", "A使用次数", "B使用次数"]].tolist() == ["分析天平", 2, 1]
+    assert overlap["设备名称"].iat[-1] == "全自动胶囊填充机"
+    assert set(incidence.overlap(TABLET, VACCINE)["归属"]) == {"仅A", "仅B"}
+
+
+def test_category_co_usage(incidence):
+    shared, jaccard = incidence.category_co_usage()
+    assert shared.loc["化学药物-固体制剂", "化学药物-固体制剂"] == 6
+    assert shared.loc["生物制品", "生物制品"] == 3
+    assert shared.loc["化学药物-固体制剂", "生物制品"] == 0
+    assert jaccard.loc["生物制品", "生物制品"] == 1.0
+
+
+def test_incidence_after_incremental_update(processes):
+    store = ProcessStore(processes)
+    processes["生物制品"]["疫苗"]["工艺步骤"][2]["设备"].append("精密电子天平")
+    updated = store.updated(processes).equipment_incidence
+    rebuilt = ProcessStore(processes).equipment_incidence
+    assert updated.equipment_usage().equals(rebuilt.equipment_usage())
+    assert updated.products_using("精密电子天平")["产品"].tolist() == ["片剂", "胶囊剂", "疫苗"]
@@ -0,0 +1,111 @@
+import copy
+
+import pandas as pd
+import pytest
+
+from pharma_process import analytics
+from pharma_process.fact_tables import FactTables
+from pharma_process.process_store import ProcessStore
+
+TABLET = ("化学药物-固体制剂", "片剂")
+CAPSULE = ("化学药物-固体制剂", "胶囊剂")
+VACCINE = ("生物制品", "疫苗")
+
+
+def _changed_catalog(processes):
+    """修改片剂（新增步骤与新名称）、删除胶囊剂、新增一个分类的产品"""
+    changed = copy.deepcopy(processes)
+    changed["化学药物-固体制剂"]["片剂"]["工艺步骤"].append(
+        {"name": "包衣", "关键参数": ["包衣增重", "进风温度"], "设备": ["高效包衣锅"], "时间(h)": 6, "温度(℃)": "40-50"})
+    del changed["化学药物-固体制剂"]["胶囊剂"]
+    changed["中药制剂"] = {"丸剂": {"description": "水丸", "关键特征": [], "工艺步骤": [
+        {"name": "泛丸", "关键参数": ["水分含量"], "设备": ["泛丸锅"], "时间(天)": 1, "温度(℃)": "室温"},
+    ]}}
+    return changed
+
+
+def _as_text(frame):
+    """分类列在增量更新前后的分类集合不同，按取值比较"""
+    return frame.astype({column: str for column in frame.columns if isinstance(frame[column].dtype, pd.CategoricalDtype)})
+
+
+def _product_rows(facts, table, key):
+    rows = getattr(facts, table).iloc[getattr(facts, {"steps": "step_slices", "parameters": "parameter_slices",
+                                                       "equipment": "equipment_slices"}[table])[key]]
+    return _as_text(rows.drop(columns=["步骤行号", "参数ID", "设备ID"], errors="ignore")).reset_index(drop=True)
+
+
+@pytest.fixture
+def facts_pair(processes):
+    store = ProcessStore(processes)
+    changed = _changed_catalog(processes)
+    return store.updated(changed).facts, FactTables(changed), changed
+
+
+def test_updated_tables_match_rebuild(facts_pair):
+    updated, rebuilt, changed = facts_pair
+    keys = [(category, product) for category, products in changed.items() for product in products]
+    assert list(updated.step_slices) == keys
+    for key in keys:
+        for table in ("steps", "parameters", "equipment"):
+            pd.testing.assert_frame_equal(_product_rows(updated, table, key), _product_rows(rebuilt, table, key))
+    pd.testing.assert_frame_equal(_as_text(updated.products), _as_text(rebuilt.products))
+    pd.testing.assert_frame_equal(_as_text(updated.categories).sort_values("分类", ignore_index=True),
+                                  _as_text(rebuilt.categories).sort_values("分类", ignore_index=True))
+
+
+def test_updated_tables_stay_consistent(facts_pair):
+    updated, _, _ = facts_pair
+    steps = updated.steps
+    # 各产品的行连续且覆盖整张表，参数与设备行指向同一产品、同一序号的步骤
+    assert sorted((part.start, part.stop) for part in updated.step_slices.values())[-1][1] == len(steps)
+    for key, part in updated.step_slices.items():
+        assert (steps["分类"].iloc[part].astype(str) == key[0]).all()
+        assert (steps["产品"].iloc[part].astype(str) == key[1]).all()
+    for table in (updated.parameters, updated.equipment):
+        target = steps.iloc[table["步骤行号"].to_numpy()]
+        assert (target["产品"].astype(str).to_numpy() == table["产品"].astype(str).to_numpy()).all()
+        assert (target["步骤序号"].to_numpy() == table["步骤序号"].to_numpy()).all()
+    # 分类列在拼接后仍为 category，新名称已加入分类集合
+    assert isinstance(steps["步骤名称"].dtype, pd.CategoricalDtype)
+    assert "包衣" in steps["步骤名称"].cat.categories
+    assert "高效包衣锅" in updated.equipment["设备名称"].cat.categories
+
+
+def test_updated_keeps_canonical_ids(processes):
+    store = ProcessStore(processes)
+    updated = store.updated(_changed_catalog(processes))
+    assert updated.facts.parameter_canonicalizer is store.facts.parameter_canonicalizer
+    before = store.facts.product_parameters(*VACCINE)["参数ID"].tolist()
+    assert updated.facts.product_parameters(*VACCINE)["参数ID"].tolist() == before
+    assert updated.diff.changed == [TABLET]
+    assert updated.diff.removed == [CAPSULE]
+    assert store.updated(processes) is store
+
+
+def test_updated_detects_changes_by_content_hash(processes):
+    store = ProcessStore(processes)
+    reordered = {category: dict(reversed(list(products.items()))) for category, products in processes.items()}
+    # 只调整顺序、内容未变时不重建
+    assert store.updated(reordered) is store
+    processes["生物制品"]["疫苗"]["工艺步骤"][0]["温度(℃)"] = "36-38"
+    assert store.updated(processes).diff.changed == [VACCINE]
+
+
+def test_product_caches_are_scoped_to_store_lineage(processes, monkeypatch):
+    store = ProcessStore(processes)
+    monkeypatch.setattr(analytics, "get_store", lambda: store)
+    analytics.product_statistics.cache_clear()
+    analytics.product_statistics(*VACCINE)
+    # 增量更新沿用谱系，未变化的产品命中缓存
+    store = store.updated(_changed_catalog(processes))
+    analytics.product_statistics(*VACCINE)
+    assert analytics.product_statistics.cache_info().hits == 1
+    # 完整重建的存储重新计算，即使内容相同
+    rebuilt = ProcessStore(processes)
+    assert rebuilt.product_hash(*VACCINE) == store.product_hash(*VACCINE)
+    assert rebuilt.lineage != store.lineage
+    store = rebuilt
+    analytics.product_statistics(*VACCINE)
+    assert analytics.product_statistics.cache_info().hits == 1
+    assert analytics.product_statistics.cache_info().misses == 2
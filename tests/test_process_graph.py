@@ -0,0 +1,93 @@
+import pytest
+
+from pharma_process.fact_tables import FactTables
+from pharma_process.process_graph import ProcessGraph, has_dependencies
+from pharma_process.process_store import ProcessStore
+
+
+def _steps(*specs):
+    """(名称, 依赖或 None) → 工艺步骤列表，依赖为 None 时不写 依赖 字段"""
+    steps = []
+    for name, deps in specs:
+        step = {"name": name}
+        if deps is not None:
+            step["依赖"] = deps
+        steps.append(step)
+    return steps
+
+
+def test_steps_without_dependencies_are_linear():
+    steps = _steps(("称量", None), ("混合", None), ("压片", None))
+    graph = ProcessGraph.from_steps(steps, [1.0, 2.0, 3.0])
+    assert not has_dependencies(steps)
+    assert graph.predecessors == [[], [0], [1]]
+    assert not graph.has_branches
+    assert graph.makespan == 6.0
+    assert graph.critical_path() == [0, 1, 2]
+
+
+def test_parallel_branches_and_critical_path():
+    # 称量 → (制粒 ∥ 配液) → 包衣；配液较长，位于关键路径上
+    steps = _steps(("称量", []), ("制粒", ["称量"]), ("配液", [1]), ("包衣", ["制粒", "配液"]))
+    graph = ProcessGraph.from_steps(steps, [1.0, 2.0, 5.0, 1.0])
+    assert graph.has_branches
+    assert graph.makespan == 7.0
+    assert graph.critical_path() == [0, 2, 3]
+    schedule = graph.schedule()
+    assert schedule["最早开始(h)"].tolist() == [0.0, 1.0, 1.0, 6.0]
+    assert schedule["浮动时间(h)"].tolist() == [0.0, 3.0, 0.0, 0.0]
+    assert schedule["关键路径"].tolist() == [True, False, True, True]
+    assert graph.layers() == [0, 1, 1, 2]
+
+
+def test_missing_durations_count_as_zero():
+    graph = ProcessGraph.from_steps(_steps(("A", None), ("B", None)), [float("nan"), None])
+    assert graph.durations == [0.0, 0.0]
+    assert graph.makespan == 0.0
+
+
+def test_cycle_is_rejected():
+    steps = _steps(("A", ["C"]), ("B", ["A"]), ("C", ["B"]))
+    with pytest.raises(ValueError, match="循环"):
+        ProcessGraph.from_steps(steps, [1.0, 1.0, 1.0])
+
+
+def test_linear_ignores_declared_dependencies():
+    graph = ProcessGraph.linear(["A", "B", "C"], [1.0, 2.0, 3.0])
+    assert graph.predecessors == [[], [0], [1]]
+    assert graph.order == [0, 1, 2]
+    assert graph.makespan == 6.0
+
+
+def test_invalid_graph_falls_back_to_linear_without_failing_the_load(processes):
+    steps = processes["化学药物-固体制剂"]["片剂"]["工艺步骤"]
+    steps[0]["依赖"] = ["压片"]
+    steps[3]["依赖"] = ["制粒", "干燥"]
+    with pytest.warns(UserWarning, match="片剂"):
+        facts = FactTables(processes)
+    key = ("化学药物-固体制剂", "片剂")
+    assert "循环" in facts.graph_errors[key]
+    summary = facts.product_summaries([key]).iloc[0]
+    assert summary["关键路径工期(h)"] == summary["总工艺时间(h)"] == 12.0
+    graph = facts.product_graph(*key, steps)
+    assert graph.predecessors == [[], [0], [1], [2]]
+
+
+def test_parallel_steps_shorten_critical_path(processes):
+    steps = processes["化学药物-固体制剂"]["片剂"]["工艺步骤"]
+    steps[1]["依赖"] = ["称配"]
+    steps[2]["依赖"] = ["称配"]
+    steps[3]["依赖"] = ["制粒", "干燥"]
+    store = ProcessStore(processes)
+    summary = store.facts.product_summaries([("化学药物-固体制剂", "片剂")]).iloc[0]
+    assert summary["总工艺时间(h)"] == 12.0
+    assert summary["关键路径工期(h)"] == 9.0
+    assert not store.facts.graph_errors
+
+
+@pytest.mark.parametrize("deps, message", [
+    (["不存在"], "不存在"), ([3], "超出范围"), ([0], "超出范围"), ([True], "名称或序号"), ([False], "名称或序号"),
+])
+def test_invalid_dependencies_are_rejected(deps, message):
+    with pytest.raises(ValueError, match=message):
+        ProcessGraph.from_steps(_steps(("A", None), ("B", deps)), [1.0, 1.0])
@@ -0,0 +1,78 @@
+import csv
+import json
+
+import pytest
+
+from pharma_process.process_store import ProcessStore, load_catalog
+
+CSV_FIELDS = ["分类", "产品", "description", "关键特征", "name", "关键参数", "设备", "时间(h)", "温度(℃)", "依赖"]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({field: row.get(field, "") for field in CSV_FIELDS})
+
+
+def test_csv_loader_groups_steps_by_product(tmp_path):
+    path = tmp_path / "catalog.csv"
+    _write_csv(path, [
+        {"分类": "固体制剂", "产品": "片剂", "description": "口服", "关键特征": "剂量准确|稳定性好",
+         "name": "制粒", "关键参数": "粒度分布 | 水分", "设备": "制粒机", "时间(h)": "3", "温度(℃)": "25-35"},
+        {"分类": "固体制剂", "产品": "片剂", "name": "压片", "关键参数": "硬度", "设备": "压片机|除尘器",
+         "时间(h)": "1.5", "依赖": "1|制粒"},
+        {"分类": "固体制剂", "产品": "胶囊剂", "name": "填充", "设备": "胶囊填充机"},
+    ])
+    catalog = load_catalog(path)
+    assert list(catalog) == ["固体制剂"]
+    assert list(catalog["固体制剂"]) == ["片剂", "胶囊剂"]
+    tablet = catalog["固体制剂"]["片剂"]
+    assert tablet["description"] == "口服"
+    assert tablet["关键特征"] == ["剂量准确", "稳定性好"]
+    assert tablet["工艺步骤"] == [
+        {"name": "制粒", "关键参数": ["粒度分布", "水分"], "设备": ["制粒机"], "时间(h)": 3, "温度(℃)": "25-35"},
+        {"name": "压片", "关键参数": ["硬度"], "设备": ["压片机", "除尘器"], "时间(h)": 1.5, "依赖": [1, "制粒"]},
+    ]
+    assert catalog["固体制剂"]["胶囊剂"]["工艺步骤"] == [{"name": "填充", "关键参数": [], "设备": ["胶囊填充机"]}]
+
+
+def test_json_and_csv_load_the_same_store(tmp_path, processes):
+    json_path = tmp_path / "catalog.json"
+    json_path.write_text(json.dumps(processes, ensure_ascii=False), encoding="utf-8")
+    _write_csv(tmp_path / "catalog.csv", [
+        {"分类": category, "产品": product, "description": info["description"], "关键特征": "|".join(info["关键特征"]),
+         "name": step["name"], "关键参数": "|".join(step["关键参数"]), "设备": "|".join(step["设备"]),
+         "时间(h)": step.get("时间(h)", ""), "温度(℃)": step["温度(℃)"]}
+        for category, products in processes.items() for product, info in products.items()
+        for step in info["工艺步骤"] if "时间(h)" in step
+    ])
+    from_json = ProcessStore.from_file(json_path)
+    from_csv = ProcessStore.from_file(tmp_path / "catalog.csv")
+    assert from_json.get_product_info("化学药物-固体制剂", "片剂") == from_csv.get_product_info("化学药物-固体制剂", "片剂")
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="不支持"):
+        load_catalog(tmp_path / "catalog.xml")
+
+
+def test_store_lookups(processes):
+    store = ProcessStore(processes)
+    assert list(store.get_main_categories()) == ["化学药物-固体制剂", "生物制品"]
+    assert list(store.get_products("化学药物-固体制剂")) == ["片剂", "胶囊剂"]
+    assert list(store.get_products("不存在")) == []
+    assert store.get_product_info("生物制品", "疫苗") == processes["生物制品"]["疫苗"]
+    assert store.get_product_info("生物制品", "不存在") == {}
+    assert store.find_by_step("称配") == [("化学药物-固体制剂", "片剂", 0), ("化学药物-固体制剂", "胶囊剂", 0)]
+    assert store.find_by_parameter("水分含量") == [("化学药物-固体制剂", "片剂", 2), ("生物制品", "疫苗", 2)]
+    assert store.find_by_equipment("烘箱") == [("化学药物-固体制剂", "片剂", 2)]
+    assert store.find_by_equipment("不存在") == []
+    assert store.processes == processes
+
+
+def test_product_info_is_a_copy(processes):
+    store = ProcessStore(processes)
+    store.get_product_info("生物制品", "疫苗")["工艺步骤"].clear()
+    assert len(store.get_product_info("生物制品", "疫苗")["工艺步骤"]) == 3
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pharma_process.scheduling import CHECKPOINT_INTERVAL, CampaignScheduler
+from pharma_process.simulation import ProductRecipe
+
+TABLET = ("固体制剂", "片剂")
+CAPSULE = ("固体制剂", "胶囊剂")
+SYRUP = ("液体制剂", "糖浆剂")
+
+
+def _recipe(key, durations, equipment, predecessors=None):
+    durations = np.asarray(durations, dtype="float64")
+    if predecessors is None:
+        predecessors = [[i - 1] if i > 0 else [] for i in range(len(durations))]
+    names = [f"{key[1]}-{i + 1}" for i in range(len(durations))]
+    return ProductRecipe(key, names, durations, durations, durations, equipment, predecessors)
+
+
+@pytest.fixture
+def recipes():
+    return {
+        TABLET: _recipe(TABLET, [2.0, 3.0, 1.0, 2.0], [("混合机",), ("制粒机",), ("干燥箱",), ("压片机", "除尘器")],
+                        [[], [0], [0], [1, 2]]),
+        CAPSULE: _recipe(CAPSULE, [2.0, 4.0], [("混合机",), ("胶囊填充机",)]),
+        SYRUP: _recipe(SYRUP, [1.0, 3.0, 0.5], [("配液罐",), ("混合机",), ()]),
+    }
+
+
+DEMAND = {TABLET: 4, CAPSULE: 3, SYRUP: 2}
+
+
+def _intervals_disjoint(frame):
+    for _, rows in frame.sort_values("开始(h)").groupby("设备"):
+        starts = rows["开始(h)"].to_numpy()
+        ends = rows["结束(h)"].to_numpy()
+        assert (starts[1:] >= ends[:-1] - 1e-9).all()
+
+
+def _check_schedule(recipes, scheduler, schedule):
+    tasks = schedule.tasks
+    # 每个批次的全部步骤都被排入
+    assert tasks.groupby("产品")["批次"].nunique().to_dict() == {key[1]: n for key, n in DEMAND.items()}
+    assert len(tasks) == sum(len(scheduler._names[i]) * DEMAND[key] for i, key in enumerate(scheduler.products))
+    assert schedule.makespan == pytest.approx(tasks["结束(h)"].max())
+    # 同一设备单元上的生产与换产互不重叠
+    _intervals_disjoint(schedule.equipment_tasks)
+    assert (schedule.equipment_tasks["类型"] == "换产").sum() == schedule.changeovers
+    # 步骤在同一批次的前置步骤完成后才开始
+    for _, rows in tasks.groupby("批次"):
+        recipe = recipes[(rows["分类"].iat[0], rows["产品"].iat[0])]
+        finish = dict(zip(rows["步骤"], rows["结束(h)"]))
+        for name, start in zip(rows["步骤"], rows["开始(h)"]):
+            for pred in recipe.predecessors[recipe.names.index(name)]:
+                assert start >= finish[recipe.names[pred]] - 1e-9
+    assert (schedule.equipment["利用率"] <= 1.0 + 1e-9).all()
+
+
+@pytest.mark.parametrize("units", [{}, {"混合机": 2}])
+def test_greedy_orders_decode_to_valid_schedules(recipes, units):
+    scheduler = CampaignScheduler(recipes, DEMAND, units)
+    for order in scheduler.greedy_orders().values():
+        assert sorted(order) == sorted(i for i, key in enumerate(scheduler.products) for _ in range(DEMAND[key]))
+        _check_schedule(recipes, scheduler, scheduler.schedule(order))
+
+
+def test_grouped_order_changes_over_least(recipes):
+    scheduler = CampaignScheduler(recipes, DEMAND)
+    orders = scheduler.greedy_orders()
+    grouped = scheduler.schedule(orders["成组"])
+    interleaved = scheduler.schedule(orders["轮流"])
+    assert grouped.changeovers <= interleaved.changeovers
+    assert len(grouped.campaigns()) == len(DEMAND)
+    assert grouped.campaigns()["批次数"].sum() == sum(DEMAND.values())
+
+
+@pytest.mark.parametrize("objective", ["makespan", "changeovers"])
+def test_solve_improves_on_greedy_and_is_reproducible(recipes, objective):
+    scheduler = CampaignScheduler(recipes, DEMAND, changeover_hours=2.0)
+    schedule = scheduler.solve(objective, iterations=300, time_limit=60.0, seed=7)
+    _check_schedule(recipes, scheduler, schedule)
+    index = 0 if objective == "makespan" else 1
+    value = (schedule.makespan, schedule.changeovers)
+    assert value[index] <= min(greedy[index] for greedy in scheduler.greedy_values.values())
+    again = CampaignScheduler(recipes, DEMAND, changeover_hours=2.0).solve(objective, iterations=300,
+                                                                           time_limit=60.0, seed=7)
+    assert again.order == schedule.order
+    pd.testing.assert_frame_equal(again.tasks, schedule.tasks)
+
+
+def test_checkpointed_decode_matches_full_decode(recipes):
+    scheduler = CampaignScheduler(recipes, DEMAND)
+    order = scheduler.greedy_orders()["轮流"]
+    checkpoints = []
+    full = scheduler._decode(order, checkpoints=checkpoints)
+    for index, state in enumerate(checkpoints):
+        assert scheduler._decode(order, index * CHECKPOINT_INTERVAL, state) == full
+
+
+def test_invalid_unit_count_is_rejected(recipes):
+    with pytest.raises(ValueError, match="至少为 1"):
+        CampaignScheduler(recipes, DEMAND, {"混合机": 0})
+
+
+@pytest.mark.parametrize("demand", [{}, {("固体制剂", "空白"): 3}])
+def test_demand_without_steps_gives_empty_schedule(recipes, demand):
+    recipes[("固体制剂", "空白")] = _recipe(("固体制剂", "空白"), [], [])
+    result = CampaignScheduler(recipes, demand).solve(iterations=10)
+    assert result.makespan == 0.0 and result.changeovers == 0
+    assert result.tasks.empty and list(result.tasks.columns) == ["分类", "产品", "批次", "步骤", "设备", "开始(h)", "结束(h)"]
+    assert result.equipment_tasks.empty and "类型" in result.equipment_tasks.columns
+    assert result.equipment.empty and "利用率" in result.equipment.columns
+    assert result.campaigns()["批次数"].sum() == sum(demand.values())
+
+
+def test_zero_step_product_alongside_others(recipes):
+    recipes[("固体制剂", "空白")] = _recipe(("固体制剂", "空白"), [], [])
+    result = CampaignScheduler(recipes, {("固体制剂", "空白"): 2, CAPSULE: 2}).solve(iterations=50)
+    assert set(result.tasks["产品"]) == {"胶囊剂"}
+    assert len(result.order) == 4
+    assert result.makespan == pytest.approx(10.0)
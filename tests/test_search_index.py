@@ -0,0 +1,78 @@
+import pytest
+
+from pharma_process.process_store import ProcessStore
+from pharma_process.search_index import index_grams, query_grams
+
+QUERIES = ["称配", "干燥", "水分", "水", "机", "细胞 37", "PH", "剂 称量", "±", "℃", "±2℃", "不存在", "生物 冻干", "口服"]
+
+
+def _brute_force(processes, query):
+    """逐步骤子串匹配：步骤名称、关键参数、设备与所属产品的名称、分类、描述、关键特征"""
+    rows = []
+    row = 0
+    for category, products in processes.items():
+        for product, info in products.items():
+            product_text = " ".join([product, category, info["description"], *info["关键特征"]]).lower()
+            for step in info["工艺步骤"]:
+                texts = [step["name"], *step["关键参数"], *step["设备"]]
+                if all(word in product_text or any(word in text.lower() for text in texts)
+                       for word in query.lower().split()):
+                    rows.append(row)
+                row += 1
+    return rows
+
+
+def _step_ids(index, query):
+    steps = index.matched_steps(index.search(query))
+    return sorted(zip(steps["分类"].astype(str), steps["产品"].astype(str), steps["步骤序号"]))
+
+
+@pytest.fixture
+def symbol_processes(processes):
+    processes["化学药物-固体制剂"]["片剂"]["工艺步骤"][1]["关键参数"].append("温度±2℃")
+    return processes
+
+
+def test_grams():
+    assert query_grams("pH值") == {"ph", "h值"}
+    assert query_grams("水") == {"水"}
+    assert query_grams("±℃") == set()
+    assert index_grams("ph") == {"p", "h", "ph"}
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_substring_scan(symbol_processes, query):
+    index = ProcessStore(symbol_processes).search_index
+    assert index.search(query).tolist() == _brute_force(symbol_processes, query)
+
+
+def test_symbol_only_words_fall_back_to_substring_scan(symbol_processes):
+    index = ProcessStore(symbol_processes).search_index
+    assert index.matched_steps(index.search("℃"))["步骤名称"].tolist() == ["制粒"]
+
+
+def test_facet_filters(processes):
+    index = ProcessStore(processes).search_index
+    rows = index.search("", {"分类": ["生物制品"]})
+    assert index.matched_steps(rows)["步骤名称"].tolist() == ["细胞培养", "灭活", "冻干"]
+    rows = index.search("称配", {"分类": ["生物制品", "化学药物-固体制剂"], "参数类型": ["其他参数"]})
+    assert len(rows) == 2
+    # 干燥步骤同时有 进风温度，两个分面取值都计入
+    assert index.facet_counts(index.search("水分"), "参数类型").to_dict() == {"质量参数": 2, "物理化学参数": 1}
+    assert index.matched_products(index.search("称配"))["命中步骤数"].tolist() == [1, 1]
+
+
+def test_incremental_update_matches_rebuild(processes):
+    store = ProcessStore(processes)
+    changed = {category: dict(products) for category, products in processes.items()}
+    tablet = changed["化学药物-固体制剂"]["片剂"]
+    changed["化学药物-固体制剂"]["片剂"] = {**tablet, "description": "薄膜包衣片",
+                                      "工艺步骤": tablet["工艺步骤"] + [{"name": "包衣", "关键参数": ["增重率"],
+                                                                         "设备": ["高效包衣锅"]}]}
+    del changed["化学药物-固体制剂"]["胶囊剂"]
+    updated = store.updated(changed).search_index
+    rebuilt = ProcessStore(changed).search_index
+    # 增量更新后变化的产品位于事实表末尾，按步骤标识比较
+    for query in QUERIES + ["包衣", "薄膜", "硬胶囊", "填充"]:
+        assert _step_ids(updated, query) == _step_ids(rebuilt, query), query
+    assert updated.search("填充").tolist() == []
@@ -0,0 +1,92 @@
+import copy
+
+import numpy as np
+import pytest
+
+from pharma_process import similarity
+from pharma_process.process_store import ProcessStore
+from pharma_process.similarity import SimilarityIndex
+
+
+def _feature_sets(facts):
+    """各产品的特征集合：步骤名称与规范后的参数、设备名称"""
+    sets = {key: set() for key in facts.step_slices}
+    for prefix, table, column in SimilarityIndex.FIELDS:
+        frame = getattr(facts, table)
+        for category, product, name in zip(frame["分类"], frame["产品"], frame[column]):
+            sets[(category, product)].add(f"{prefix}:{name}")
+    return sets
+
+
+@pytest.fixture
+def catalog(processes):
+    # 与片剂完全相同和只差一步的两个产品
+    solids = processes["化学药物-固体制剂"]
+    solids["片剂（复制）"] = copy.deepcopy(solids["片剂"])
+    solids["咀嚼片"] = copy.deepcopy(solids["片剂"])
+    solids["咀嚼片"]["工艺步骤"][3] = {"name": "压制", "关键参数": ["硬度"], "设备": ["旋转压片机"]}
+    return processes
+
+
+def test_similarity_matches_set_definitions(catalog):
+    store = ProcessStore(catalog)
+    sets = _feature_sets(store.facts)
+    keys = list(sets)
+    cosine = store.similarity.similarity_matrix(keys, "cosine").to_numpy()
+    jaccard = store.similarity.similarity_matrix(keys, "jaccard").to_numpy()
+    for i, a in enumerate(keys):
+        for j, b in enumerate(keys):
+            shared = len(sets[a] & sets[b])
+            assert cosine[i, j] == pytest.approx(shared / np.sqrt(len(sets[a]) * len(sets[b])), abs=1e-6)
+            assert jaccard[i, j] == pytest.approx(shared / len(sets[a] | sets[b]))
+    assert store.similarity.shared_features(keys[0], keys[1]) == sorted(
+        sets[keys[0]] & sets[keys[1]], key=store.similarity.feature_names.index)
+
+
+def test_most_similar_excludes_target(catalog):
+    index = ProcessStore(catalog).similarity
+    result = index.most_similar(("化学药物-固体制剂", "片剂"), 3, "jaccard")
+    assert result["产品"].tolist()[:2] == ["片剂（复制）", "咀嚼片"]
+    assert result["相似度"].iat[0] == 1.0
+    assert list(result["相似度"]) == sorted(result["相似度"], reverse=True)
+    with pytest.raises(ValueError):
+        index.most_similar(("化学药物-固体制剂", "片剂"), 3, "unknown")
+
+
+def test_lsh_candidates_match_band_comparison(catalog):
+    index = ProcessStore(catalog).similarity
+    signatures = index.minhash_signatures
+    rows = similarity.MINHASH_PERMUTATIONS // similarity.LSH_BANDS
+    for key in index.keys:
+        target = signatures[index.positions[key]]
+        same_band = [
+            (signatures[:, band * rows:(band + 1) * rows] == target[band * rows:(band + 1) * rows]).all(axis=1)
+            for band in range(similarity.LSH_BANDS)
+        ]
+        assert index.lsh_candidates(key).tolist() == np.flatnonzero(np.any(same_band, axis=0)).tolist()
+    assert (signatures[index.positions[("化学药物-固体制剂", "片剂")]]
+            == signatures[index.positions[("化学药物-固体制剂", "片剂（复制）")]]).all()
+
+
+def test_lsh_path_recalls_identical_products(catalog, monkeypatch):
+    index = ProcessStore(catalog).similarity
+    exact = index.most_similar(("化学药物-固体制剂", "片剂"), 1)
+    monkeypatch.setattr(similarity, "LSH_PRODUCT_THRESHOLD", 0)
+    assert index.most_similar(("化学药物-固体制剂", "片剂"), 1).equals(exact)
+
+
+def test_incremental_update_matches_rebuild(catalog):
+    store = ProcessStore(catalog)
+    store.similarity.minhash_signatures
+    changed = copy.deepcopy(catalog)
+    changed["生物制品"]["疫苗"]["工艺步骤"].append({"name": "分装", "关键参数": ["装量"], "设备": ["灌装机"]})
+    del changed["化学药物-固体制剂"]["胶囊剂"]
+    updated = store.updated(changed).similarity
+    rebuilt = ProcessStore(changed).similarity
+    keys = rebuilt.keys
+    for metric in ("cosine", "jaccard"):
+        np.testing.assert_allclose(updated.similarity_matrix(keys, metric).to_numpy(),
+                                   rebuilt.similarity_matrix(keys, metric).to_numpy(), atol=1e-6)
+    # 沿用的签名与按新矩阵重新计算的一致
+    assert "minhash_signatures" in updated.__dict__
+    assert (updated.minhash_signatures == similarity._minhash_signatures(updated.matrix)).all()
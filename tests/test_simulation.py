@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from pharma_process.simulation import ProductRecipe, monte_carlo, simulate
+
+TABLET = ("固体制剂", "片剂")
+CAPSULE = ("固体制剂", "胶囊剂")
+
+
+def _recipe(key, durations, equipment, predecessors=None, spread=0.0):
+    durations = np.asarray(durations, dtype="float64")
+    if predecessors is None:
+        predecessors = [[i - 1] if i > 0 else [] for i in range(len(durations))]
+    names = [f"{key[1]}-{i + 1}" for i in range(len(durations))]
+    return ProductRecipe(key, names, durations, durations - spread, durations + spread, equipment, predecessors)
+
+
+@pytest.fixture
+def recipes():
+    return {
+        # 混合 → (制粒 ∥ 干燥) → 压片，压片同时占用压片机与除尘器
+        TABLET: _recipe(TABLET, [2.0, 3.0, 1.0, 2.0], [("混合机",), ("制粒机",), ("干燥箱",), ("压片机", "除尘器")],
+                        [[], [0], [0], [1, 2]], spread=0.5),
+        CAPSULE: _recipe(CAPSULE, [2.0, 4.0], [("混合机",), ("胶囊填充机",)], spread=0.5),
+    }
+
+
+def test_single_batch_runs_at_nominal_cycle(recipes):
+    result = simulate(recipes, {TABLET: 1}, period_hours=100.0)
+    assert recipes[TABLET].nominal_cycle == 7.0
+    assert result.makespan == 7.0
+    assert result.products["平均等待(h)"].iat[0] == 0.0
+    assert result.equipment["等待次数"].sum() == 0
+
+
+def test_contention_invariants(recipes):
+    plan = {TABLET: 6, CAPSULE: 4}
+    result = simulate(recipes, plan, period_hours=1.0)
+    equipment = result.equipment.set_index("设备名称")
+    # 忙碌时间等于各批次占用时长之和，利用率不超过 1，瓶颈设备利用率最高
+    assert equipment.loc["混合机", "忙碌时间(h)"] == pytest.approx(2.0 * 10)
+    assert equipment.loc["压片机", "忙碌时间(h)"] == pytest.approx(2.0 * 6)
+    assert (result.equipment["利用率"] <= 1.0 + 1e-9).all()
+    assert result.bottleneck == "混合机"
+    # 单台混合机串行处理全部批次，总工期不短于其忙碌时间
+    assert result.makespan >= equipment.loc["混合机", "忙碌时间(h)"]
+    assert (result.products["平均周期(h)"] >= result.products["名义周期(h)"] - 1e-9).all()
+    assert result.equipment["等待次数"].sum() > 0
+
+
+def test_more_units_never_lengthen_makespan(recipes):
+    plan = {TABLET: 6, CAPSULE: 4}
+    single = simulate(recipes, plan, period_hours=1.0)
+    doubled = simulate(recipes, plan, {"混合机": 2}, period_hours=1.0)
+    assert doubled.makespan <= single.makespan
+
+
+def test_invalid_unit_count_is_rejected(recipes):
+    with pytest.raises(ValueError, match="至少为 1"):
+        simulate(recipes, {TABLET: 1}, {"混合机": 0})
+
+
+def test_dispatch_backfills_free_equipment():
+    # A 先就绪但需要 X 与 Y，Y 被占用；后到的 B 只需空闲的 X，不等 A 直接开始
+    holder = ("类", "占用Y")
+    multi = ("类", "多设备")
+    single = ("类", "单设备")
+    recipes = {
+        holder: _recipe(holder, [10.0], [("Y",)]),
+        multi: _recipe(multi, [1.0, 1.0], [("X",), ("X", "Y")]),
+        single: _recipe(single, [1.5, 1.0], [("Z",), ("X",)]),
+    }
+    result = simulate(recipes, {holder: 1, multi: 1, single: 1}, period_hours=1.0)
+    products = result.products.set_index("产品")
+    assert products.loc["单设备", "平均等待(h)"] == 0.0
+    assert products.loc["多设备", "平均等待(h)"] == pytest.approx(9.0)
+
+
+def test_monte_carlo_is_independent_of_workers(recipes):
+    plan = {TABLET: 3, CAPSULE: 2}
+    serial = monte_carlo(recipes, plan, runs=6, period_hours=24.0, cv=0.2, workers=1)
+    parallel = monte_carlo(recipes, plan, runs=6, period_hours=24.0, cv=0.2, workers=2)
+    assert serial.runs["总工期(h)"].tolist() == parallel.runs["总工期(h)"].tolist()
+    assert serial.equipment.equals(parallel.equipment)
+    assert len(serial.runs) == 6
+    percentiles = serial.makespan_percentiles()
+    assert percentiles[5] <= percentiles[50] <= percentiles[95]
+    assert ((serial.utilization >= 0) & (serial.utilization <= 1 + 1e-9)).all().all()
+
+
+def test_output_counts_batches_completed_within_period(recipes):
+    # 3 批片剂在 0、10/3、20/3 h 投放，名义周期 7 h，只有第一批在 10 h 内完成
+    result = simulate(recipes, {TABLET: 3}, period_hours=10.0)
+    assert result.makespan > 10.0
+    assert result.products["每周期产出(批)"].iat[0] == 1
+    relaxed = simulate(recipes, {TABLET: 3}, period_hours=100.0)
+    assert relaxed.products["每周期产出(批)"].iat[0] == 3
+
+
+def test_output_never_exceeds_plan(recipes):
+    plan = {TABLET: 3, CAPSULE: 2}
+    result = simulate(recipes, plan, period_hours=24.0)
+    assert (result.products["每周期产出(批)"] <= result.products["计划批次"]).all()
+    summary = monte_carlo(recipes, plan, runs=4, period_hours=24.0, cv=0.2, workers=1)
+    assert (summary.products["每周期产出(批)"] <= summary.products["计划批次"]).all()
+
+
+def test_product_without_steps_completes_at_release(recipes):
+    empty = ("固体制剂", "空白")
+    recipes[empty] = _recipe(empty, [], [])
+    result = simulate(recipes, {empty: 2, CAPSULE: 1}, period_hours=10.0)
+    products = result.products.set_index("产品")
+    assert products.loc["空白", "平均周期(h)"] == 0.0
+    assert products.loc["空白", "每周期产出(批)"] == 2
+    assert result.makespan == 6.0
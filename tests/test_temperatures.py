@@ -0,0 +1,54 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from pharma_process.process_store import ProcessStore
+from pharma_process.temperatures import TemperatureIndex, parse_temperatures
+
+
+def test_parse_temperatures():
+    result = parse_temperatures(["121", "4-8", "-40~25", "4~-196", "-150以下", "300以上", "室温", "多种", None])
+    low = result["温度下限(℃)"].tolist()
+    high = result["温度上限(℃)"].tolist()
+    assert low[:7] == [121.0, 4.0, -40.0, -196.0, -math.inf, 300.0, 15.0]
+    assert high[:7] == [121.0, 8.0, 25.0, 4.0, -150.0, math.inf, 25.0]
+    assert all(math.isnan(value) for value in low[7:] + high[7:])
+
+
+def test_parse_accepts_degree_sign_and_whitespace():
+    result = parse_temperatures([" 37 ℃ ", "2 ~ 8℃"])
+    assert result["温度下限(℃)"].tolist() == [37.0, 2.0]
+    assert result["温度上限(℃)"].tolist() == [37.0, 8.0]
+
+
+def _index(values):
+    steps = pd.concat([
+        pd.DataFrame({"分类": "类", "产品": [f"P{i}" for i in range(len(values))]}),
+        parse_temperatures(values),
+    ], axis=1)
+    return TemperatureIndex(steps)
+
+
+def test_index_queries_match_brute_force():
+    values = ["121", "4-8", "-40~25", "-150以下", "300以上", "室温", "多种", "60-80", "-20"]
+    index = _index(values)
+    low = index.steps["温度下限(℃)"].to_numpy()
+    high = index.steps["温度上限(℃)"].to_numpy()
+    for t in (-200.0, -40.0, 0.0, 4.0, 25.0, 121.0, 500.0):
+        assert index.at_or_below(t).tolist() == np.flatnonzero(low <= t).tolist()
+        assert index.at_or_above(t).tolist() == np.flatnonzero(high >= t).tolist()
+    for a, b in ((-50.0, -30.0), (0.0, 10.0), (70.0, 130.0), (200.0, 250.0)):
+        expected = np.flatnonzero((low <= b) & (high >= a)).tolist()
+        assert index.overlapping(a, b).tolist() == expected
+
+
+def test_index_products_keep_catalog_order():
+    index = _index(["10", "20", "30"])
+    assert index.products(index.at_or_above(15)) == [("类", "P1"), ("类", "P2")]
+
+
+def test_store_temperature_index(processes):
+    index = ProcessStore(processes).temperature_index
+    assert index.products(index.at_or_below(0)) == [("生物制品", "疫苗")]
+    assert index.step_rows(index.overlapping(45, 55))["步骤名称"].tolist() == ["干燥"]